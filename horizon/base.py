@@ -22,6 +22,9 @@ the classes contained therein.
 
 import collections
 import copy
+import datetime
+import functools
+import hashlib
 from importlib import import_module
 import inspect
 import logging
@@ -30,8 +33,10 @@ import os
 from django.conf import settings
 from django.conf.urls import include
 from django.conf.urls import url
+from django.core.cache import caches
 from django.core.exceptions import ImproperlyConfigured
 from django.urls import reverse
+from django.utils import timezone
 from django.utils.encoding import python_2_unicode_compatible
 from django.utils.functional import empty
 from django.utils.functional import SimpleLazyObject
@@ -62,27 +67,209 @@ def _decorate_urlconf(urlpatterns, decorator, *args, **kwargs):
             _decorate_urlconf(pattern.url_patterns, decorator, *args, **kwargs)
 
 
-# FIXME(lhcheng): We need to find a better way to cache the result.
-# Rather than storing it in the session, we could leverage the Django
-# session. Currently, this has been causing issue with cookie backend,
-# adding 1600+ in the cookie size.
+DEFAULT_ACCESS_CACHE = {
+    'enabled': False,
+    'cache': 'default',
+    'timeout': 3600,
+}
+ACCESS_CACHE_KEY_PREFIX = 'horizon:access'
+
+
+def _get_access_cache_config():
+    config = dict(DEFAULT_ACCESS_CACHE)
+    config.update(getattr(settings, 'HORIZON_ACCESS_CACHE', {}))
+    return config
+
+
+class _AccessDecisions(object):
+    """Access decisions of the components for the token of a request.
+
+    The decisions are kept on the request, so that each component is
+    evaluated at most once per request, and, when ``HORIZON_ACCESS_CACHE``
+    is enabled, in a Django cache entry keyed by a hash of the token and the
+    region, which expires together with the token.
+    """
+
+    def __init__(self, request):
+        config = _get_access_cache_config()
+        self.deferred = False
+        self.modified = False
+        self.decisions = {}
+        self.cache = None
+        self.key = None
+        self.expires = None
+        token = getattr(getattr(request, 'user', None), 'token', None)
+        token_id = getattr(token, 'id', None)
+        if config['enabled'] and token_id:
+            self.cache = caches[config['cache']]
+            digest = hashlib.sha256(('%s:%s' % (
+                token_id, getattr(request.user, 'services_region', None))
+            ).encode('utf-8')).hexdigest()
+            self.key = '%s:%s' % (ACCESS_CACHE_KEY_PREFIX, digest)
+            self.timeout = config['timeout']
+            self.expires = getattr(token, 'expires', None)
+            self.decisions = self.cache.get(self.key) or {}
+
+    request_attribute = '_horizon_access_decisions'
+
+    @classmethod
+    def for_request(cls, request):
+        decisions = getattr(request, cls.request_attribute, None)
+        if not isinstance(decisions, cls):
+            decisions = cls(request)
+            setattr(request, cls.request_attribute, decisions)
+        return decisions
+
+    def get(self, key, func):
+        if key not in self.decisions:
+            self.decisions[key] = func()
+            self.modified = True
+            if not self.deferred:
+                self.save()
+        return self.decisions[key]
+
+    def save(self):
+        if self.cache is None or not self.modified:
+            return
+        timeout = self.timeout
+        if self.expires is not None:
+            now = timezone.now() if timezone.is_aware(self.expires) \
+                else datetime.datetime.utcnow()
+            timeout = min(timeout,
+                          int((self.expires - now).total_seconds()))
+        if timeout > 0:
+            self.cache.set(self.key, self.decisions, timeout)
+        self.modified = False
+
+
 def access_cached(func):
-    def inner(self, context):
-        session = context['request'].session
-        try:
-            if session['allowed']['valid_for'] != session.get('token'):
-                raise KeyError()
-        except KeyError:
-            session['allowed'] = {"valid_for": session.get('token')}
+    """Caches the result of ``can_access`` of a component.
 
+    The result is shared by all the requests made with the same token, see
+    :class:`_AccessDecisions`. Contrary to former versions, nothing is
+    stored in the session.
+    """
+    @functools.wraps(func)
+    def inner(self, context):
+        request = context['request']
         key = "%s.%s" % (self.__class__.__module__, self.__class__.__name__)
-        if key not in session['allowed']:
-            session['allowed'][key] = func(self, context)
-            session.modified = True
-        return session['allowed'][key]
+        decisions = _AccessDecisions.for_request(request)
+        return decisions.get(key, lambda: func(self, context))
     return inner
 
 
+def cache_navigation_access(context):
+    """Evaluates the access to every dashboard and panel at once.
+
+    Decisions missing from the cache are all computed in one pass over the
+    navigation tree and stored with a single cache write, instead of one
+    write per component.
+    """
+    decisions = _AccessDecisions.for_request(context['request'])
+    if decisions.cache is None:
+        # Nothing to share with other requests.
+        return
+    decisions.deferred = True
+    try:
+        for dashboard in Horizon.get_dashboards():
+            for panel in dashboard.get_panels():
+                panel.can_access(context)
+            dashboard.can_access(context)
+    finally:
+        decisions.deferred = False
+        decisions.save()
+
+
+DEFAULT_NAV_CACHE = {
+    'enabled': False,
+    'cache': 'default',
+    'timeout': 3600,
+}
+NAV_CACHE_KEY_PREFIX = 'horizon:nav'
+
+
+def _get_nav_cache_config():
+    config = dict(DEFAULT_NAV_CACHE)
+    config.update(getattr(settings, 'HORIZON_NAV_CACHE', {}))
+    return config
+
+
+def _get_navigation_fingerprint(request):
+    """Returns what the access to the navigation depends on, if known.
+
+    That is the roles of the user, the project and domains of the token,
+    the services of the catalog and the region. The project is part of it
+    as policy rules may compare it with the targets. ``None`` is returned
+    for requests without a token, whose navigation is not shared.
+    """
+    user = getattr(request, 'user', None)
+    if getattr(getattr(user, 'token', None), 'id', None) is None:
+        return None
+    roles = sorted(role['name'] for role in getattr(user, 'roles', []))
+    services = sorted(set(service.get('type') or '' for service in
+                          getattr(user, 'service_catalog', None) or []))
+    domain_roles = None
+    domain_token = getattr(request, 'session', {}).get('domain_token')
+    if domain_token:
+        domain_roles = (getattr(domain_token, 'domain_id', None),
+                        sorted(getattr(domain_token, 'role_names', [])))
+    return repr((roles,
+                 getattr(user, 'project_id', None),
+                 getattr(user, 'domain_id', None),
+                 getattr(user, 'user_domain_id', None),
+                 domain_roles,
+                 services,
+                 getattr(user, 'services_region', None)))
+
+
+class _NavigationAccess(_AccessDecisions):
+    """Access decisions of the navigation for the fingerprint of a request.
+
+    The decisions are keyed by :func:`navigation_path` and, when
+    ``HORIZON_NAV_CACHE`` is enabled, stored in a Django cache entry keyed
+    by a hash of :func:`_get_navigation_fingerprint`, so that the users with
+    the same roles, scope, services and region share them. They are saved
+    once the navigation is rendered.
+    """
+
+    request_attribute = '_horizon_navigation_access'
+
+    def __init__(self, request):
+        config = _get_nav_cache_config()
+        self.deferred = True
+        self.modified = False
+        self.decisions = {}
+        self.cache = None
+        self.key = None
+        self.expires = None
+        fingerprint = _get_navigation_fingerprint(request)
+        if config['enabled'] and fingerprint is not None:
+            self.cache = caches[config['cache']]
+            digest = hashlib.sha256(fingerprint.encode('utf-8')).hexdigest()
+            self.key = '%s:%s' % (NAV_CACHE_KEY_PREFIX, digest)
+            self.timeout = config['timeout']
+            self.decisions = self.cache.get(self.key) or {}
+
+
+def navigation_path(dashboard, panel=None):
+    """Returns the key of a component in the navigation access decisions."""
+    if panel is None:
+        return dashboard.slug
+    return '%s/%s' % (dashboard.slug, panel.slug)
+
+
+def get_navigation_access(context):
+    """Returns the navigation access decisions of the request of context.
+
+    ``get(navigation_path(...), func)`` returns the decision of a component,
+    calling ``func`` if it is unknown, and ``save()`` stores the new ones.
+    """
+    access = _NavigationAccess.for_request(context['request'])
+    if access.cache is None:
+        cache_navigation_access(context)
+    return access
+
+
 def _wrapped_include(arg):
     """Convert the old 3-tuple arg for include() into the new format.
 
@@ -136,15 +323,13 @@ class HorizonComponent(object):
                 urlpatterns = []
         return urlpatterns
 
-    # FIXME(lhcheng): Removed the access_cached decorator for now until
-    # a better implementation has been figured out. This has been causing
-    # issue with cookie backend, adding 1600+ in the cookie size.
-    # @access_cached
+    @access_cached
     def can_access(self, context):
         """Return whether the user has role based access to this component.
 
         This method is not intended to be overridden.
-        The result of the method is stored in per-session cache.
+        The result of the method is cached per token, see
+        :func:`access_cached`.
         """
         return self.allowed(context)
 
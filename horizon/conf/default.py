@@ -45,6 +45,10 @@ HORIZON_CONFIG = {
 
     'password_autocomplete': 'off',
 
+    # Function (or path to a function) calling the functions passed as
+    # positional arguments in parallel. Used to prefetch the page data.
+    'parallel_call': None,
+
     'integration_tests_support':
         getattr(settings, 'INTEGRATION_TESTS_SUPPORT', False)
 }
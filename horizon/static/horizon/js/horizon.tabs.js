@@ -28,6 +28,26 @@ horizon.tabs.initTabLoad = function ($tab) {
   recompileAngularContent($tab);
 };
 
+// Requests the content of the tab of a tab link, once. The request is shared
+// by the prefetch on hover and the loading of the tab when it is shown.
+horizon.tabs.fetch_tab = function ($link) {
+  var request = $link.data('tab-request'),
+    tab_id = $link.attr('data-target').replace('#', ''),
+    url;
+
+  if (!request) {
+    // If query params exist, append tab id.
+    if(window.location.search.length > 0) {
+      url = window.location.search + "&tab=" + tab_id;
+    } else {
+      url = "?tab=" + tab_id;
+    }
+    request = $.get(url);
+    $link.data('tab-request', request);
+  }
+  return request;
+};
+
 horizon.tabs.load_tab = function () {
   var $this = $(this),
     tab_id = $this.attr('data-target'),
@@ -40,19 +60,24 @@ horizon.tabs.load_tab = function () {
     .append($template)
     .addClass('tab-loading');
 
-  // If query params exist, append tab id.
-  if(window.location.search.length > 0) {
-    $tab_pane.load(window.location.search + "&tab=" + tab_id.replace('#', ''), function() {
-      horizon.tabs.initTabLoad($tab_pane);
-    });
-  } else {
-    $tab_pane.load("?tab=" + tab_id.replace('#', ''), function() {
+  horizon.tabs.fetch_tab($this)
+    .done(function (content) {
+      $tab_pane.html(content);
+    })
+    .always(function () {
       horizon.tabs.initTabLoad($tab_pane);
     });
-  }
   $this.attr("data-loaded", "true");
 };
 
+horizon.tabs.prefetch_tab = function () {
+  var $this = $(this);
+  horizon.tabs.fetch_tab($this).fail(function () {
+    // Let the tab be requested again when it is shown.
+    $this.removeData('tab-request');
+  });
+};
+
 horizon.addInitFunction(horizon.tabs.init = function () {
   var data = horizon.cookies.getObject("tabs") || {};
 
@@ -65,6 +90,8 @@ horizon.addInitFunction(horizon.tabs.init = function () {
   var $document = $(document);
 
   $document.on("show.bs.tab", ".ajax-tabs a[data-loaded='false']", horizon.tabs.load_tab);
+  $document.on("mouseenter", ".ajax-tabs[data-prefetch-tabs='hover'] a[data-loaded='false']",
+    horizon.tabs.prefetch_tab);
 
   $document.on("shown.bs.tab", ".nav-tabs a[data-toggle='tab']", function (evt) {
     var $tab = $(evt.target),
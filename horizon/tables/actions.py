@@ -97,6 +97,7 @@ class BaseAction(html.HTMLElement):
         self.preempt = kwargs.get('preempt', False)
         self.policy_rules = kwargs.get('policy_rules', None)
         self.action_type = kwargs.get('action_type', 'default')
+        self.datum_independent = kwargs.get('datum_independent', False)
 
     def data_type_matched(self, datum):
         """Method to see if the action is allowed for a certain type of data.
@@ -130,13 +131,29 @@ class BaseAction(html.HTMLElement):
         return True
 
     def _allowed(self, request, datum):
+        return (self._policy_allowed(request, datum) and
+                self.allowed(request, datum))
+
+    def _policy_allowed(self, request, datum):
         policy_check = utils_settings.import_setting("POLICY_CHECK_FUNCTION")
 
         if policy_check and self.policy_rules:
             target = self.get_policy_target(request, datum)
-            return (policy_check(self.policy_rules, request, target) and
-                    self.allowed(request, datum))
-        return self.allowed(request, datum)
+            return policy_check(self.policy_rules, request, target)
+        return True
+
+    def policy_depends_on_datum(self):
+        """Returns whether the policy check depends on the datum.
+
+        It is the case when :meth:`get_policy_target` is overridden, unless
+        the action is declared ``datum_independent``. The policy checks of
+        row actions which do not depend on the datum are made once per table
+        rather than once per row.
+        """
+        if self.datum_independent:
+            return False
+        return (six.get_unbound_function(type(self).get_policy_target) is not
+                six.get_unbound_function(BaseAction.get_policy_target))
 
     def update(self, request, datum):
         """Allows per-action customization based on current conditions.
@@ -224,6 +241,15 @@ class Action(BaseAction):
         Default to be an empty list (``[]``). When set to empty, the action
         will accept any kind of data.
 
+    .. attribute:: datum_independent
+
+        Boolean value indicating that the policy rules of this action do not
+        read the policy target, even though ``get_policy_target()`` returns
+        one built from the row. When ``True``, the policy checks of the
+        action as a row action are made once per table, for the first row,
+        instead of once per distinct policy target. ``allowed()`` is still
+        called for each row. Defaults to ``False``.
+
     .. attribute:: policy_rules
 
         list of scope and rule tuples to do policy checks on, the
@@ -343,6 +369,15 @@ class LinkAction(BaseAction):
 
         Defaults to be an empty list (``[]``). When set to empty, the action
         will accept any kind of data.
+
+    .. attribute:: datum_independent
+
+        Boolean value indicating that the policy rules of this action do not
+        read the policy target, even though ``get_policy_target()`` returns
+        one built from the row. When ``True``, the policy checks of the
+        action as a row action are made once per table, for the first row,
+        instead of once per distinct policy target. ``allowed()`` is still
+        called for each row. Defaults to ``False``.
     """
     # class attribute name is used for ordering of Actions in table
     name = "link"
@@ -19,12 +19,14 @@ import json
 import logging
 from operator import attrgetter
 import sys
+import uuid
 
 from django.conf import settings
 from django.core import exceptions as core_exceptions
 from django import forms
 from django.http import HttpResponse
 from django import template
+from django.template.base import render_value_in_context
 from django.template.defaultfilters import slugify
 from django.template.defaultfilters import truncatechars
 from django.template.loader import render_to_string
@@ -41,6 +43,7 @@ from horizon import conf
 from horizon import exceptions
 from horizon.forms import ThemableCheckboxInput
 from horizon import messages
+from horizon.tables.actions import BaseAction
 from horizon.tables.actions import BatchAction
 from horizon.tables.actions import FilterAction
 from horizon.tables.actions import LinkAction
@@ -665,6 +668,9 @@ class Row(html.HTMLElement):
             return ''
 
     def render(self):
+        renderer = self.table._meta.row_renderer
+        if renderer is not None:
+            return renderer.render(self)
         return render_to_string("horizon/common/_data_table_row.html",
                                 {"row": self})
 
@@ -705,6 +711,16 @@ class Row(html.HTMLElement):
         return {}
 
 
+class _RowsPlaceholder(object):
+    """Stands for all the rows while rendering with render_stream()."""
+
+    def __init__(self, placeholder):
+        self.placeholder = placeholder
+
+    def render(self):
+        return mark_safe(self.placeholder)
+
+
 class Cell(html.HTMLElement):
     """Represents a single cell in the table."""
 
@@ -906,6 +922,47 @@ class Cell(html.HTMLElement):
                                 {"cell": self})
 
 
+class RowRenderer(object):
+    """Renders the rows of a table without the template engine.
+
+    It is compiled once per table class when ``Meta.fast_render`` is
+    enabled and produces the same markup as
+    ``horizon/common/_data_table_row.html`` and
+    ``horizon/common/_data_table_cell.html`` for standard cells: plain
+    values, links, status, filters and list wrapping. Cells of columns
+    with inline editing, and all cells when the table uses a cell class
+    with its own ``render`` method, are still rendered by templates.
+    """
+
+    def __init__(self, cell_class, columns):
+        if (six.get_unbound_function(cell_class.render) is not
+                six.get_unbound_function(Cell.render)):
+            self.templated_columns = frozenset(columns)
+        else:
+            self.templated_columns = frozenset(
+                name for name, column in columns.items()
+                if column.update_action is not None)
+        # Only used for its rendering flags (autoescape, l10n and tz).
+        self.context = template.Context()
+
+    def render(self, row):
+        cells = [cell.render() if cell.column.name in self.templated_columns
+                 else self.render_cell(cell) for cell in row]
+        return mark_safe('<tr%s>%s</tr>' % (row.attr_string, ''.join(cells)))
+
+    def render_cell(self, cell):
+        value = render_value_in_context(cell.value, self.context)
+        if cell.wrap_list:
+            value = '<ul>%s</ul>' % value
+        return '<td%s>%s</td>' % (cell.attr_string, value)
+
+
+def _has_default_allowed(action):
+    allowed = six.get_unbound_function(type(action)._allowed)
+    return allowed in (six.get_unbound_function(BaseAction._allowed),
+                       six.get_unbound_function(BatchAction._allowed))
+
+
 class DataTableOptions(object):
     """Contains options for :class:`.DataTable` objects.
 
@@ -1069,6 +1126,30 @@ class DataTableOptions(object):
 
         A list of permission names which this table requires in order to be
         displayed. Defaults to an empty list (``[]``).
+
+    .. attribute:: stream_rows
+
+        Boolean to control whether the rows of the table are streamed to
+        the browser when the table is rendered by a
+        :class:`~horizon.tables.MultiTableView`. The rows are then built
+        lazily and sent in chunks with a ``StreamingHttpResponse`` instead
+        of being rendered all at once, which keeps the memory used for
+        rendering large tables bounded. Changes made to the session or
+        messages added while the rows are rendered are lost in this mode.
+        Default: ``False``.
+
+    .. attribute:: stream_chunk_size
+
+        The number of rows rendered and sent together when ``stream_rows``
+        is enabled. Default: ``100``.
+
+    .. attribute:: fast_render
+
+        Boolean to control whether rows and standard cells are rendered by a
+        :class:`~horizon.tables.base.RowRenderer` compiled for the table
+        class instead of by the row and cell templates. This speeds up the
+        rendering of large tables. Tables which customize the row template
+        through ``row_class`` should leave it disabled. Default: ``False``.
     """
     def __init__(self, options):
         self.name = getattr(options, 'name', self.__class__.__name__)
@@ -1098,6 +1179,11 @@ class DataTableOptions(object):
                                        "no_data_message",
                                        _("No items to display."))
         self.permissions = getattr(options, 'permissions', [])
+        self.stream_rows = getattr(options, 'stream_rows', False)
+        self.stream_chunk_size = getattr(options, 'stream_chunk_size', 100)
+        self.fast_render = getattr(options, 'fast_render', False)
+        # Compiled by the metaclass once the columns are known.
+        self.row_renderer = None
 
         # Set self.filter if we have any FilterActions
         filter_actions = [action for action in self.table_actions if
@@ -1225,6 +1311,9 @@ class DataTableMetaclass(type):
             columns.append(("actions", actions_column))
         # Store this set of columns internally so we can copy them per-instance
         dt_attrs['_columns'] = collections.OrderedDict(columns)
+        if opts.fast_render:
+            opts.row_renderer = RowRenderer(opts.cell_class,
+                                            dt_attrs['_columns'])
 
         # Gather and register actions for later access since we only want
         # to instantiate them once.
@@ -1281,6 +1370,10 @@ class DataTable(object):
         self.permissions = self._meta.permissions
         self.needs_filter_first = False
         self._filter_first_message = self._meta.filter_first_message
+        self._stream_placeholder = None
+        self._rows_placeholder = None
+        # Results of the policy checks of row actions.
+        self._row_action_checks = {}
 
         # Create a new set
         columns = []
@@ -1396,6 +1489,47 @@ class DataTable(object):
             LOG.exception("Error while checking action permissions.")
             return None
 
+    def _get_row_action_check_key(self, action, datum):
+        if not action.policy_depends_on_datum():
+            return action.name
+        target = action.get_policy_target(self.request, datum) or {}
+        key = (action.name, frozenset(target.items()))
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def _filter_row_action(self, action, datum):
+        """Checks whether a row action is allowed for the given datum.
+
+        This is equivalent to :meth:`_filter_action`, except that the policy
+        checks are made only once per table for actions whose policy does
+        not depend on the datum (see ``datum_independent``), and once per
+        distinct policy target for the other ones. ``allowed()`` is still
+        called for each row.
+        """
+        if not _has_default_allowed(action):
+            return self._filter_action(action, self.request, datum)
+        checks = self._row_action_checks
+        try:
+            if (self._meta.mixed_data_type and
+                    not action.data_type_matched(datum)):
+                return False
+            key = self._get_row_action_check_key(action, datum)
+            if key is None:
+                return action._allowed(self.request, datum)
+            if key not in checks:
+                checks[key] = action._policy_allowed(self.request, datum)
+            return checks[key] and action.allowed(self.request, datum)
+        except AssertionError:
+            # don't trap mox exceptions (which subclass AssertionError)
+            # when testing!
+            raise
+        except Exception:
+            LOG.exception("Error while checking action permissions.")
+            return None
+
     def is_browser_table(self):
         if self._meta.browser_table:
             return True
@@ -1403,11 +1537,85 @@ class DataTable(object):
 
     def render(self):
         """Renders the table using the template from the table options."""
+        if self._stream_placeholder is not None:
+            # The view replaces the placeholder with render_stream().
+            return mark_safe(self._stream_placeholder)
+        return self._render_template()
+
+    def _render_template(self):
         table_template = template.loader.get_template(self._meta.template)
         extra_context = {self._meta.context_var_name: self,
                          'hidden_title': self._meta.hidden_title}
         return table_template.render(extra_context, self.request)
 
+    def is_streamed(self):
+        """Returns whether the rows of this table should be streamed.
+
+        Streaming is only used for regular page loads; AJAX requests always
+        get the whole table at once.
+        """
+        return self._meta.stream_rows and not self.request.is_ajax()
+
+    def set_stream_placeholder(self, placeholder):
+        """Makes :meth:`render` return ``placeholder`` instead of the table.
+
+        This allows a view to render the page around the table first and
+        to stream the table itself with :meth:`render_stream`. Passing
+        ``None`` restores the regular rendering.
+        """
+        self._stream_placeholder = placeholder
+
+    def render_stream(self):
+        """Renders the table as an iterator of HTML chunks.
+
+        The template is rendered once without rows. The rows are then built
+        lazily and rendered in chunks of ``Meta.stream_chunk_size`` rows
+        which are yielded between the parts of the template preceding and
+        following the table body. Only the rows of the current chunk are
+        kept in memory.
+
+        The template must render each row with ``{{ row.render }}``, as the
+        default table template does.
+
+        As the status of the response has been sent when the rows are
+        rendered, an error raised by a row is logged and ends the rows with
+        an error row, followed by the end of the table, so that the page
+        remains well-formed.
+        """
+        self._rows_placeholder = '<!--%s-rows-%s-->' % (
+            self.slugify_name(), uuid.uuid4().hex)
+        error = escape(_("Unable to display all the items of the table."))
+        try:
+            content = self._render_template()
+        except Exception:
+            LOG.exception("Error while rendering table %s.", self.name)
+            content = None
+        finally:
+            placeholder = self._rows_placeholder
+            self._rows_placeholder = None
+        if content is None:
+            yield '<div class="alert alert-danger">%s</div>' % error
+            return
+        head, found, tail = content.partition(placeholder)
+        yield head
+        if found:
+            chunk_size = max(1, self._meta.stream_chunk_size)
+            chunk = []
+            try:
+                for row in self.iter_rows():
+                    chunk.append(row.render())
+                    if len(chunk) >= chunk_size:
+                        yield ''.join(chunk)
+                        chunk = []
+            except Exception:
+                LOG.exception("Error while rendering the rows of table %s.",
+                              self.name)
+                chunk.append('<tr class="error"><td colspan="%d">%s</td></tr>'
+                             % (len(self.columns), error))
+            if chunk:
+                yield ''.join(chunk)
+        yield tail
+
     def get_absolute_url(self):
         """Returns the canonical URL for this table.
 
@@ -1519,9 +1727,7 @@ class DataTable(object):
             bound_action.attrs = copy.copy(bound_action.attrs)
             bound_action.datum = datum
             # Remove disallowed actions.
-            if not self._filter_action(bound_action,
-                                       self.request,
-                                       datum):
+            if not self._filter_row_action(bound_action, datum):
                 continue
             # Hook for modifying actions based on data. No-op by default.
             bound_action.update(self.request, datum)
@@ -1922,16 +2128,29 @@ class DataTable(object):
         """Returns this table's columns including auto-generated ones."""
         return self.columns.values()
 
+    def iter_rows(self):
+        """Yields the rows of this table one at a time.
+
+        Unlike :meth:`get_rows` the cells of a row are only loaded when the
+        row is reached.
+        """
+        for datum in self.filtered_data:
+            row = self._meta.row_class(self, datum)
+            if self.get_object_id(datum) == self.current_item_id:
+                self.selected = True
+                row.classes.append('current_selected')
+            yield row
+
     def get_rows(self):
         """Return the row data for this table broken out by columns."""
-        rows = []
+        if self._rows_placeholder is not None:
+            # Rendering for render_stream(): a single placeholder row marks
+            # where the streamed rows go.
+            if not self.filtered_data:
+                return []
+            return [_RowsPlaceholder(self._rows_placeholder)]
         try:
-            for datum in self.filtered_data:
-                row = self._meta.row_class(self, datum)
-                if self.get_object_id(datum) == self.current_item_id:
-                    self.selected = True
-                    row.classes.append('current_selected')
-                rows.append(row)
+            rows = list(self.iter_rows())
         except Exception:
             # Exceptions can be swallowed at the template level here,
             # re-raising as a TemplateSyntaxError makes them visible.
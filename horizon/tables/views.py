@@ -13,17 +13,21 @@
 #    under the License.
 
 from collections import defaultdict
+import uuid
 
+from django import http
 from django import shortcuts
 
 from horizon import views
 
 from horizon.templatetags.horizon import has_permissions
+from horizon.utils import page_data
 
 
 class MultiTableMixin(object):
     """A generic mixin which provides methods for handling DataTables."""
     data_method_pattern = "get_%s_data"
+    prefetch = {}
 
     def __init__(self, *args, **kwargs):
         super(MultiTableMixin, self).__init__(*args, **kwargs)
@@ -33,8 +37,26 @@ class MultiTableMixin(object):
         self._data_methods = defaultdict(list)
         self.get_data_methods(self.table_classes, self._data_methods)
 
+    def get_prefetched(self, key):
+        """Return the data declared with key in the ``prefetch`` attribute.
+
+        The ``prefetch`` attribute of the view is a dictionary mapping keys
+        to functions loading data needed by its tables. The data is loaded
+        in parallel before the data methods of the tables are called. See
+        :mod:`horizon.utils.page_data`.
+        """
+        data = page_data.get_page_data(self.request)
+        data.declare_all(self.prefetch, **self.kwargs)
+        return data.get(key)
+
+    def prefetch_data(self):
+        data = page_data.get_page_data(self.request)
+        data.declare_all(self.prefetch, **self.kwargs)
+        data.fetch()
+
     def _get_data_dict(self):
         if not self._data:
+            self.prefetch_data()
             for table in self.table_classes:
                 data = []
                 name = table._meta.name
@@ -224,7 +246,54 @@ class MultiTableView(MultiTableMixin, views.HorizonTemplateView):
         if handled:
             return handled
         context = self.get_context_data(**kwargs)
-        return self.render_to_response(context)
+        response = self.render_to_response(context)
+        streamed = [table for table in self.get_tables().values()
+                    if table.is_streamed()]
+        if streamed:
+            return self.stream_response(response, streamed)
+        return response
+
+    def stream_response(self, response, tables):
+        """Renders ``response`` as a streaming response.
+
+        The page is rendered with a placeholder for each of the given
+        tables, which is replaced by the chunks yielded by
+        :meth:`~horizon.tables.DataTable.render_stream` while the response
+        is sent.
+        """
+        placeholders = {}
+        for table in tables:
+            placeholder = '<!--%s-%s-->' % (table.slugify_name(),
+                                            uuid.uuid4().hex)
+            table.set_stream_placeholder(placeholder)
+            placeholders[placeholder] = table
+        try:
+            response.render()
+        finally:
+            for table in tables:
+                table.set_stream_placeholder(None)
+        content = response.content.decode(response.charset)
+
+        def stream():
+            rest = content
+            while rest:
+                found = [(rest.find(p), p) for p in placeholders
+                         if p in rest]
+                if not found:
+                    break
+                index, placeholder = min(found)
+                yield rest[:index]
+                for chunk in placeholders[placeholder].render_stream():
+                    yield chunk
+                rest = rest[index + len(placeholder):]
+            yield rest
+
+        streaming = http.StreamingHttpResponse(stream(),
+                                               status=response.status_code)
+        for header, value in response.items():
+            streaming[header] = value
+        streaming.cookies = response.cookies
+        return streaming
 
     def post(self, request, *args, **kwargs):
         # GET and POST handling are the same
@@ -249,6 +318,7 @@ class DataTableView(MultiTableView):
     def _get_data_dict(self):
         if not self._data:
             self.update_server_filter_action(self.request)
+            self.prefetch_data()
             self._data = {self.table_class._meta.name: self.get_data()}
         return self._data
 
@@ -332,6 +402,7 @@ class MixedDataTableView(DataTableView):
 
     def _get_data_dict(self):
         if not self._data:
+            self.prefetch_data()
             table = self.table_class
             self._data = {table._meta.name: []}
             for data_type in table.data_types:
@@ -26,6 +26,7 @@ from django.utils import module_loading
 
 from horizon import exceptions
 from horizon.utils import html
+from horizon.utils import page_data
 
 LOG = logging.getLogger(__name__)
 
@@ -58,6 +59,19 @@ class TabGroup(html.HTMLElement):
         across requests for a given user. (State storage is all done
         client-side.)
 
+    .. attribute:: lazy
+
+        Boolean to control whether only the active tab is loaded when the
+        tab group is rendered. The other tabs are loaded dynamically when
+        they are selected, as if their ``preload`` attribute was ``False``.
+        Default: ``False``
+
+    .. attribute:: prefetch_on_hover
+
+        Boolean to control whether the content of a tab which is loaded
+        dynamically is requested when the mouse hovers the tab, before it
+        is selected. Default: ``False``
+
     .. attribute:: show_single_tab
 
         Boolean to control whether the tab bar is shown when the tab group
@@ -87,11 +101,20 @@ class TabGroup(html.HTMLElement):
         Read-only property which is set to the value of the current active tab.
         This may not be the same as the value of ``selected`` if no
         specific tab was requested via the ``GET`` parameter.
+
+    .. attribute:: prefetch
+
+        A dictionary mapping keys to functions loading data needed by the
+        tab group or its tabs. See :mod:`horizon.utils.page_data`.
+        Default: ``{}``.
     """
     slug = None
+    prefetch = {}
     template_name = "horizon/common/_tab_group.html"
     param_name = 'tab'
     sticky = False
+    lazy = False
+    prefetch_on_hover = False
     show_single_tab = False
     _selected = None
     _active = None
@@ -118,6 +141,8 @@ class TabGroup(html.HTMLElement):
         self._tabs = self._load_tabs(request)
         if self.sticky:
             self.attrs['data-sticky-tabs'] = 'sticky'
+        if self.prefetch_on_hover:
+            self.attrs['data-prefetch-tabs'] = 'hover'
         if not self._set_active_tab():
             self.tabs_not_available()
 
@@ -167,8 +192,30 @@ class TabGroup(html.HTMLElement):
     def __repr__(self):
         return "<%s: %s>" % (self.__class__.__name__, self.slug)
 
+    def prefetch_data(self):
+        """Load the data declared by the tab group and the tabs to display.
+
+        The data of all of them is loaded in parallel, once per page.
+        """
+        data = self.get_page_data()
+        data.declare_all(self.prefetch, **self.kwargs)
+        for tab in self._tabs.values():
+            if tab.load and not tab.data_loaded:
+                data.declare_all(tab.prefetch, **self.kwargs)
+        data.fetch()
+
+    def get_page_data(self):
+        return page_data.get_page_data(self.request)
+
+    def get_prefetched(self, key):
+        """Return the data declared with key in a ``prefetch`` attribute."""
+        data = self.get_page_data()
+        data.declare_all(self.prefetch, **self.kwargs)
+        return data.get(key)
+
     def load_tab_data(self):
         """Preload all data that for the tabs that will be displayed."""
+        self.prefetch_data()
         for tab in self._tabs.values():
             if tab.load and not tab.data_loaded:
                 try:
@@ -285,7 +332,9 @@ class Tab(html.HTMLElement):
 
         Determines whether the contents of the tab should be rendered into
         the page's HTML when the tab group is rendered, or whether it should
-        be loaded dynamically when the tab is selected. Default: ``True``.
+        be loaded dynamically when the tab is selected. It is ignored if the
+        :attr:`~horizon.tabs.TabGroup.lazy` attribute of the tab group is
+        ``True``. Default: ``True``.
 
     .. attribute:: classes
 
@@ -305,9 +354,16 @@ class Tab(html.HTMLElement):
 
         A list of permission names which this tab requires in order to be
         displayed. Defaults to an empty list (``[]``).
+
+    .. attribute:: prefetch
+
+        A dictionary mapping keys to functions loading data needed by this
+        tab. They are loaded with the data of the other tabs when this tab
+        is loaded. See :mod:`horizon.utils.page_data`. Default: ``{}``.
     """
     name = None
     slug = None
+    prefetch = {}
     preload = True
     _active = None
     permissions = []
@@ -341,7 +397,8 @@ class Tab(html.HTMLElement):
 
     @property
     def load(self):
-        load_preloaded = self.preload or self.is_active()
+        preload = self.preload and not self.tab_group.lazy
+        load_preloaded = preload or self.is_active()
         return load_preloaded and self._allowed and self._enabled
 
     @property
@@ -350,6 +407,16 @@ class Tab(html.HTMLElement):
             self._data = self.get_context_data(self.request)
         return self._data
 
+    def get_prefetched(self, key):
+        """Return the data declared with key in a ``prefetch`` attribute.
+
+        The data is loaded now if the tab is loaded on its own, e.g. to
+        handle a table action.
+        """
+        self.tab_group.get_page_data().declare_all(self.prefetch,
+                                                   **self.tab_group.kwargs)
+        return self.tab_group.get_prefetched(key)
+
     @property
     def data_loaded(self):
         return getattr(self, "_data", None) is not None
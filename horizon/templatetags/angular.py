@@ -13,45 +13,42 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import hashlib
+
+from compressor.conf import settings as compress_settings
 from compressor.signals import post_compress
+from compressor import storage
+from django.conf import settings
 from django.contrib.staticfiles import finders
-from django.core.cache import caches
-from django.core.cache.utils import make_template_fragment_key
+from django.core.files.base import ContentFile
 from django.dispatch import receiver
 from django import template
+from django.template import loader
+from django.utils.encoding import force_bytes
 
 register = template.Library()
 
+# URL of the template preloads bundle per theme and static URL.
+_bundles = {}
+
 
 @receiver(post_compress)
 def update_angular_template_hash(sender, **kwargs):
     """Listen for compress events.
 
-    If the angular templates have been re-compressed, also clear them
-    from the Django cache backend.  This is important to allow
-    deployers to change a template file, re-compress, and not
-    accidentally serve the old Django cached version of that content
-    to clients.
+    If the angular templates have been re-compressed, also forget the
+    bundle of template preloads of the theme, so that it is built again
+    from the template files. This is important to allow deployers to
+    change a template file, re-compress, and not accidentally serve the
+    old bundle to clients.
     """
     context = kwargs['context']  # context the compressor is working with
     compressed = context['compressed']  # the compressed content
     compressed_name = compressed['name']  # name of the compressed content
     if compressed_name == 'angular_template_cache_preloads':
-        # The compressor has modified the angular template cache preloads
-        # which are cached in the 'default' Django cache. Fetch that cache.
-        cache = caches['default']
-
-        # generate the same key as used in _scripts.html when caching the
-        # preloads
         theme = context['THEME']  # current theme being compressed
-        key = make_template_fragment_key(
-            "angular",
-            ['template_cache_preloads', theme]
-        )
-
-        # if template preloads have been cached, clear them
-        if cache.get(key):
-            cache.delete(key)
+        for key in [key for key in _bundles if key[0] == theme]:
+            del _bundles[key]
 
 
 @register.filter(name='angular_escapes')
@@ -92,6 +89,12 @@ def angular_templates(context):
       - key is the template's static path,
       - value is a string of HTML template contents
     """
+    return {
+        'angular_templates': _get_angular_templates(context)
+    }
+
+
+def _get_angular_templates(context):
     template_paths = context['HORIZON_CONFIG']['external_templates']
     all_theme_static_files = context['HORIZON_CONFIG']['theme_static_files']
     this_theme_static_files = all_theme_static_files[context['THEME']]
@@ -122,7 +125,35 @@ def angular_templates(context):
 
     templates = [(key, value) for key, value in angular_templates.items()]
     templates.sort(key=lambda item: item[0])
+    return templates
 
-    return {
-        'angular_templates': templates
-    }
+
+@register.simple_tag(takes_context=True)
+def angular_templates_bundle(context):
+    """Return the URL of a JS file pre-populating the angular template cache.
+
+    The file contains the templates of :func:`angular_templates` and is
+    named after a hash of its content, so that it can be cached by the
+    browsers for as long as it exists. It is written to the storage of
+    django-compressor once per theme and process, or on each call when
+    ``NG_TEMPLATE_CACHE_AGE`` is 0, as it is when ``DEBUG`` is ``True``.
+    When the tag is used in an offline ``compress`` block, it is only
+    called by the ``compress`` command.
+    """
+    key = (context['THEME'], context['STATIC_URL'])
+    url = _bundles.get(key)
+    if url is not None:
+        return url
+
+    content = force_bytes(loader.render_to_string(
+        'angular/angular_templates_bundle.js',
+        {'angular_templates': _get_angular_templates(context)}))
+    name = '%s/angular/templates-%s.%s.js' % (
+        compress_settings.COMPRESS_OUTPUT_DIR.strip('/'), key[0],
+        hashlib.sha256(content).hexdigest()[:12])
+    if not storage.default_storage.exists(name):
+        name = storage.default_storage.save(name, ContentFile(content))
+    url = storage.default_storage.url(name)
+    if getattr(settings, 'NG_TEMPLATE_CACHE_AGE', 0):
+        _bundles[key] = url
+    return url
@@ -15,6 +15,7 @@
 from __future__ import absolute_import
 
 from collections import OrderedDict
+import functools
 
 from django.conf import settings
 from django import template
@@ -23,7 +24,9 @@ from django.utils.encoding import force_text
 from django.utils import translation
 from django.utils.translation import ugettext_lazy as _
 
+from horizon.base import get_navigation_access
 from horizon.base import Horizon
+from horizon.base import navigation_path
 from horizon import conf
 from horizon.contrib import bootstrap_datepicker
 
@@ -53,36 +56,44 @@ def has_permissions_on_list(components, user):
             in components if has_permissions(user, component)]
 
 
+def _is_in_nav(component, context, access, path):
+    if not access.get(path, lambda: component.can_access(context)):
+        return False
+    if callable(component.nav):
+        return component.nav(context)
+    return component.nav
+
+
+def _get_nav_groups(dashboard, context, access):
+    groups = []
+    for group in dashboard.get_panel_groups().values():
+        allowed_panels = [
+            panel for panel in group
+            if _is_in_nav(panel, context, access,
+                          navigation_path(dashboard, panel))]
+        if allowed_panels:
+            groups.append((group, allowed_panels))
+    return groups
+
+
 @register.inclusion_tag('horizon/_sidebar.html', takes_context=True)
 def horizon_nav(context):
     if 'request' not in context:
         return {}
+    access = get_navigation_access(context)
     current_dashboard = context['request'].horizon.get('dashboard', None)
     current_panel_group = None
     current_panel = context['request'].horizon.get('panel', None)
     dashboards = []
     for dash in Horizon.get_dashboards():
-        panel_groups = dash.get_panel_groups()
-        non_empty_groups = []
-        for group in panel_groups.values():
-            allowed_panels = []
-            for panel in group:
-                if (callable(panel.nav) and panel.nav(context) and
-                        panel.can_access(context)):
-                    allowed_panels.append(panel)
-                elif (not callable(panel.nav) and panel.nav and
-                        panel.can_access(context)):
-                    allowed_panels.append(panel)
-                if panel == current_panel:
+        if current_panel is not None:
+            for group in dash.get_panel_groups().values():
+                if current_panel in group:
                     current_panel_group = group.slug
-            if allowed_panels:
-                non_empty_groups.append((group, allowed_panels))
-        if (callable(dash.nav) and dash.nav(context) and
-                dash.can_access(context)):
-            dashboards.append((dash, OrderedDict(non_empty_groups)))
-        elif (not callable(dash.nav) and dash.nav and
-                dash.can_access(context)):
-            dashboards.append((dash, OrderedDict(non_empty_groups)))
+        if _is_in_nav(dash, context, access, navigation_path(dash)):
+            dashboards.append(
+                (dash, OrderedDict(_get_nav_groups(dash, context, access))))
+    access.save()
     return {'components': dashboards,
             'user': context['request'].user,
             'current': current_dashboard,
@@ -96,14 +107,17 @@ def horizon_main_nav(context):
     """Generates top-level dashboard navigation entries."""
     if 'request' not in context:
         return {}
+    access = get_navigation_access(context)
     current_dashboard = context['request'].horizon.get('dashboard', None)
     dashboards = []
     for dash in Horizon.get_dashboards():
-        if dash.can_access(context):
-            if callable(dash.nav) and dash.nav(context):
-                dashboards.append(dash)
-            elif dash.nav:
-                dashboards.append(dash)
+        # Unlike the other navigation tags, the dashboards with a callable
+        # nav are listed whatever it returns.
+        if (access.get(navigation_path(dash),
+                       functools.partial(dash.can_access, context)) and
+                dash.nav):
+            dashboards.append(dash)
+    access.save()
     return {'components': dashboards,
             'user': context['request'].user,
             'current': current_dashboard,
@@ -115,24 +129,15 @@ def horizon_dashboard_nav(context):
     """Generates sub-navigation entries for the current dashboard."""
     if 'request' not in context:
         return {}
+    access = get_navigation_access(context)
     dashboard = context['request'].horizon['dashboard']
-    panel_groups = dashboard.get_panel_groups()
     non_empty_groups = []
-
-    for group in panel_groups.values():
-        allowed_panels = []
-        for panel in group:
-            if (callable(panel.nav) and panel.nav(context) and
-                    panel.can_access(context)):
-                allowed_panels.append(panel)
-            elif (not callable(panel.nav) and panel.nav and
-                    panel.can_access(context)):
-                allowed_panels.append(panel)
-        if allowed_panels:
-            if group.name is None:
-                non_empty_groups.append((dashboard.name, allowed_panels))
-            else:
-                non_empty_groups.append((group.name, allowed_panels))
+    for group, allowed_panels in _get_nav_groups(dashboard, context, access):
+        if group.name is None:
+            non_empty_groups.append((dashboard.name, allowed_panels))
+        else:
+            non_empty_groups.append((group.name, allowed_panels))
+    access.save()
 
     return {'components': OrderedDict(non_empty_groups),
             'user': context['request'].user,
@@ -114,6 +114,40 @@ class MyAction(tables.Action):
                                   % ",".join(object_ids))
 
 
+class MyPolicyAction(MyAction):
+    name = "policy"
+    policy_rules = (('compute', 'compute:delete'),)
+
+
+class MyPolicyTargetAction(MyPolicyAction):
+    name = "policy_target"
+
+    def get_policy_target(self, request, datum=None):
+        return {'project_id': getattr(datum, 'id', None)}
+
+
+class MyIndependentAction(MyPolicyAction):
+    name = "independent"
+    datum_independent = True
+
+    def allowed(self, request, obj=None):
+        return True
+
+
+class MyOwnerAction(MyPolicyAction):
+    name = "owner"
+
+    def get_policy_target(self, request, datum=None):
+        # Like the targets of instances, shared by the rows of a project.
+        return {'project_id': 'project',
+                'user_id': getattr(datum, 'status', None)}
+
+
+class MyIndependentOwnerAction(MyOwnerAction):
+    name = "independent_owner"
+    datum_independent = True
+
+
 class MyColumn(tables.Column):
     pass
 
@@ -355,6 +389,39 @@ class MyTableWrapList(MyTable):
                              wrap_list=False)
 
 
+class MyFastRenderTable(MyTable):
+    class Meta(object):
+        name = "my_table"
+        status_columns = ["status"]
+        columns = ('id', 'name', 'value', 'optional', 'status')
+        row_class = MyRow
+        row_actions = (MyAction, MyLinkAction, MyBatchAction, MyToggleAction)
+        fast_render = True
+
+
+class MyFastRenderTableWrapList(MyTableWrapList):
+    class Meta(object):
+        name = "my_table"
+        columns = ('id', 'name', 'value', 'optional', 'status')
+        fast_render = True
+
+
+class MyPolicyTable(MyTable):
+    class Meta(object):
+        name = "my_table"
+        columns = ('id', 'name', 'value', 'optional', 'status')
+        row_actions = (MyPolicyAction, MyPolicyTargetAction,
+                       MyIndependentAction)
+
+
+class MyOwnerTable(MyTable):
+    class Meta(object):
+        name = "my_table"
+        columns = ('id', 'name', 'value', 'optional', 'status')
+        row_actions = (MyPolicyAction, MyOwnerAction,
+                       MyIndependentOwnerAction)
+
+
 class NoActionsTable(tables.DataTable):
     id = tables.Column('id')
 
@@ -695,6 +762,129 @@ class DataTableTests(test.TestCase):
         resp = http.HttpResponse(table_actions)
         self.assertContains(resp, "table_search", 0)
 
+    def test_table_render_stream(self):
+        self.table = MyTable(self.request, TEST_DATA)
+        self.table._meta.stream_chunk_size = 2
+        chunks = list(self.table.render_stream())
+        # Head, two chunks of rows and tail.
+        self.assertEqual(4, len(chunks))
+        self.assertIn('<table id="my_table"', chunks[0])
+        self.assertIn('id="my_table__row__1"', chunks[1])
+        self.assertIn('id="my_table__row__2"', chunks[1])
+        self.assertIn('id="my_table__row__3"', chunks[2])
+        self.assertIn('</table>', chunks[3])
+        self.assertNotIn('<!--my_table', ''.join(chunks))
+
+    @mock.patch.object(tables.base, 'LOG')
+    def test_table_render_stream_error(self, mock_log):
+        self.table = MyTable(self.request, TEST_DATA)
+        self.table._meta.stream_chunk_size = 2
+        render = MyRow.render
+
+        def render_or_fail(row):
+            if row.datum.id == '4':
+                raise ValueError
+            return render(row)
+
+        with mock.patch.object(MyRow, 'render', render_or_fail):
+            chunks = list(self.table.render_stream())
+        self.assertEqual(4, len(chunks))
+        self.assertIn('id="my_table__row__3"', chunks[2])
+        self.assertIn('<tr class="error"><td colspan="%d">'
+                      % len(self.table.columns), chunks[2])
+        self.assertIn('</table>', chunks[3])
+        self.assertEqual(1, mock_log.exception.call_count)
+
+    def test_table_render_stream_empty(self):
+        self.table = MyTable(self.request, [])
+        resp = http.HttpResponse(''.join(self.table.render_stream()))
+        self.assertContains(resp, '<table id="my_table"', 1)
+        self.assertContains(resp, self.table.get_empty_message(), 1)
+
+    def test_table_iter_rows_is_lazy(self):
+        self.table = MyTable(self.request, TEST_DATA)
+        with mock.patch.object(MyRow, 'load_cells') as mock_load_cells:
+            rows = self.table.iter_rows()
+            mock_load_cells.assert_not_called()
+            next(rows)
+            mock_load_cells.assert_called_once_with()
+
+    def _assert_fast_render(self, table):
+        renderer = table._meta.row_renderer
+        self.assertIsNotNone(renderer)
+        for row in table.get_rows():
+            with mock.patch.object(table._meta, 'row_renderer', None):
+                expected = row.render()
+            self.assertHTMLEqual(expected, renderer.render(row))
+
+    def test_fast_render(self):
+        self._assert_fast_render(MyFastRenderTable(self.request, TEST_DATA))
+
+    def test_fast_render_wrap_list(self):
+        self._assert_fast_render(
+            MyFastRenderTableWrapList(self.request, TEST_DATA_7))
+
+    def test_fast_render_disabled_by_default(self):
+        self.assertIsNone(MyTable._meta.row_renderer)
+
+    def test_fast_render_templated_columns(self):
+        class MyCell(tables.base.Cell):
+            def render(self):
+                return super(MyCell, self).render()
+
+        class InlineEditTable(MyFastRenderTable):
+            value = tables.Column('value', update_action=MyAction)
+
+            class Meta(MyFastRenderTable.Meta):
+                pass
+
+        class CustomCellTable(MyFastRenderTable):
+            class Meta(MyFastRenderTable.Meta):
+                cell_class = MyCell
+
+        self.assertEqual(frozenset(['value']),
+                         InlineEditTable._meta.row_renderer.templated_columns)
+        self.assertEqual(
+            frozenset(['id', 'name', 'value', 'optional', 'status',
+                       'actions']),
+            CustomCellTable._meta.row_renderer.templated_columns)
+
+    def test_row_action_checks_once_per_table(self):
+        policy_check = mock.Mock(return_value=True)
+        table = MyPolicyTable(self.request, TEST_DATA)
+        with override_settings(POLICY_CHECK_FUNCTION=policy_check):
+            actions = [[action.name for action in table.get_row_actions(datum)]
+                       for datum in TEST_DATA]
+        self.assertEqual([['policy', 'policy_target', 'independent'],
+                          ['independent'],
+                          ['policy', 'policy_target', 'independent'],
+                          ['policy', 'policy_target', 'independent']],
+                         actions)
+        # policy: once per table; policy_target: once per row;
+        # independent: once per table. allowed() of policy and
+        # policy_target still runs for each row and hides them on the
+        # second one.
+        self.assertEqual(1 + len(TEST_DATA) + 1, policy_check.call_count)
+
+    def test_row_action_policy_checks_on_render(self):
+        policy_check = mock.Mock(return_value=True)
+        data = [FakeObject(str(i), 'object_%d' % i, 'value_%d' % i,
+                           ('up', 'down')[i % 2]) for i in range(20)]
+        table = MyOwnerTable(self.request, data)
+        with override_settings(POLICY_CHECK_FUNCTION=policy_check):
+            table.render()
+        # policy and independent_owner: once per table; owner: once per
+        # distinct target, the rows have two statuses.
+        self.assertEqual(1 + 2 + 1, policy_check.call_count)
+
+    def test_row_action_policy_denied_once(self):
+        policy_check = mock.Mock(return_value=False)
+        table = MyPolicyTable(self.request, TEST_DATA)
+        with override_settings(POLICY_CHECK_FUNCTION=policy_check):
+            for datum in TEST_DATA:
+                self.assertEqual([], table.get_row_actions(datum))
+        self.assertEqual(1 + len(TEST_DATA) + 1, policy_check.call_count)
+
     def test_wrap_list_rendering(self):
         self.table = MyTableWrapList(self.request, TEST_DATA_7)
         row = self.table.get_rows()[0]
@@ -1253,6 +1443,18 @@ class MultiTableView(tables.MultiTableView):
         return TEST_DATA
 
 
+class StreamedTable(MyTable):
+    class Meta(object):
+        name = "my_table"
+        columns = ('id', 'name', 'value')
+        stream_rows = True
+        stream_chunk_size = 1
+
+
+class StreamedTableView(SingleTableView):
+    table_class = StreamedTable
+
+
 class DataTableViewTests(test.TestCase):
     def _prepare_view(self, cls, *args, **kwargs):
         req = self.factory.get('/my_url/')
@@ -1296,6 +1498,23 @@ class DataTableViewTests(test.TestCase):
         self.assertEqual(TableWithPermissions,
                          context['table_with_permissions_table'].__class__)
 
+    def test_data_table_view_streamed(self):
+        view = self._prepare_view(StreamedTableView)
+        resp = view.get(view.request)
+        self.assertTrue(resp.streaming)
+        content = b''.join(resp.streaming_content).decode('utf-8')
+        self.assertEqual(1, content.count('<table id="my_table"'))
+        for datum in TEST_DATA:
+            self.assertEqual(
+                1, content.count('id="my_table__row__%s"' % datum.id))
+        self.assertNotIn('<!--my_table', content)
+
+    def test_data_table_view_streamed_ajax(self):
+        view = self._prepare_view(StreamedTableView)
+        view.request.META['HTTP_X_REQUESTED_WITH'] = 'XMLHttpRequest'
+        resp = view.get(view.request)
+        self.assertFalse(resp.streaming)
+
     fil_value_param = "my_table__filter__q"
     fil_field_param = '%s_field' % fil_value_param
 
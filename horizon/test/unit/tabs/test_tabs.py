@@ -41,6 +41,12 @@ class TabOne(BaseTestTab):
     template_name = "_tab.html"
 
 
+class TabPreloaded(BaseTestTab):
+    slug = "tab_preloaded"
+    name = "Preloaded Tab"
+    template_name = "_tab.html"
+
+
 class TabDelayed(BaseTestTab):
     slug = "tab_delayed"
     name = "Delayed Tab"
@@ -81,6 +87,13 @@ class GroupWithConfig(horizon_tabs.TabGroup):
     sticky = True
 
 
+class LazyGroup(horizon_tabs.TabGroup):
+    slug = "tab_group"
+    tabs = (TabOne, TabPreloaded, TabDelayed)
+    lazy = True
+    prefetch_on_hover = True
+
+
 class TabWithTable(horizon_tabs.TableTab):
     table_classes = (MyTable,)
     name = "Tab With My Table"
@@ -126,6 +139,41 @@ class TabWithTableView(horizon_tabs.TabbedTableView):
     template_name = "tab_group.html"
 
 
+PREFETCH_CALLS = []
+
+
+def load_prefetched(key):
+    def load(request, **kwargs):
+        PREFETCH_CALLS.append(key)
+        return key, kwargs
+    return load
+
+
+class TabPrefetch(BaseTestTab):
+    slug = "tab_prefetch"
+    name = "Prefetch Tab"
+    template_name = "_tab.html"
+    prefetch = {'server': load_prefetched('tab server'),
+                'ports': load_prefetched('ports')}
+
+    def get_context_data(self, request):
+        return {"server": self.get_prefetched('server'),
+                "ports": self.get_prefetched('ports')}
+
+
+class TabDelayedPrefetch(TabPrefetch):
+    slug = "tab_delayed_prefetch"
+    name = "Delayed Prefetch Tab"
+    preload = False
+    prefetch = {'flavor': load_prefetched('flavor')}
+
+
+class GroupWithPrefetch(horizon_tabs.TabGroup):
+    slug = "tab_group"
+    tabs = (TabPrefetch, TabDelayedPrefetch)
+    prefetch = {'server': load_prefetched('server')}
+
+
 class TabTests(test.TestCase):
     def test_tab_group_basics(self):
         tg = Group(self.request)
@@ -276,6 +324,41 @@ class TabTests(test.TestCase):
         output = tab_delayed.render()
         self.assertEqual(tab_delayed.name, output.strip())
 
+    def test_lazy_tab_group(self):
+        tg = LazyGroup(self.request)
+        self.assertEqual('hover', tg.attrs['data-prefetch-tabs'])
+        # Only the active tab is loaded, even if the others are preloaded.
+        self.assertEqual([True, False, False],
+                         [tab.load for tab in tg.get_tabs()])
+        tg.load_tab_data()
+        self.assertEqual([True, False, False],
+                         [tab.data_loaded for tab in tg.get_tabs()])
+        output = tg.render()
+        self.assertEqual(1, output.count('data-loaded=\'true\''))
+        self.assertEqual(2, output.count('data-loaded=\'false\''))
+
+        self.request.GET['tab'] = "tab_group__tab_preloaded"
+        tg = LazyGroup(self.request)
+        self.assertEqual([False, True, False],
+                         [tab.load for tab in tg.get_tabs()])
+
+    def test_tab_group_prefetch(self):
+        del PREFETCH_CALLS[:]
+        tab_group = GroupWithPrefetch(self.request, server_id='1')
+        tab_group.load_tab_data()
+        # The data of the tab group and of the loaded tabs is loaded once,
+        # the declaration of the tab group wins.
+        self.assertEqual(['ports', 'server'], sorted(PREFETCH_CALLS))
+        tab = tab_group.get_tab('tab_prefetch')
+        self.assertEqual(('server', {'server_id': '1'}),
+                         tab.get_prefetched('server'))
+
+        # The data of tabs which are not loaded is loaded when needed.
+        tab = tab_group.get_tab('tab_delayed_prefetch')
+        self.assertEqual(('flavor', {'server_id': '1'}),
+                         tab.get_prefetched('flavor'))
+        self.assertEqual(3, len(PREFETCH_CALLS))
+
     def test_table_tabs(self):
         tab_group = TableTabGroup(self.request)
         tabs = tab_group.get_tabs()
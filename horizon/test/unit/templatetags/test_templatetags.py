@@ -22,6 +22,7 @@ from django.conf import settings
 from django.template import Context
 from django.template import Template
 from django.utils.text import normalize_newlines
+import mock
 
 from horizon.test import helpers as test
 # The following imports are required to register the dashboards.
@@ -150,3 +151,12 @@ class TemplateTagTests(test.TestCase):
                                             template_text=text,
                                             context={'request': self.request})
         self.assertEqual(single_line(rendered_str), single_line(expected))
+
+    def test_horizon_main_nav_callable_nav(self):
+        # The main navigation lists a dashboard whose callable nav returns
+        # False, as long as the user can access it.
+        with mock.patch.object(Dogs, 'nav', lambda self, context: False):
+            rendered_str = self.render_template(
+                tag_require='horizon', template_text="{% horizon_main_nav %}",
+                context={'request': self.request})
+        self.assertIn('<a href="/dogs/"', rendered_str)
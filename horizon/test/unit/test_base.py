@@ -17,15 +17,22 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import datetime
+import functools
 from importlib import import_module
 
+import mock
 import six
 from six import moves
 
 from django.conf import settings
 from django.contrib.auth.models import User
+from django.core.cache import caches
 from django.core.exceptions import ImproperlyConfigured
+from django import http
+from django.test.utils import override_settings
 from django import urls
+from django.utils import timezone
 
 import horizon
 from horizon import base
@@ -527,3 +534,155 @@ class RbacHorizonTests(test.TestCase):
                                  ['<Panel: rbac_panel_yes>'])
 
         self.assertTrue(dogs.can_access(context))
+
+
+@override_settings(HORIZON_ACCESS_CACHE={'enabled': True})
+class AccessCacheTests(RbacHorizonTests):
+
+    def setUp(self):
+        super(AccessCacheTests, self).setUp()
+        caches['default'].clear()
+        self.set_token('token-1')
+
+    def set_token(self, token_id, expires_in=3600):
+        expires = timezone.now() + datetime.timedelta(seconds=expires_in)
+        self.request.user.token = mock.Mock(id=token_id, expires=expires)
+
+    def _new_request(self):
+        request = http.HttpRequest()
+        request.session = self.request.session
+        request.user = self.request.user
+        return request
+
+    @override_settings(HORIZON_ACCESS_CACHE={'enabled': False})
+    def test_cached_per_request(self):
+        dogs = horizon.get_dashboard("dogs")
+        with mock.patch.object(RbacYesAccessPanel, 'allowed',
+                               return_value=True) as mock_allowed:
+            self.assertTrue(dogs.can_access({'request': self.request}))
+            self.assertTrue(dogs.can_access({'request': self.request}))
+            self.assertTrue(dogs.can_access({'request': self._new_request()}))
+        self.assertEqual(2, mock_allowed.call_count)
+
+    def test_shared_between_requests(self):
+        dogs = horizon.get_dashboard("dogs")
+        with mock.patch.object(RbacYesAccessPanel, 'allowed',
+                               return_value=True) as mock_allowed:
+            self.assertTrue(dogs.can_access({'request': self.request}))
+            self.assertTrue(dogs.can_access({'request': self._new_request()}))
+        mock_allowed.assert_called_once_with(mock.ANY)
+        self.assertNotIn('allowed', self.request.session)
+
+    def test_keyed_by_token(self):
+        dogs = horizon.get_dashboard("dogs")
+        with mock.patch.object(RbacYesAccessPanel, 'allowed',
+                               return_value=True) as mock_allowed:
+            dogs.can_access({'request': self.request})
+            self.set_token('token-2')
+            dogs.can_access({'request': self._new_request()})
+        self.assertEqual(2, mock_allowed.call_count)
+
+    def test_expired_token_not_cached(self):
+        self.set_token('token-1', expires_in=-60)
+        dogs = horizon.get_dashboard("dogs")
+        with mock.patch.object(RbacYesAccessPanel, 'allowed',
+                               return_value=True) as mock_allowed:
+            dogs.can_access({'request': self.request})
+            dogs.can_access({'request': self._new_request()})
+        self.assertEqual(2, mock_allowed.call_count)
+
+    def test_cache_navigation_access(self):
+        cache = caches['default']
+        with mock.patch.object(cache, 'set',
+                               wraps=cache.set) as mock_set:
+            base.cache_navigation_access({'request': self.request})
+        mock_set.assert_called_once_with(mock.ANY, mock.ANY, mock.ANY)
+        decisions = mock_set.call_args[0][1]
+        self.assertTrue(decisions['%s.%s' % (Dogs.__module__, 'Dogs')])
+        self.assertTrue(decisions['%s.%s' % (__name__, 'RbacYesAccessPanel')])
+        self.assertFalse(decisions['%s.%s' % (__name__, 'RbacNoAccessPanel')])
+
+
+@override_settings(HORIZON_NAV_CACHE={'enabled': True})
+class NavCacheTests(RbacHorizonTests):
+
+    def setUp(self):
+        super(NavCacheTests, self).setUp()
+        caches['default'].clear()
+        self.set_user('token-1', ['member'])
+
+    def set_user(self, token_id, roles):
+        self.request.user.token = mock.Mock(id=token_id)
+        self.request.user.roles = [{'name': role} for role in roles]
+
+    def _new_request(self):
+        request = http.HttpRequest()
+        request.session = self.request.session
+        request.user = self.request.user
+        return request
+
+    def _get_navigation(self, request):
+        # Walks the navigation like the horizon_nav template tag.
+        context = {'request': request}
+        access = base.get_navigation_access(context)
+        navigation = {}
+        for dash in base.Horizon.get_dashboards():
+            for panel in dash.get_panels():
+                path = base.navigation_path(dash, panel)
+                navigation[path] = access.get(
+                    path, functools.partial(panel.can_access, context))
+            path = base.navigation_path(dash)
+            navigation[path] = access.get(
+                path, functools.partial(dash.can_access, context))
+        access.save()
+        return navigation
+
+    def test_navigation_access(self):
+        navigation = self._get_navigation(self.request)
+        self.assertEqual({'cats': False,
+                          'cats/rbac_panel_no': False,
+                          'dogs': True,
+                          'dogs/rbac_panel_yes': True}, navigation)
+
+    def test_shared_between_tokens_with_same_roles(self):
+        with mock.patch.object(RbacYesAccessPanel, 'allowed',
+                               return_value=True) as mock_allowed:
+            self._get_navigation(self.request)
+            self.set_user('token-2', ['member'])
+            self._get_navigation(self._new_request())
+        mock_allowed.assert_called_once_with(mock.ANY)
+
+    def test_stored_once_per_render(self):
+        cache = caches['default']
+        with mock.patch.object(cache, 'set', wraps=cache.set) as mock_set:
+            self._get_navigation(self.request)
+            self._get_navigation(self.request)
+        mock_set.assert_called_once_with(mock.ANY, mock.ANY, 3600)
+
+    def test_keyed_by_roles(self):
+        with mock.patch.object(RbacYesAccessPanel, 'allowed',
+                               return_value=True) as mock_allowed:
+            self._get_navigation(self.request)
+            self.set_user('token-2', ['member', 'reader'])
+            self._get_navigation(self._new_request())
+        self.assertEqual(2, mock_allowed.call_count)
+
+    def test_keyed_by_project(self):
+        with mock.patch.object(RbacYesAccessPanel, 'allowed',
+                               return_value=True) as mock_allowed:
+            self.request.user.project_id = 'project-1'
+            self._get_navigation(self.request)
+            self.set_user('token-2', ['member'])
+            self.request.user.project_id = 'project-2'
+            self._get_navigation(self._new_request())
+        self.assertEqual(2, mock_allowed.call_count)
+
+    @override_settings(HORIZON_NAV_CACHE={'enabled': False})
+    def test_cached_per_request(self):
+        with mock.patch.object(RbacYesAccessPanel, 'allowed',
+                               return_value=True) as mock_allowed:
+            self._get_navigation(self.request)
+            self._get_navigation(self.request)
+            self.set_user('token-2', ['member'])
+            self._get_navigation(self._new_request())
+        self.assertEqual(2, mock_allowed.call_count)
@@ -10,6 +10,9 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import os
+import shutil
+import tempfile
 import unittest
 
 from horizon.utils import file_discovery as fd
@@ -250,3 +253,44 @@ class FinderTests(unittest.TestCase):
 
         self.assertTrue(templates[0].endswith('.html'))
         self.assertTrue(templates[1].endswith('.html'))
+
+
+class ManifestTests(unittest.TestCase):
+    def setUp(self):
+        self.old_walk = fd.walk
+        fd.walk = fake_walk
+        self.tmpdir = tempfile.mkdtemp()
+        self.manifest_path = os.path.join(self.tmpdir, 'manifest.json')
+
+    def tearDown(self):
+        fd.walk = self.old_walk
+        fd.load_manifest(None)
+        shutil.rmtree(self.tmpdir)
+
+    def test_static_files_read_from_manifest(self):
+        expected = fd.discover_static_files(base_path, sub_path='a')
+        fd.write_manifest(self.manifest_path)
+        self.assertTrue(fd.load_manifest(self.manifest_path))
+
+        fd.walk = None
+        self.assertEqual(
+            tuple(expected), fd.discover_static_files(base_path, sub_path='a'))
+
+    def test_paths_missing_from_manifest_are_searched(self):
+        fd.discover_static_files(base_path, sub_path='a')
+        fd.write_manifest(self.manifest_path)
+        fd.load_manifest(self.manifest_path)
+
+        sources, mocks, specs, templates = fd.discover_static_files(
+            base_path, sub_path='b')
+        self.assertEqual(['b/b.html'], templates)
+
+    def test_missing_manifest(self):
+        self.assertFalse(fd.load_manifest(self.manifest_path))
+        sources, mocks, specs, templates = fd.discover_static_files(base_path)
+        self.assertEqual(2, len(templates))
+
+    def test_invalid_manifest(self):
+        with open(self.manifest_path, 'w') as manifest_file:
+            manifest_file.write('{')
+        self.assertFalse(fd.load_manifest(self.manifest_path))
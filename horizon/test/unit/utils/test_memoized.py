@@ -81,3 +81,17 @@ class MemoizedTests(test.TestCase):
             self.assertEqual(output2[position], leader)
             # check that some_other_func returned a memoized list.
             self.assertIs(output1, output2)
+
+    def test_memoized_last_call_was_cached(self):
+
+        @memoized.memoized
+        def cache_calls(value):
+            return value
+
+        self.assertTrue(cache_calls.memoized)
+        cache_calls(1)
+        self.assertFalse(memoized.last_call_was_cached())
+        cache_calls(1)
+        self.assertTrue(memoized.last_call_was_cached())
+        cache_calls(2)
+        self.assertFalse(memoized.last_call_was_cached())
@@ -0,0 +1,90 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+
+from horizon.test import helpers as test
+from horizon.utils import page_data
+
+
+def call_functions(*functions):
+    return [func(*args) for func, args in functions]
+
+
+class PageDataTests(test.TestCase):
+
+    def setUp(self):
+        super(PageDataTests, self).setUp()
+        self.calls = []
+
+    def _loader(self, value):
+        def load(request, **kwargs):
+            self.calls.append((value, kwargs))
+            return value
+        return load
+
+    def test_get_page_data_per_request(self):
+        data = page_data.get_page_data(self.request)
+        self.assertIs(data, page_data.get_page_data(self.request))
+        self.assertIsNot(data, page_data.get_page_data(self.factory.get('/')))
+
+    def test_first_declaration_wins(self):
+        data = page_data.PageData(self.request)
+        data.declare('server', self._loader('first'), server_id='1')
+        data.declare('server', self._loader('second'), server_id='1')
+        self.assertEqual('first', data.get('server'))
+        self.assertEqual('first', data.get('server'))
+        self.assertEqual([('first', {'server_id': '1'})], self.calls)
+
+    @mock.patch.object(page_data, '_get_parallel_call')
+    def test_fetch_in_parallel(self, mock_get_parallel_call):
+        runner = mock.Mock(side_effect=call_functions)
+        mock_get_parallel_call.return_value = runner
+        data = page_data.PageData(self.request)
+        data.declare_all({'server': self._loader('server'),
+                          'ports': self._loader('ports')})
+        data.fetch()
+        self.assertEqual(1, runner.call_count)
+        self.assertEqual(2, len(runner.call_args[0]))
+
+        # The loaded data is not loaded again.
+        data.declare('flavor', self._loader('flavor'))
+        data.fetch()
+        self.assertEqual(1, runner.call_count)
+        self.assertEqual('flavor', data.get('flavor'))
+        self.assertEqual(3, len(self.calls))
+
+    @mock.patch.object(page_data, '_get_parallel_call')
+    def test_fetch_without_parallel_call(self, mock_get_parallel_call):
+        mock_get_parallel_call.return_value = None
+        data = page_data.PageData(self.request)
+        data.declare_all({'server': self._loader('server'),
+                          'ports': self._loader('ports')})
+        data.fetch()
+        self.assertEqual(2, len(self.calls))
+        self.assertEqual('ports', data.get('ports'))
+
+    def test_get_raises_loader_exception(self):
+        error = ValueError('not found')
+        loader = mock.Mock(side_effect=error)
+        data = page_data.PageData(self.request)
+        data.declare('server', loader)
+        data.fetch()
+        for _ in range(2):
+            with self.assertRaises(ValueError) as cm:
+                data.get('server')
+            self.assertIs(error, cm.exception)
+        loader.assert_called_once_with(self.request)
+
+    def test_get_undeclared(self):
+        data = page_data.PageData(self.request)
+        self.assertRaises(KeyError, data.get, 'server')
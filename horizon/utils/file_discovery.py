@@ -10,6 +10,7 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import json
 import logging
 
 from os import path
@@ -20,6 +21,12 @@ LOG = logging.getLogger(__name__)
 MODULE_EXT = '.module.js'
 MOCK_EXT = '.mock.js'
 SPEC_EXT = '.spec.js'
+MANIFEST_KEYS = ('sources', 'mocks', 'specs', 'templates')
+
+# The directories searched by discover_static_files and the files listed
+# in the loaded manifest, both keyed by _get_manifest_key.
+_discovered = {}
+_manifest = {}
 
 
 def discover_files(base_path, sub_path='', ext='', trim_base_path=False):
@@ -76,8 +83,17 @@ def discover_static_files(base_path, sub_path=''):
     """Discovers static files in given paths.
 
     It returns JavaScript sources, mocks, specs and HTML templates,
-    all grouped in lists.
+    all grouped in lists. The files are read from the manifest loaded by
+    :func:`load_manifest` when it lists the given paths.
     """
+    key = _get_manifest_key(base_path, sub_path)
+    _discovered[key] = (base_path, sub_path)
+    if key in _manifest:
+        return tuple(list(_manifest[key][name]) for name in MANIFEST_KEYS)
+    return _walk_static_files(base_path, sub_path)
+
+
+def _walk_static_files(base_path, sub_path):
     js_files = discover_files(base_path, sub_path=sub_path,
                               ext='.js', trim_base_path=True)
     sources, mocks, specs = sort_js_files(js_files)
@@ -93,6 +109,47 @@ def discover_static_files(base_path, sub_path=''):
     return sources, mocks, specs, html_files
 
 
+def _get_manifest_key(base_path, sub_path):
+    return '%s:%s' % (path.abspath(base_path), sub_path)
+
+
+def load_manifest(manifest_path):
+    """Loads a manifest written by :func:`write_manifest`.
+
+    The paths it lists are not searched anymore by
+    :func:`discover_static_files`, which still walks the other ones.
+    Returns whether the manifest was loaded.
+    """
+    _manifest.clear()
+    if not manifest_path or not path.exists(manifest_path):
+        return False
+    try:
+        with open(manifest_path) as manifest_file:
+            manifest = json.load(manifest_file)
+    except (OSError, IOError, ValueError):
+        LOG.warning('Unable to load the static files manifest %s, the '
+                    'static files are discovered instead.', manifest_path,
+                    exc_info=True)
+        return False
+    _manifest.update(manifest)
+    return True
+
+
+def write_manifest(manifest_path):
+    """Writes the static files of the paths searched so far to a manifest.
+
+    The paths are searched again, so that the manifest does not depend on
+    the one which may have been loaded. Returns the number of paths.
+    """
+    manifest = {}
+    for key, (base_path, sub_path) in _discovered.items():
+        manifest[key] = dict(zip(MANIFEST_KEYS,
+                                 _walk_static_files(base_path, sub_path)))
+    with open(manifest_path, 'w') as manifest_file:
+        json.dump(manifest, manifest_file, indent=2, sort_keys=True)
+    return len(manifest)
+
+
 def populate_horizon_config(horizon_config, base_path,
                             sub_path='', prepend=False):
     sources, mocks, specs, template = discover_static_files(
@@ -23,6 +23,21 @@ class UnhashableKeyWarning(RuntimeWarning):
     """Raised when trying to memoize a function with an unhashable argument."""
 
 
+# Whether the value returned by the last call of a memoized function in the
+# current thread came from the cache.
+_last_call = threading.local()
+
+
+def last_call_was_cached():
+    """Return whether the last memoized call of the thread was a cache hit.
+
+    This allows to tell whether a value was actually computed when calling a
+    function decorated with :func:`memoized`, which is marked with a
+    ``memoized`` attribute set to True.
+    """
+    return getattr(_last_call, 'cached', False)
+
+
 def _try_weakref(arg, remove_callback):
     """Return a weak reference to arg if possible, or arg itself if not."""
     try:
@@ -81,6 +96,7 @@ def memoized(func):
                 pass
 
         key = _get_key(args, kwargs, remove)
+        cached = True
         try:
             with locks[key]:
                 try:
@@ -92,6 +108,7 @@ def memoized(func):
                     # exception.
                     value = cache[key]
                 except KeyError:
+                    cached = False
                     value = cache[key] = func(*args, **kwargs)
         except TypeError:
             # The calculated key may be unhashable when an unhashable
@@ -102,8 +119,11 @@ def memoized(func):
                 "The key of %s %s is not hashable and cannot be memoized: %r\n"
                 % (func.__module__, func.__name__, key),
                 UnhashableKeyWarning, 2)
+            cached = False
             value = func(*args, **kwargs)
+        _last_call.cached = cached
         return value
+    wrapped.memoized = True
     return wrapped
 
 # We can use @memoized for methods now too, because it uses weakref and so
@@ -176,5 +196,6 @@ def memoized_with_request(request_func, request_index=0):
             args.insert(request_index, request_func(request))
             return memoized_func(*args, **kwargs)
 
+        wrapped.memoized = True
         return wrapped
     return wrapper
@@ -0,0 +1,116 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Data shared by the components of a page.
+
+Tab groups, tabs and table views can declare the data they need in a
+``prefetch`` attribute, a dict mapping a key to a loader. A loader is a
+function called with the request and the keyword arguments of the tab group
+or view, e.g.::
+
+    def get_network(request, network_id, **kwargs):
+        return api.neutron.network_get(request, network_id)
+
+    class NetworkDetailsTabs(tabs.TabGroup):
+        prefetch = {'network': get_network}
+
+Before their data is loaded, all the loaders declared by the components of
+the page are called once, in parallel, and the components read the results
+with ``get_prefetched(key)`` instead of calling the API themselves. The
+first loader declared for a key wins, so components asking for the same
+data under the same key share a single call.
+
+The loaders are run by the function set in the ``parallel_call`` key of
+``HORIZON_CONFIG``, which receives the functions to call as positional
+arguments like ``call_functions_parallel`` of the OpenStack Dashboard. They
+are called one after another when it is not set.
+"""
+
+from collections import OrderedDict
+import functools
+from importlib import import_module
+import sys
+import threading
+
+import six
+
+from horizon import conf
+
+
+def _get_parallel_call():
+    parallel_call = conf.HORIZON_CONFIG['parallel_call']
+    if isinstance(parallel_call, six.string_types):
+        mod, func = parallel_call.rsplit('.', 1)
+        parallel_call = getattr(import_module(mod), func)
+    return parallel_call
+
+
+class PageData(object):
+    """The data prefetched for the components of a page."""
+
+    def __init__(self, request):
+        self.request = request
+        self._loaders = OrderedDict()
+        self._results = {}
+        self._lock = threading.Lock()
+
+    def declare(self, key, loader, **kwargs):
+        """Declare the loader of key unless one is declared already."""
+        if key not in self._loaders:
+            self._loaders[key] = functools.partial(loader, self.request,
+                                                   **kwargs)
+
+    def declare_all(self, prefetch, **kwargs):
+        for key, loader in prefetch.items():
+            self.declare(key, loader, **kwargs)
+
+    def _load(self, key):
+        try:
+            result = (True, self._loaders[key]())
+        except Exception:
+            result = (False, sys.exc_info())
+        with self._lock:
+            self._results.setdefault(key, result)
+
+    def fetch(self):
+        """Call the declared loaders which have not been called yet."""
+        pending = [key for key in self._loaders if key not in self._results]
+        parallel_call = _get_parallel_call()
+        if len(pending) > 1 and parallel_call:
+            parallel_call(*[(self._load, [key]) for key in pending])
+        else:
+            for key in pending:
+                self._load(key)
+
+    def get(self, key):
+        """Return the data loaded for key.
+
+        The loader is called now if it was not called by :meth:`fetch`.
+        The exception raised by the loader, if any, is raised again.
+        """
+        if key not in self._results:
+            if key not in self._loaders:
+                raise KeyError(key)
+            self._load(key)
+        succeeded, value = self._results[key]
+        if not succeeded:
+            six.reraise(*value)
+        return value
+
+
+def get_page_data(request):
+    """Return the data shared by the components of the page of request."""
+    page_data = getattr(request, '_page_data', None)
+    if not isinstance(page_data, PageData):
+        page_data = PageData(request)
+        request._page_data = page_data
+    return page_data
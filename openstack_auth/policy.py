@@ -27,6 +27,7 @@ from openstack_auth import utils as auth_utils
 LOG = logging.getLogger(__name__)
 
 _ENFORCER = None
+_GENERATION = 0
 _BASE_PATH = getattr(settings, 'POLICY_FILES_PATH', '')
 
 
@@ -71,8 +72,10 @@ def _get_enforcer():
 
 
 def reset():
-    global _ENFORCER
+    global _ENFORCER, _GENERATION
     _ENFORCER = None
+    # Decisions cached before the reset must not be reused.
+    _GENERATION += 1
 
 
 def check(actions, request, target=None):
@@ -113,6 +116,25 @@ def check(actions, request, target=None):
                       {'project_id': object.project_id}
     :returns: boolean if the user has permission or not for the actions.
     """
+    return check_all((actions,), request, target)[0]
+
+
+def check_all(action_sets, request, target=None):
+    """Check user permission for several sets of actions at once.
+
+    This is equivalent to calling :func:`check` for each set of actions
+    with the same target, but the target and the credentials are only
+    prepared once.
+
+    Each decision for a single (scope, action) is kept for the rest of the
+    request, keyed by the credentials and the target it was made with, so
+    the same rule is enforced only once per request for a given target.
+
+    :param action_sets: list of ``actions`` as accepted by :func:`check`.
+    :param request: django http request object.
+    :param target: dictionary representing the object of the actions.
+    :returns: list of booleans, one per set of actions.
+    """
     if target is None:
         target = {}
     user = auth_utils.get_user(request)
@@ -150,32 +172,79 @@ def check(actions, request, target=None):
     domain_credentials = _domain_to_credentials(request, user)
     # if there is a domain token use the domain_id instead of the user's domain
     if domain_credentials:
-        credentials['domain_id'] = domain_credentials.get('domain_id')
+        credentials = dict(credentials,
+                           domain_id=domain_credentials.get('domain_id'))
 
     enforcer = _get_enforcer()
-
-    for action in actions:
-        scope, action = action[0], action[1]
-        if scope in enforcer:
-            # this is for handling the v3 policy file and will only be
-            # needed when a domain scoped token is present
-            if scope == 'identity' and domain_credentials:
-                # use domain credentials
-                if not _check_credentials(enforcer[scope],
-                                          action,
-                                          target,
-                                          domain_credentials):
-                    return False
-
-            # use project credentials
-            if not _check_credentials(enforcer[scope],
-                                      action, target, credentials):
-                return False
-
+    decisions = _get_decisions(request)
+    counts = get_check_counts(request)
+    prefix = (_GENERATION,
+              _credentials_fingerprint(credentials),
+              _credentials_fingerprint(domain_credentials),
+              _target_fingerprint(target))
+
+    def is_allowed(scope, action):
+        counts['checks'] += 1
+        key = prefix + (scope, action)
+        if key in decisions:
+            counts['cached'] += 1
+            return decisions[key]
+        counts['enforced'] += 1
+        allowed = True
+        # this is for handling the v3 policy file and will only be
+        # needed when a domain scoped token is present
+        if scope == 'identity' and domain_credentials:
+            # use domain credentials
+            allowed = _check_credentials(enforcer[scope], action, target,
+                                         domain_credentials)
+        # use project credentials
+        allowed = allowed and _check_credentials(enforcer[scope], action,
+                                                 target, credentials)
+        decisions[key] = allowed
+        return allowed
+
+    results = []
+    for actions in action_sets:
         # if no policy for scope, allow action, underlying API will
         # ultimately block the action if not permitted, treat as though
         # allowed
-    return True
+        results.append(all(is_allowed(action[0], action[1])
+                           for action in actions if action[0] in enforcer))
+    return results
+
+
+def get_check_counts(request):
+    """Returns the policy check counters of the request.
+
+    ``checks`` is the number of (scope, action) pairs checked,
+    ``enforced`` the number of them which were evaluated by the policy
+    engine and ``cached`` the number answered from earlier decisions.
+    """
+    counts = getattr(request, '_policy_check_counts', None)
+    if not isinstance(counts, dict):
+        counts = {'checks': 0, 'enforced': 0, 'cached': 0}
+        request._policy_check_counts = counts
+    return counts
+
+
+def _get_decisions(request):
+    decisions = getattr(request, '_policy_decisions', None)
+    if not isinstance(decisions, dict):
+        decisions = {}
+        request._policy_decisions = decisions
+    return decisions
+
+
+def _credentials_fingerprint(credentials):
+    if not credentials:
+        return None
+    return (credentials['user_id'], credentials['project_id'],
+            credentials['domain_id'], credentials['is_admin'],
+            tuple(sorted(credentials['roles'])))
+
+
+def _target_fingerprint(target):
+    return tuple(sorted((key, repr(value)) for key, value in target.items()))
 
 
 def _check_credentials(enforcer_scope, action, target, credentials):
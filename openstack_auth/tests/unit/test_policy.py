@@ -84,6 +84,55 @@ class PolicyTestCaseNonAdmin(PolicyTestCase):
         self.assertTrue(value)
 
 
+class PolicyTestDecisionCache(PolicyTestCase):
+    _roles = [{'id': '1', 'name': 'member'}]
+
+    def setUp(self):
+        super(PolicyTestDecisionCache, self).setUp()
+        policy.reset()
+
+    def test_repeated_check_cached(self):
+        actions = (("identity", "admin_required"),)
+        with mock.patch.object(policy, '_check_credentials',
+                               wraps=policy._check_credentials) as mock_check:
+            self.assertFalse(policy.check(actions, request=self.request))
+            self.assertFalse(policy.check(actions, request=self.request))
+        self.assertEqual(1, mock_check.call_count)
+        self.assertEqual({'checks': 2, 'enforced': 1, 'cached': 1},
+                         policy.get_check_counts(self.request))
+
+    def test_target_is_part_of_the_key(self):
+        actions = (("compute", "context_is_admin"),)
+        policy.check(actions, self.request, {'project_id': 'a'})
+        policy.check(actions, self.request, {'project_id': 'b'})
+        self.assertEqual({'checks': 2, 'enforced': 2, 'cached': 0},
+                         policy.get_check_counts(self.request))
+
+    def test_reset_drops_decisions(self):
+        actions = (("identity", "admin_required"),)
+        policy.check(actions, request=self.request)
+        policy.reset()
+        policy.check(actions, request=self.request)
+        self.assertEqual(2, policy.get_check_counts(self.request)['enforced'])
+
+    def test_not_shared_between_requests(self):
+        actions = (("identity", "admin_required"),)
+        policy.check(actions, request=self.request)
+        other_request = http.HttpRequest()
+        policy.check(actions, request=other_request)
+        self.assertEqual(1, policy.get_check_counts(other_request)['enforced'])
+
+    def test_check_all(self):
+        action_sets = [(("identity", "admin_required"),),
+                       (("dummy", "default"),),
+                       (("dummy", "default"),
+                        ("compute", "context_is_admin"))]
+        self.assertEqual([False, True, False],
+                         policy.check_all(action_sets, self.request))
+        self.assertEqual({'checks': 2, 'enforced': 2, 'cached': 0},
+                         policy.get_check_counts(self.request))
+
+
 class PolicyTestCheckCredentials(PolicyTestCase):
     _roles = [{'id': '1', 'name': 'member'}]
 
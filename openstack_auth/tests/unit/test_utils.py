@@ -11,11 +11,18 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import datetime
+import uuid
+
 from django.conf import settings
+from django.core.cache import cache
 from django import http
 from django import test
 from django.test import client
 from django.test.utils import override_settings
+from django.utils import timezone
+from keystoneclient.v3 import projects
+import mock
 
 from openstack_auth import utils
 
@@ -118,6 +125,70 @@ class UtilsTestCase(test.TestCase):
         self.assertEqual("RegionOne", default_region)
 
 
+@override_settings(OPENSTACK_PROJECT_LIST_CACHE={'enabled': True})
+class ProjectListCacheTestCase(test.TestCase):
+
+    def setUp(self):
+        super(ProjectListCacheTestCase, self).setUp()
+        self.addCleanup(cache.clear)
+        self.projects = [
+            projects.Project(None, {'id': 'p1', 'name': 'one',
+                                    'enabled': True}, loaded=True),
+            projects.Project(None, {'id': 'p2', 'name': 'two',
+                                    'enabled': False}, loaded=True),
+        ]
+        patcher = mock.patch.object(utils, 'get_project_list',
+                                    return_value=self.projects)
+        self.mock_get_project_list = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.token = uuid.uuid4().hex
+
+    def _get_projects(self, user_id='user', token=None, **kwargs):
+        return utils.get_cached_project_list(
+            user_id, 'http://localhost:5000/v3', token or self.token,
+            **kwargs)
+
+    def test_cached_per_token(self):
+        first = self._get_projects()
+        second = self._get_projects()
+        self.assertEqual(1, self.mock_get_project_list.call_count)
+        self.assertEqual(['p1', 'p2'], [project.id for project in first])
+        self.assertEqual([project.to_dict() for project in self.projects],
+                         [project.to_dict() for project in second])
+        self.assertIsInstance(second[0], projects.Project)
+
+        self._get_projects(token=uuid.uuid4().hex)
+        self.assertEqual(2, self.mock_get_project_list.call_count)
+
+    def test_invalidate_user(self):
+        self._get_projects()
+        self._get_projects(user_id='other', token='other token')
+        utils.invalidate_project_list(user_id='user')
+        self._get_projects()
+        self._get_projects(user_id='other', token='other token')
+        self.assertEqual(3, self.mock_get_project_list.call_count)
+
+    def test_invalidate_all_users(self):
+        self._get_projects()
+        self._get_projects(user_id='other', token='other token')
+        utils.invalidate_project_list()
+        self._get_projects()
+        self._get_projects(user_id='other', token='other token')
+        self.assertEqual(4, self.mock_get_project_list.call_count)
+
+    def test_not_cached_after_token_expiry(self):
+        expires = timezone.now() - datetime.timedelta(seconds=1)
+        self._get_projects(expires=expires)
+        self._get_projects(expires=expires)
+        self.assertEqual(2, self.mock_get_project_list.call_count)
+
+    @override_settings(OPENSTACK_PROJECT_LIST_CACHE={'enabled': False})
+    def test_disabled(self):
+        self._get_projects()
+        self._get_projects()
+        self.assertEqual(2, self.mock_get_project_list.call_count)
+
+
 class BehindProxyTestCase(test.TestCase):
 
     def setUp(self):
@@ -304,15 +304,20 @@ class User(models.AbstractBaseUser, models.AnonymousUser):
 
     @property
     def authorized_tenants(self):
-        """Returns a memoized list of tenants this user may access."""
+        """Returns a memoized list of tenants this user may access.
+
+        The list is shared by the requests made with the same unscoped
+        token when the ``OPENSTACK_PROJECT_LIST_CACHE`` setting is enabled.
+        """
         if self.is_authenticated and self._authorized_tenants is None:
             endpoint = self.endpoint
             try:
-                self._authorized_tenants = utils.get_project_list(
+                self._authorized_tenants = utils.get_cached_project_list(
                     user_id=self.id,
                     auth_url=endpoint,
                     token=self.unscoped_token,
-                    is_federated=self.is_federated)
+                    is_federated=self.is_federated,
+                    expires=getattr(self.token, 'expires', None))
             except (keystone_exceptions.ClientException,
                     keystone_exceptions.AuthorizationFailure):
                 LOG.exception('Unable to retrieve project list.')
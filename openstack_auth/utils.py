@@ -12,19 +12,24 @@
 # limitations under the License.
 
 import datetime
+import hashlib
 import logging
 import re
+import uuid
 
 from django.conf import settings
 from django.contrib import auth
 from django.contrib.auth import models
+from django.core.cache import caches
 from django.utils import timezone
 from keystoneauth1.identity import v2 as v2_auth
 from keystoneauth1.identity import v3 as v3_auth
 from keystoneauth1 import session
 from keystoneauth1 import token_endpoint
 from keystoneclient.v2_0 import client as client_v2
+from keystoneclient.v2_0 import tenants as tenants_v2
 from keystoneclient.v3 import client as client_v3
+from keystoneclient.v3 import projects as projects_v3
 from six.moves.urllib import parse as urlparse
 
 
@@ -342,6 +347,100 @@ def get_project_list(*args, **kwargs):
     return projects
 
 
+DEFAULT_PROJECT_LIST_CACHE = {
+    'enabled': False,
+    'cache': 'default',
+    'timeout': 300,
+}
+PROJECT_LIST_CACHE_KEY_PREFIX = 'openstack_auth:projects'
+
+
+def get_project_list_cache_config():
+    config = dict(DEFAULT_PROJECT_LIST_CACHE)
+    config.update(getattr(settings, 'OPENSTACK_PROJECT_LIST_CACHE', {}))
+    return config
+
+
+def _get_project_list_cache():
+    config = get_project_list_cache_config()
+    if not config['enabled']:
+        return None, config
+    return caches[config['cache']], config
+
+
+def _hash_key(*parts):
+    return hashlib.sha256(':'.join(
+        str(part) for part in parts).encode('utf-8')).hexdigest()
+
+
+def _get_generation_keys(user_id):
+    # A generation is changed to invalidate the lists of a user, or of all
+    # the users when the user is not known, e.g. for a group role change.
+    return ('%s:generation:%s' % (PROJECT_LIST_CACHE_KEY_PREFIX,
+                                  _hash_key(user_id)),
+            '%s:generation' % PROJECT_LIST_CACHE_KEY_PREFIX)
+
+
+def _deserialize_projects(data):
+    # The projects returned by the client keep a reference to it and
+    # cannot be stored in the cache, only their attributes are.
+    if get_keystone_version() < 3:
+        resource_class = tenants_v2.Tenant
+    else:
+        resource_class = projects_v3.Project
+    return [resource_class(None, info, loaded=True) for info in data]
+
+
+def get_cached_project_list(user_id, auth_url, token, is_federated=False,
+                            expires=None):
+    """Returns the projects of a user, cached per unscoped token.
+
+    The list is kept in the Django cache set by the
+    ``OPENSTACK_PROJECT_LIST_CACHE`` setting for ``timeout`` seconds, or
+    until the token expires. It is dropped by
+    :func:`invalidate_project_list`. When the cache is not enabled the
+    projects are retrieved from Keystone on every call.
+    """
+    cache, config = _get_project_list_cache()
+    if cache is None or not token:
+        return get_project_list(user_id=user_id, auth_url=auth_url,
+                                token=token, is_federated=is_federated)
+
+    key = '%s:%s' % (PROJECT_LIST_CACHE_KEY_PREFIX,
+                     _hash_key(token, auth_url))
+    generation_keys = _get_generation_keys(user_id)
+    entries = cache.get_many((key,) + generation_keys)
+    generations = tuple(entries.get(k) for k in generation_keys)
+    if key in entries and entries[key][0] == generations:
+        return _deserialize_projects(entries[key][1])
+
+    projects = get_project_list(user_id=user_id, auth_url=auth_url,
+                                token=token, is_federated=is_federated)
+    timeout = config['timeout']
+    if expires is not None:
+        now = timezone.now() if timezone.is_aware(expires) \
+            else datetime.datetime.utcnow()
+        timeout = min(timeout, int((expires - now).total_seconds()))
+    if timeout > 0:
+        cache.set(key, (generations,
+                        [project.to_dict() for project in projects]),
+                  timeout)
+    return projects
+
+
+def invalidate_project_list(user_id=None):
+    """Drops the cached project lists of a user.
+
+    The lists of all the users are dropped when ``user_id`` is ``None``.
+    """
+    cache, config = _get_project_list_cache()
+    if cache is None:
+        return
+    user_key, global_key = _get_generation_keys(user_id)
+    cache.set(global_key if user_id is None else user_key,
+              uuid.uuid4().hex, None)
+
+
 def default_services_region(service_catalog, request=None,
                             ks_endpoint=None):
     """Return the default service region.
@@ -218,6 +218,9 @@ def switch(request, tenant_id, redirect_field_name=auth.REDIRECT_FIELD_NAME):
         redirect_to = settings.LOGIN_REDIRECT_URL
 
     if auth_ref:
+        # Refresh the projects shown to the user, who may have been
+        # switching to a project granted recently.
+        utils.invalidate_project_list(user_id=request.user.id)
         user = auth_user.create_user_from_token(
             request,
             auth_user.Token(auth_ref, unscoped_token=unscoped_token),
@@ -0,0 +1,216 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Cross-request cache for read-mostly API calls.
+
+``horizon.utils.memoized`` only keeps results for the lifetime of a single
+request. The helpers in this module store the results of selected API calls
+in a Django cache backend so that they are shared between requests and
+between web server processes.
+
+Entries are keyed on the Keystone endpoint, the region and, depending on the
+scope of the cached resource, the project or the user. Each resource has a
+generation token per Keystone endpoint and region; mutating API calls replace
+the token by calling :func:`invalidate`, which makes all existing entries of
+the resource unreachable without having to enumerate them.
+
+The cache is disabled by default and is configured with the
+``OPENSTACK_API_CACHE`` setting.
+"""
+
+import functools
+import hashlib
+import json
+import logging
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+
+
+LOG = logging.getLogger(__name__)
+
+# The result is the same for everyone using the same service endpoint.
+SCOPE_REGION = 'region'
+# The result depends on the project and on the roles of the user in it.
+SCOPE_PROJECT = 'project'
+# The result is specific to a single user in a single project.
+SCOPE_USER = 'user'
+
+DEFAULT_CONFIG = {
+    'enabled': False,
+    'cache': 'default',
+    'default_timeout': 60,
+    'timeouts': {
+        'addresses': 30,
+        'extensions': 3600,
+        'flavors': 300,
+        'images': 60,
+        'swift_objects': 30,
+    },
+}
+
+KEY_PREFIX = 'horizon:api'
+
+
+def get_config():
+    config = dict(DEFAULT_CONFIG)
+    config.update(getattr(settings, 'OPENSTACK_API_CACHE', {}))
+    return config
+
+
+def is_enabled():
+    return get_config()['enabled']
+
+
+def get_timeout(resource):
+    config = get_config()
+    timeouts = dict(DEFAULT_CONFIG['timeouts'])
+    timeouts.update(config.get('timeouts', {}))
+    return timeouts.get(resource, config['default_timeout'])
+
+
+def _get_cache():
+    return caches[get_config()['cache']]
+
+
+def _hash(*parts):
+    data = json.dumps(parts, sort_keys=True, default=repr)
+    return hashlib.sha1(data.encode('utf-8')).hexdigest()
+
+
+def _get_location(request):
+    return (getattr(request.user, 'endpoint', None),
+            getattr(request.user, 'services_region', None))
+
+
+def _get_scope(request, scope):
+    if scope == SCOPE_REGION:
+        return ()
+    user = request.user
+    if scope == SCOPE_PROJECT:
+        roles = sorted(role['name'] for role in getattr(user, 'roles', []))
+        return (user.tenant_id, roles)
+    return (user.tenant_id, user.id)
+
+
+def _generation_key(resource, location):
+    return '%s:generation:%s:%s' % (KEY_PREFIX, resource, _hash(*location))
+
+
+def _get_generation(cache, resource, location):
+    key = _generation_key(resource, location)
+    generation = cache.get(key)
+    if generation is None:
+        generation = uuid.uuid4().hex
+        # Another process may have created the token in the meantime, in
+        # which case theirs wins.
+        if not cache.add(key, generation, None):
+            generation = cache.get(key, generation)
+    return generation
+
+
+def _entry_keys(request, resource, names, scope):
+    cache = _get_cache()
+    location = _get_location(request)
+    prefix = _hash(_get_generation(cache, resource, location), location,
+                   _get_scope(request, scope))
+    return cache, dict(('%s:%s:%s:%s' % (KEY_PREFIX, resource, prefix,
+                                         _hash(name)), name)
+                       for name in names)
+
+
+def get_entries(request, resource, names, scope=SCOPE_PROJECT):
+    """Return the cached entries of a resource stored with set_entries.
+
+    Unlike :func:`cached`, which stores the whole result of a call, this
+    allows to keep individual items of a listing, for example the state of
+    each server, and to refresh only the missing or outdated ones.
+
+    :returns: a dict mapping the names found in the cache to their values.
+    """
+    if not is_enabled() or not names:
+        return {}
+    cache, keys = _entry_keys(request, resource, names, scope)
+    return dict((keys[key], value)
+                for key, value in cache.get_many(list(keys)).items())
+
+
+def set_entries(request, resource, entries, scope=SCOPE_PROJECT):
+    """Store the given dict of entries of a resource in the cache."""
+    if not is_enabled() or not entries:
+        return
+    cache, keys = _entry_keys(request, resource, list(entries), scope)
+    cache.set_many(dict((key, entries[name]) for key, name in keys.items()),
+                   get_timeout(resource))
+
+
+def invalidate(request, *resources):
+    """Drop the cached entries of the given resources.
+
+    This has to be called by every API call which modifies one of the
+    cached resources. Entries are dropped for every project and user of the
+    current Keystone endpoint and region.
+    """
+    if not is_enabled():
+        return
+    cache = _get_cache()
+    location = _get_location(request)
+    for resource in resources:
+        cache.set(_generation_key(resource, location), uuid.uuid4().hex, None)
+
+
+def cached(resource, scope=SCOPE_PROJECT, request_index=0,
+           serialize=None, deserialize=None):
+    """Decorator which caches the result of an API call across requests.
+
+    :param resource: name of the cached resource. It selects the timeout
+        from the ``timeouts`` of ``OPENSTACK_API_CACHE`` and is the name
+        passed to :func:`invalidate` by mutating API calls.
+    :param scope: one of ``SCOPE_REGION``, ``SCOPE_PROJECT`` and
+        ``SCOPE_USER``. It controls who can share the cached entries.
+    :param request_index: position of the request in the positional
+        arguments of the decorated function.
+    :param serialize: function converting the result into a picklable
+        value. Objects returned by the python clients usually keep a
+        reference to the client and cannot be stored as they are.
+    :param deserialize: function receiving the request and the serialized
+        value and returning the result to be used by the caller.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapped(*args, **kwargs):
+            if not is_enabled():
+                return func(*args, **kwargs)
+            request = args[request_index]
+            other_args = args[:request_index] + args[request_index + 1:]
+            cache = _get_cache()
+            location = _get_location(request)
+            key = '%s:%s:%s' % (KEY_PREFIX, resource, _hash(
+                func.__module__, func.__name__,
+                _get_generation(cache, resource, location), location,
+                _get_scope(request, scope), other_args, kwargs))
+
+            data = cache.get(key)
+            if data is not None:
+                LOG.debug('API cache hit for %s.%s',
+                          func.__module__, func.__name__)
+                if deserialize:
+                    return deserialize(request, data)
+                return data
+
+            result = func(*args, **kwargs)
+            data = serialize(result) if serialize else result
+            cache.set(key, data, get_timeout(resource))
+            return result
+        return wrapped
+    return decorator
@@ -0,0 +1,151 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Process-wide registry of the capabilities of the OpenStack services.
+
+The microversions and extensions supported by a service only change when
+the service is upgraded or reconfigured, but panels check them on every
+navigation render. The functions decorated with :func:`registered` keep
+their result in memory, keyed by the endpoint of the service, and share it
+between all the requests and users of the process.
+
+An entry is loaded by the first request which needs it. Once it is older
+than ``refresh_interval`` seconds, the requests keep using it while it is
+reloaded in the background with the credentials of the request which
+noticed it, so that the capabilities are read without any network call
+once they are known.
+
+The registry is disabled by default and is configured with the
+``OPENSTACK_CAPABILITY_REGISTRY`` setting.
+"""
+
+import functools
+import logging
+import threading
+import time
+
+from django.conf import settings
+import six
+
+from horizon import exceptions
+
+from openstack_dashboard.api import base
+from openstack_dashboard.utils import futurist_utils
+
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_OPTIONS = {
+    'enabled': False,
+    'refresh_interval': 600,
+}
+
+_registry = {}
+_lock = threading.Lock()
+
+
+def get_options():
+    options = dict(DEFAULT_OPTIONS)
+    options.update(getattr(settings, 'OPENSTACK_CAPABILITY_REGISTRY', {}))
+    return options
+
+
+def reset():
+    """Forget all the capabilities known by this process."""
+    with _lock:
+        _registry.clear()
+
+
+class _Entry(object):
+    def __init__(self, value):
+        self.value = value
+        self.updated = time.time()
+        self.refreshing = False
+
+    def start_refresh(self, refresh_interval):
+        """Return whether the caller has to refresh the entry."""
+        with _lock:
+            if (self.refreshing or
+                    time.time() - self.updated < refresh_interval):
+                return False
+            self.refreshing = True
+            return True
+
+    def refresh(self, fetch, args, kwargs):
+        try:
+            self.value = fetch(*args, **kwargs)
+        except Exception:
+            LOG.warning('Unable to refresh the capability %s, the known '
+                        'value is kept.', getattr(fetch, '__name__', fetch),
+                        exc_info=True)
+        finally:
+            # A failed refresh is retried after another interval.
+            self.updated = time.time()
+            self.refreshing = False
+
+
+def _get_endpoint(request, service_types):
+    for service_type in service_types:
+        try:
+            return base.url_for(request, service_type)
+        except exceptions.ServiceCatalogException:
+            continue
+    return None
+
+
+def registered(service_type=None, fetch=None, request_index=0):
+    """Decorator keeping the result of a function in the registry.
+
+    :param service_type: type, or tuple of types tried in order, of the
+        service whose endpoint the result belongs to. When it is ``None``
+        the arguments of the function are expected to identify the
+        service.
+    :param fetch: function called with the same arguments as the decorated
+        function to load and refresh the entries. It defaults to the
+        decorated function, and is needed when that function is memoized,
+        which would return the same result again instead of reloading it.
+    :param request_index: position of the request in the positional
+        arguments of the decorated function.
+    """
+    if isinstance(service_type, six.string_types):
+        service_type = (service_type,)
+
+    def decorator(func):
+        load = fetch or func
+
+        @functools.wraps(func)
+        def wrapped(*args, **kwargs):
+            options = get_options()
+            if not options['enabled']:
+                return func(*args, **kwargs)
+            request = args[request_index]
+            other_args = args[:request_index] + args[request_index + 1:]
+            endpoint = None
+            if service_type:
+                endpoint = _get_endpoint(request, service_type)
+                if endpoint is None:
+                    return func(*args, **kwargs)
+            key = (func.__module__, func.__name__, endpoint, other_args,
+                   tuple(sorted(kwargs.items())))
+
+            entry = _registry.get(key)
+            if entry is None:
+                value = load(*args, **kwargs)
+                with _lock:
+                    _registry.setdefault(key, _Entry(value))
+                return value
+            if entry.start_refresh(options['refresh_interval']):
+                futurist_utils.get_executor().submit(entry.refresh, load,
+                                                     args, kwargs)
+            return entry.value
+        return wrapped
+    return decorator
@@ -37,9 +37,11 @@ from horizon.utils.memoized import memoized
 from horizon.utils.memoized import memoized_with_request
 
 from openstack_dashboard.api import base
+from openstack_dashboard.api import capabilities
 from openstack_dashboard.api import microversions
 from openstack_dashboard.api import nova
 from openstack_dashboard.contrib.developer.profiler import api as profiler
+from openstack_dashboard.utils import futurist_utils
 
 LOG = logging.getLogger(__name__)
 
@@ -249,6 +251,11 @@ def cinderclient(request_auth_params, version=None):
     return c
 
 
+@capabilities.registered()
+def _get_server_version(request, cinder_url):
+    return cinder_client.get_server_version(cinder_url)
+
+
 def get_microversion(request, features):
     for service_name in ('volume', 'volumev2', 'volumev3'):
         try:
@@ -258,7 +265,7 @@ def get_microversion(request, features):
             continue
     else:
         return None
-    min_ver, max_ver = cinder_client.get_server_version(cinder_url)
+    min_ver, max_ver = _get_server_version(request, cinder_url)
     return (microversions.get_microversion_for_features(
         'cinder', features, api_versions.APIVersion, min_ver, max_ver))
 
@@ -791,43 +798,56 @@ def default_quota_get(request, tenant_id):
     return base.QuotaSet(cinderclient(request).quotas.defaults(tenant_id))
 
 
+@profiler.trace
+@memoized
+def volume_type_qos_associations(request):
+    """Return a dict mapping volume type ids to their QoS spec.
+
+    The associations of all QoS specs are retrieved concurrently and the
+    result is kept for the rest of the request.
+    """
+    qos_specs = qos_spec_list(request)
+    associations = futurist_utils.call_functions_parallel(
+        *[(qos_spec_get_associations, [request, qos_spec.id])
+          for qos_spec in qos_specs])
+    qos_specs_by_type = {}
+    for qos_spec, assoc_vol_types in zip(qos_specs, associations):
+        for assoc_vol_type in assoc_vol_types:
+            qos_specs_by_type[assoc_vol_type.id] = qos_spec
+    return qos_specs_by_type
+
+
+def _volume_type_qos_specs(request, vol_types):
+    # Cinder returns the id of the associated QoS spec with the volume types
+    # when the policy allows it, in which case the associations do not have
+    # to be retrieved spec by spec.
+    if all('qos_specs_id' in getattr(vol_type, '_info', {})
+           for vol_type in vol_types):
+        qos_specs = dict((qos_spec.id, qos_spec)
+                         for qos_spec in qos_spec_list(request))
+        return dict((vol_type.id,
+                     qos_specs.get(vol_type._info['qos_specs_id']))
+                    for vol_type in vol_types)
+    return volume_type_qos_associations(request)
+
+
 def volume_type_list_with_qos_associations(request):
     vol_types = volume_type_list(request)
-    vol_types_dict = {}
+    if not vol_types:
+        return vol_types
 
-    # initialize and build a dictionary for lookup access below
+    qos_specs = _volume_type_qos_specs(request, vol_types)
     for vol_type in vol_types:
-        vol_type.associated_qos_spec = ""
-        vol_types_dict[vol_type.id] = vol_type
-
-    # get all currently defined qos specs
-    qos_specs = qos_spec_list(request)
-    for qos_spec in qos_specs:
-        # get all volume types this qos spec is associated with
-        assoc_vol_types = qos_spec_get_associations(request, qos_spec.id)
-        for assoc_vol_type in assoc_vol_types:
-            # update volume type to hold this association info
-            vol_type = vol_types_dict[assoc_vol_type.id]
-            vol_type.associated_qos_spec = qos_spec.name
+        qos_spec = qos_specs.get(vol_type.id)
+        vol_type.associated_qos_spec = qos_spec.name if qos_spec else ""
 
     return vol_types
 
 
 def volume_type_get_with_qos_association(request, volume_type_id):
     vol_type = volume_type_get(request, volume_type_id)
-    vol_type.associated_qos_spec = ""
-
-    # get all currently defined qos specs
-    qos_specs = qos_spec_list(request)
-    for qos_spec in qos_specs:
-        # get all volume types this qos spec is associated with
-        assoc_vol_types = qos_spec_get_associations(request, qos_spec.id)
-        for assoc_vol_type in assoc_vol_types:
-            if vol_type.id == assoc_vol_type.id:
-                # update volume type to hold this association info
-                vol_type.associated_qos_spec = qos_spec.name
-                return vol_type
-
+    qos_spec = _volume_type_qos_specs(request, [vol_type]).get(vol_type.id)
+    vol_type.associated_qos_spec = qos_spec.name if qos_spec else ""
     return vol_type
 
 
@@ -1014,10 +1034,17 @@ def availability_zone_list(request, detailed=False):
     return cinderclient(request).availability_zones.list(detailed=detailed)
 
 
+def _list_extensions(cinder_api):
+    return tuple(cinder_list_extensions.ListExtManager(cinder_api).show_all())
+
+
 @profiler.trace
+@capabilities.registered(
+    ('volumev3', 'volumev2', 'volume'),
+    fetch=lambda request: _list_extensions(cinderclient(request)))
 @memoized_with_request(cinderclient)
 def list_extensions(cinder_api):
-    return tuple(cinder_list_extensions.ListExtManager(cinder_api).show_all())
+    return _list_extensions(cinder_api)
 
 
 @memoized_with_request(list_extensions)
@@ -23,20 +23,27 @@ import itertools
 import json
 import logging
 import os
+import threading
+import time
 
 from django.conf import settings
+from django.core.cache import caches
 from django.core.files.uploadedfile import InMemoryUploadedFile
-from django.core.files.uploadedfile import SimpleUploadedFile
 from django.core.files.uploadedfile import TemporaryUploadedFile
+from django.utils.translation import ugettext_lazy as _
 
+import futurist
 import glanceclient as glance_client
 import six
-from six.moves import _thread as thread
 
+from horizon import exceptions
 from horizon.utils import functions as utils
 from horizon.utils.memoized import memoized
 from openstack_dashboard.api import base
+from openstack_dashboard.api import cache as api_cache
+from openstack_dashboard.api import session_pool
 from openstack_dashboard.contrib.developer.profiler import api as profiler
+from openstack_dashboard.utils import futurist_utils
 
 
 LOG = logging.getLogger(__name__)
@@ -137,16 +144,21 @@ def glanceclient(request, version=None):
     url = base.url_for(request, 'image')
     insecure = getattr(settings, 'OPENSTACK_SSL_NO_VERIFY', False)
     cacert = getattr(settings, 'OPENSTACK_SSL_CACERT', None)
+    if session_pool.is_enabled():
+        kwargs = {'session': session_pool.get_session(request.user.token.id,
+                                                      url),
+                  'endpoint_override': url}
+    else:
+        kwargs = {'token': request.user.token.id,
+                  'insecure': insecure, 'cacert': cacert}
 
     # TODO(jpichon): Temporarily keep both till we update the API calls
     # to stop hardcoding a version in this file. Once that's done we
     # can get rid of the deprecated 'version' parameter.
     if version is None:
-        return api_version['client'].Client(url, token=request.user.token.id,
-                                            insecure=insecure, cacert=cacert)
+        return api_version['client'].Client(url, **kwargs)
     else:
-        return glance_client.Client(version, url, token=request.user.token.id,
-                                    insecure=insecure, cacert=cacert)
+        return glance_client.Client(version, url, **kwargs)
 
 
 # Note: Glance is adding more than just public and private in Newton or later
@@ -245,7 +257,10 @@ def _normalize_list_input(filters, **kwargs):
 
 @profiler.trace
 def image_delete(request, image_id):
-    return glanceclient(request).images.delete(image_id)
+    try:
+        return glanceclient(request).images.delete(image_id)
+    finally:
+        api_cache.invalidate(request, 'images')
 
 
 @profiler.trace
@@ -255,6 +270,115 @@ def image_get(request, image_id):
     return Image(image)
 
 
+class CachedImage(dict):
+    """Glance v2 image restored from the API cache.
+
+    It stands in for the schema based model returned by glanceclient, which
+    would require the image schema to be fetched again to be rebuilt.
+    """
+
+    def __getattr__(self, attr):
+        try:
+            return self[attr]
+        except KeyError:
+            raise AttributeError(attr)
+
+    def __setattr__(self, attr, value):
+        self[attr] = value
+
+
+def _serialize_images(result):
+    images, has_more_data, has_prev_data = result
+    data = []
+    for image in images:
+        apiresource = image._apiresource
+        if isinstance(apiresource, dict):
+            data.append((True, dict(apiresource)))
+        else:
+            data.append((False, apiresource._info))
+    return data, has_more_data, has_prev_data
+
+
+def _deserialize_images(request, data):
+    data, has_more_data, has_prev_data = data
+    images = []
+    for is_dict, info in data:
+        if is_dict:
+            images.append(Image(CachedImage(info)))
+        else:
+            manager = glanceclient(request).images
+            images.append(Image(manager.resource_class(manager, info,
+                                                       loaded=True)))
+    return images, has_more_data, has_prev_data
+
+
+class ImageCursor(object):
+    """Markers of the pages of a paginated image listing.
+
+    The pages themselves are the entries cached by :func:`_image_list_page`.
+    The cursor remembers the marker each page was loaded with, by the ids
+    of its first and last images, so that the page reached with the
+    "previous" link is found in the cache instead of sending a reversed
+    query to Glance. It also loads the next page in the background while
+    the user looks at the current one.
+
+    The markers are stored with the entries of the ``images`` resource of
+    the API cache, so they are shared by the users of a project and dropped
+    when images are created, updated or deleted.
+    """
+
+    def __init__(self, request, sort_dir, sort_key, filters, page_size):
+        self.request = request
+        self.args = (sort_dir, sort_key, filters, page_size)
+        self.listing = (sort_dir, sort_key, tuple(sorted(filters.items())),
+                        page_size)
+
+    def _name(self, kind, image_id):
+        return (kind, self.listing, image_id)
+
+    def _get_marker(self, kind, image_id):
+        # The markers are wrapped as the marker of the first page is None.
+        name = self._name(kind, image_id)
+        entry = api_cache.get_entries(self.request, 'images', [name])
+        return entry.get(name)
+
+    def load(self, marker):
+        """Return the page following marker and remember its marker."""
+        sort_dir, sort_key, filters, page_size = self.args
+        result = _image_list_page(self.request, marker, sort_dir, sort_key,
+                                  filters, True, False, page_size)
+        images = result[0]
+        if images:
+            api_cache.set_entries(self.request, 'images', {
+                self._name('loaded-with', images[0].id): {'marker': marker},
+                self._name('ending', images[-1].id): {'marker': marker},
+            })
+        return result
+
+    def previous(self, marker):
+        """Return the page before the one starting with marker, if known."""
+        loaded_with = self._get_marker('loaded-with', marker)
+        if loaded_with is None or loaded_with['marker'] is None:
+            return None
+        # The previous page is the one ending with the marker the page
+        # starting with this marker was loaded with.
+        previous = self._get_marker('ending', loaded_with['marker'])
+        if previous is None:
+            return None
+        return self.load(previous['marker'])
+
+    def prefetch(self, marker):
+        """Load the page following marker in the background."""
+        futurist_utils.get_executor().submit(self._prefetch, marker)
+
+    def _prefetch(self, marker):
+        try:
+            self.load(marker)
+        except Exception:
+            LOG.debug('Failed to prefetch the images after %s', marker,
+                      exc_info=True)
+
+
 @profiler.trace
 def image_list_detailed(request, marker=None, sort_dir='desc',
                         sort_key='created_at', filters=None, paginate=False,
@@ -304,17 +428,46 @@ def image_list_detailed(request, marker=None, sort_dir='desc',
 
         Set this flag to True when it's necessary to get a reversed list of
         images from Glance (used for navigating the images list back in UI).
+
+    The listings are cached in the ``images`` resource of the API cache.
+    When it is enabled, the pages of a paginated listing are tracked by
+    :class:`ImageCursor`, which serves the previous pages from the cache
+    instead of a reversed query and loads the next page in the background.
     """
-    limit = getattr(settings, 'API_RESULT_LIMIT', 1000)
     page_size = utils.get_page_size(request)
+    _normalize_list_input(filters, **kwargs)
+    filters = filters or {}
 
+    if not paginate or not api_cache.is_enabled():
+        return _image_list_page(request, marker, sort_dir, sort_key, filters,
+                                paginate, reversed_order, page_size)
+
+    cursor = ImageCursor(request, sort_dir, sort_key, filters, page_size)
+    if reversed_order:
+        result = cursor.previous(marker)
+        if result is None:
+            result = _image_list_page(request, marker, sort_dir, sort_key,
+                                      filters, paginate, reversed_order,
+                                      page_size)
+        return result
+    result = cursor.load(marker)
+    images, has_more_data, has_prev_data = result
+    if has_more_data:
+        cursor.prefetch(images[-1].id)
+    return result
+
+
+@api_cache.cached('images', serialize=_serialize_images,
+                  deserialize=_deserialize_images)
+def _image_list_page(request, marker, sort_dir, sort_key, filters, paginate,
+                     reversed_order, page_size):
+    limit = getattr(settings, 'API_RESULT_LIMIT', 1000)
     if paginate:
         request_size = page_size + 1
     else:
         request_size = limit
 
-    _normalize_list_input(filters, **kwargs)
-    kwargs = {'filters': filters or {}}
+    kwargs = {'filters': filters}
 
     if marker:
         kwargs['marker'] = marker
@@ -375,6 +528,7 @@ def image_update(request, image_id, **kwargs):
         return Image(glanceclient(request).images.update(
             image_id, **kwargs))
     finally:
+        api_cache.invalidate(request, 'images')
         if image_data:
             try:
                 os.remove(image_data.file.name)
@@ -492,6 +646,187 @@ def _handle_unknown_properties(data, properties):
     properties.update(other_props)
 
 
+DEFAULT_UPLOAD_JOBS = {
+    'max_workers': 4,
+    'max_queued': 16,
+    'cache': 'default',
+    'timeout': 3600,
+}
+UPLOAD_JOB_KEY_PREFIX = 'horizon:image-upload'
+# Minimum number of seconds between two saves of the progress of an upload.
+UPLOAD_PROGRESS_INTERVAL = 1
+
+
+def get_upload_jobs_options():
+    options = dict(DEFAULT_UPLOAD_JOBS)
+    options.update(getattr(settings, 'HORIZON_IMAGES_UPLOAD_JOBS', {}))
+    return options
+
+
+def _upload_job_key(image_id):
+    return '%s:%s' % (UPLOAD_JOB_KEY_PREFIX, image_id)
+
+
+def _open_image_data(data):
+    """Return a file object for the uploaded data owned by the upload job.
+
+    Django deletes temporary upload files and closes in-memory ones at the
+    end of the request. A temporary file is opened again so that its data
+    remains readable until the job closes it, and disappears from the disk
+    when it does, whether the upload succeeded or not.
+    """
+    if isinstance(data, TemporaryUploadedFile):
+        return open(data.temporary_file_path(), 'rb')
+    if isinstance(data, InMemoryUploadedFile):
+        data.seek(0)
+        return six.BytesIO(data.read())
+    return data
+
+
+class ImageUploadJob(object):
+    """Uploads the data of an image to Glance in the background.
+
+    The state of the job is stored in the cache selected by the
+    ``HORIZON_IMAGES_UPLOAD_JOBS`` setting, so that it can be queried by
+    every web server process with image_upload_get.
+    """
+
+    def __init__(self, request, image_id, data, size=None):
+        self.request = request
+        self.image_id = image_id
+        self.data = data
+        self.state = {
+            'image_id': image_id,
+            'project_id': request.user.tenant_id,
+            'status': 'queued',
+            'size': size,
+            'transferred': 0,
+            'error': None,
+        }
+        self._saved = 0
+        self.save()
+
+    def save(self):
+        options = get_upload_jobs_options()
+        caches[options['cache']].set(_upload_job_key(self.image_id),
+                                     self.state, options['timeout'])
+        self._saved = time.time()
+
+    def read(self, size=-1):
+        chunk = self.data.read(size)
+        self.state['transferred'] += len(chunk)
+        if time.time() - self._saved >= UPLOAD_PROGRESS_INTERVAL:
+            self.save()
+        return chunk
+
+    def __getattr__(self, name):
+        # The image is uploaded from the job itself to count the data read
+        # by the client, the other file methods are the ones of the data.
+        if name == 'data':
+            raise AttributeError(name)
+        return getattr(self.data, name)
+
+    def run(self):
+        self.state['status'] = 'uploading'
+        self.save()
+        try:
+            if VERSIONS.active < 2:
+                glanceclient(self.request).images.update(
+                    self.image_id, data=self, purge_props=False)
+            else:
+                glanceclient(self.request).images.upload(self.image_id, self)
+        except Exception as e:
+            LOG.warning('Failed to upload the data of image %(image)s '
+                        '(%(e)s)', {'image': self.image_id, 'e': e})
+            self.state['status'] = 'failed'
+            self.state['error'] = six.text_type(e)
+        else:
+            self.state['status'] = 'succeeded'
+        finally:
+            self.close()
+            api_cache.invalidate(self.request, 'images')
+        self.save()
+
+    def close(self):
+        try:
+            self.data.close()
+        except Exception as e:
+            LOG.warning('Failed to close the data of image %(image)s '
+                        '(%(e)s)', {'image': self.image_id, 'e': e})
+
+
+class ImageUploadJobManager(object):
+    """Runs the image upload jobs of a web server process.
+
+    At most ``max_workers`` uploads run at the same time and at most
+    ``max_queued`` more wait for their turn; further uploads are refused
+    before the image is created.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._executor = None
+        self._pid = None
+        self._jobs = 0
+
+    def _check_pid(self):
+        # Neither the threads nor the jobs of the parent survive a fork.
+        if self._pid != os.getpid():
+            self._executor = None
+            self._jobs = 0
+            self._pid = os.getpid()
+
+    def reserve(self):
+        options = get_upload_jobs_options()
+        with self._lock:
+            self._check_pid()
+            if self._jobs >= options['max_workers'] + options['max_queued']:
+                raise exceptions.NotAvailable(
+                    _('Too many images are being uploaded, please try '
+                      'again later.'))
+            self._jobs += 1
+
+    def release(self):
+        with self._lock:
+            self._check_pid()
+            self._jobs = max(self._jobs - 1, 0)
+
+    def submit(self, job):
+        """Run a job for which reserve has been called."""
+        with self._lock:
+            self._check_pid()
+            if self._executor is None:
+                self._executor = futurist.ThreadPoolExecutor(
+                    max_workers=get_upload_jobs_options()['max_workers'])
+            executor = self._executor
+        return executor.submit(self._run, job)
+
+    def _run(self, job):
+        try:
+            job.run()
+        finally:
+            self.release()
+
+
+upload_jobs = ImageUploadJobManager()
+
+
+def image_upload_get(request, image_id):
+    """Return the state of the upload of the data of an image.
+
+    :returns: a dict with the ``status`` of the upload (``queued``,
+        ``uploading``, ``succeeded`` or ``failed``), the ``size`` of the
+        data when known, the number of bytes ``transferred`` so far and the
+        ``error`` of a failed upload, or None if there is no such upload
+        for the project of the user.
+    """
+    options = get_upload_jobs_options()
+    state = caches[options['cache']].get(_upload_job_key(image_id))
+    if state is None or state['project_id'] != request.user.tenant_id:
+        return None
+    return state
+
+
 @profiler.trace
 def image_create(request, **kwargs):
     """Create image.
@@ -507,67 +842,56 @@ def image_create(request, **kwargs):
     asynchronously.
 
     In the case of 'data' the process of uploading the data may take
-    some time and is handed off to a separate thread.
+    some time and is handed off to the upload jobs of the process, see
+    ImageUploadJobManager. Its progress is returned by image_upload_get.
     """
     data = kwargs.pop('data', None)
     location = None
     if VERSIONS.active >= 2:
         location = kwargs.pop('location', None)
 
-    image = glanceclient(request).images.create(**kwargs)
-    if location is not None:
-        glanceclient(request).images.add_location(image.id, location, {})
-
-    if data:
-        if isinstance(data, six.string_types):
-            # The image data is meant to be uploaded externally, return a
-            # special wrapper to bypass the web server in a subsequent upload
-            return ExternallyUploadedImage(image, request)
-        elif isinstance(data, TemporaryUploadedFile):
-            # Hack to fool Django, so we can keep file open in the new thread.
-            if six.PY2:
-                data.file.close_called = True
-            else:
-                data.file._closer.close_called = True
-        elif isinstance(data, InMemoryUploadedFile):
-            # Clone a new file for InMemeoryUploadedFile.
-            # Because the old one will be closed by Django.
-            data = SimpleUploadedFile(data.name,
-                                      data.read(),
-                                      data.content_type)
-        if VERSIONS.active < 2:
-            thread.start_new_thread(image_update,
-                                    (request, image.id),
-                                    {'data': data})
-        else:
-            def upload():
-                try:
-                    return glanceclient(request).images.upload(image.id, data)
-                finally:
-                    filename = str(data.file.name)
-                    try:
-                        os.remove(filename)
-                    except OSError as e:
-                        LOG.warning('Failed to remove temporary image file '
-                                    '%(file)s (%(e)s)',
-                                    {'file': filename, 'e': e})
-            thread.start_new_thread(upload, ())
-
+    uploaded = data and not isinstance(data, six.string_types)
+    if uploaded:
+        # Fail before the image is created when no upload can be accepted.
+        upload_jobs.reserve()
+    try:
+        image = glanceclient(request).images.create(**kwargs)
+        api_cache.invalidate(request, 'images')
+        if location is not None:
+            glanceclient(request).images.add_location(image.id, location, {})
+        if uploaded:
+            upload_jobs.submit(ImageUploadJob(request, image.id,
+                                              _open_image_data(data),
+                                              getattr(data, 'size', None)))
+    except Exception:
+        # The reserved upload is released by the job once submitted.
+        if uploaded:
+            upload_jobs.release()
+        raise
+
+    if data and not uploaded:
+        # The image data is meant to be uploaded externally, return a
+        # special wrapper to bypass the web server in a subsequent upload
+        return ExternallyUploadedImage(image, request)
     return Image(image)
 
 
 @profiler.trace
 def image_update_properties(request, image_id, remove_props=None, **kwargs):
     """Add or update a custom property of an image."""
-    return glanceclient(request, '2').images.update(image_id,
-                                                    remove_props,
-                                                    **kwargs)
+    image = glanceclient(request, '2').images.update(image_id,
+                                                     remove_props,
+                                                     **kwargs)
+    api_cache.invalidate(request, 'images')
+    return image
 
 
 @profiler.trace
 def image_delete_properties(request, image_id, keys):
     """Delete custom properties for an image."""
-    return glanceclient(request, '2').images.update(image_id, keys)
+    image = glanceclient(request, '2').images.update(image_id, keys)
+    api_cache.invalidate(request, 'images')
+    return image
 
 
 class BaseGlanceMetadefAPIResourceWrapper(base.APIResourceWrapper):
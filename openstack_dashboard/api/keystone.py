@@ -355,10 +355,20 @@ def tenant_get(request, project, admin=True):
         raise
 
 
+def _invalidate_project_list(user=None):
+    """Drops the cached project lists affected by a change.
+
+    The lists of all the users are dropped when the user is not known.
+    """
+    auth_utils.invalidate_project_list(
+        user_id=getattr(user, 'id', user) if user else None)
+
+
 @profiler.trace
 def tenant_delete(request, project):
     manager = VERSIONS.get_project_manager(request, admin=True)
     manager.delete(project)
+    _invalidate_project_list()
 
 
 @profiler.trace
@@ -410,13 +420,16 @@ def tenant_update(request, project, name=None, description=None,
     manager = VERSIONS.get_project_manager(request, admin=True)
     try:
         if VERSIONS.active < 3:
-            return manager.update(project, name, description, enabled,
-                                  **kwargs)
+            project = manager.update(project, name, description, enabled,
+                                     **kwargs)
         else:
-            return manager.update(project, name=name, description=description,
-                                  enabled=enabled, domain=domain, **kwargs)
+            project = manager.update(project, name=name,
+                                     description=description,
+                                     enabled=enabled, domain=domain, **kwargs)
     except keystone_exceptions.Conflict:
         raise exceptions.Conflict()
+    _invalidate_project_list()
+    return project
 
 
 @profiler.trace
@@ -642,13 +655,17 @@ def group_update(request, group_id, name=None, description=None):
 @profiler.trace
 def add_group_user(request, group_id, user_id):
     manager = keystoneclient(request, admin=True).users
-    return manager.add_to_group(group=group_id, user=user_id)
+    result = manager.add_to_group(group=group_id, user=user_id)
+    _invalidate_project_list(user_id)
+    return result
 
 
 @profiler.trace
 def remove_group_user(request, group_id, user_id):
     manager = keystoneclient(request, admin=True).users
-    return manager.remove_from_group(group=group_id, user=user_id)
+    result = manager.remove_from_group(group=group_id, user=user_id)
+    _invalidate_project_list(user_id)
+    return result
 
 
 def get_project_groups_roles(request, project):
@@ -820,6 +837,7 @@ def add_tenant_user_role(request, project=None, user=None, role=None,
     else:
         manager.grant(role, user=user, project=project,
                       group=group, domain=domain)
+    _invalidate_project_list(user)
 
 
 @profiler.trace
@@ -828,10 +846,12 @@ def remove_tenant_user_role(request, project=None, user=None, role=None,
     """Removes a given single role for a user from a tenant."""
     manager = keystoneclient(request, admin=True).roles
     if VERSIONS.active < 3:
-        return manager.remove_user_role(user, role, project)
+        result = manager.remove_user_role(user, role, project)
     else:
-        return manager.revoke(role, user=user, project=project,
-                              group=group, domain=domain)
+        result = manager.revoke(role, user=user, project=project,
+                                group=group, domain=domain)
+    _invalidate_project_list(user)
+    return result
 
 
 def remove_tenant_user(request, project=None, user=None, domain=None):
@@ -853,16 +873,20 @@ def roles_for_group(request, group, domain=None, project=None):
 def add_group_role(request, role, group, domain=None, project=None):
     """Adds a role for a group on a domain or project."""
     manager = keystoneclient(request, admin=True).roles
-    return manager.grant(role=role, group=group, domain=domain,
-                         project=project)
+    result = manager.grant(role=role, group=group, domain=domain,
+                           project=project)
+    _invalidate_project_list()
+    return result
 
 
 @profiler.trace
 def remove_group_role(request, role, group, domain=None, project=None):
     """Removes a given single role for a group from a domain or project."""
     manager = keystoneclient(request, admin=True).roles
-    return manager.revoke(role=role, group=group, project=project,
-                          domain=domain)
+    result = manager.revoke(role=role, group=group, project=project,
+                            domain=domain)
+    _invalidate_project_list()
+    return result
 
 
 @profiler.trace
@@ -37,9 +37,13 @@ from horizon import messages
 from horizon.utils.memoized import memoized
 from horizon.utils.memoized import memoized_with_request
 from openstack_dashboard.api import base
+from openstack_dashboard.api import cache as api_cache
+from openstack_dashboard.api import capabilities
 from openstack_dashboard.api import nova
+from openstack_dashboard.api import session_pool
 from openstack_dashboard.contrib.developer.profiler import api as profiler
 from openstack_dashboard import policy
+from openstack_dashboard.utils import futurist_utils
 
 
 LOG = logging.getLogger(__name__)
@@ -638,12 +642,15 @@ class FloatingIpManager(object):
         fip = self.client.create_floatingip(
             {'floatingip': create_dict}).get('floatingip')
         self._set_instance_info(fip)
+        if fip.get('port_id'):
+            api_cache.invalidate(self.request, 'addresses')
         return FloatingIp(fip)
 
     @profiler.trace
     def release(self, floating_ip_id):
         """Releases a floating IP specified."""
         self.client.delete_floatingip(floating_ip_id)
+        api_cache.invalidate(self.request, 'addresses')
 
     @profiler.trace
     def associate(self, floating_ip_id, port_id):
@@ -662,6 +669,7 @@ class FloatingIpManager(object):
                        'fixed_ip_address': ip_address}
         self.client.update_floatingip(floating_ip_id,
                                       {'floatingip': update_dict})
+        api_cache.invalidate(self.request, 'addresses')
 
     @profiler.trace
     def disassociate(self, floating_ip_id):
@@ -669,6 +677,7 @@ class FloatingIpManager(object):
         update_dict = {'port_id': None}
         self.client.update_floatingip(floating_ip_id,
                                       {'floatingip': update_dict})
+        api_cache.invalidate(self.request, 'addresses')
 
     def _get_reachable_subnets(self, ports, fetch_router_ports=False):
         if not is_enabled_by_config('enable_fip_topology_check', True):
@@ -809,6 +818,10 @@ def get_auth_params_from_request(request):
 @memoized_with_request(get_auth_params_from_request)
 def neutronclient(request_auth_params):
     token_id, neutron_url, auth_url = request_auth_params
+    if session_pool.is_enabled():
+        return neutron_client.Client(
+            session=session_pool.get_session(token_id, neutron_url),
+            endpoint_override=neutron_url)
     insecure = getattr(settings, 'OPENSTACK_SSL_NO_VERIFY', False)
     cacert = getattr(settings, 'OPENSTACK_SSL_CACERT', None)
     c = neutron_client.Client(token=token_id,
@@ -818,29 +831,47 @@ def neutronclient(request_auth_params):
     return c
 
 
-@profiler.trace
-def list_resources_with_long_filters(list_method,
-                                     filter_attr, filter_values, **params):
-    """List neutron resources with handling RequestURITooLong exception.
+# The default maximum length of a request URI. It is the limit enforced by
+# python-neutronclient before sending a request.
+MAX_URI_LEN = 8192
+# Length of the request URI reserved for the endpoint URL and the path of
+# the resource when computing how many filter values fit into a request.
+URI_LEN_RESERVED = 512
 
-    If filter parameters are long, list resources API request leads to
-    414 error (URL is too long). For such case, this method split
-    list parameters specified by a list_field argument into chunks
-    and call the specified list_method repeatedly.
 
-    :param list_method: Method used to retrieve resource list.
-    :param filter_attr: attribute name to be filtered. The value corresponding
-        to this attribute is specified by "filter_values".
-        If you want to specify more attributes for a filter condition,
-        pass them as keyword arguments like "attr2=values2".
-    :param filter_values: values of "filter_attr" to be filtered.
-        If filter_values are too long and the total URI length exceed the
-        maximum length supported by the neutron server, filter_values will
-        be split into sub lists if filter_values is a list.
-    :param params: parameters to pass a specified listing API call
-        without any changes. You can specify more filter conditions
-        in addition to a pair of filter_attr and filter_values.
+def _get_query_len(params):
+    # Length of each query filter is:
+    # <key>=<value>& (e.g., id=<uuid>)
+    length = 0
+    for key, value in params.items():
+        if not isinstance(value, (list, tuple, set, frozenset)):
+            value = [value]
+        for val in value:
+            if isinstance(val, (six.string_types, six.integer_types)):
+                length += len(key) + len(six.text_type(val)) + 2
+    return length
+
+
+def _get_filter_chunk_size(filter_attr, filter_values, params):
+    """Return how many filter values can be sent in a single request.
+
+    The size is computed from the maximum URI length accepted by neutron,
+    ``OPENSTACK_NEUTRON_MAX_URI_LENGTH``, so that requests which would be
+    rejected as too long are never sent.
     """
+    max_uri_len = getattr(settings, 'OPENSTACK_NEUTRON_MAX_URI_LENGTH',
+                          MAX_URI_LEN)
+    other_params = dict((k, v) for k, v in params.items() if k != filter_attr)
+    allowed_filter_len = (max_uri_len - URI_LEN_RESERVED -
+                          _get_query_len(other_params))
+    val_maxlen = max([len(six.text_type(val)) for val in filter_values] or
+                     [0])
+    filter_maxlen = len(filter_attr) + val_maxlen + 2
+    return max(1, allowed_filter_len // filter_maxlen)
+
+
+def _list_resources_splitting_on_error(list_method, filter_attr,
+                                       filter_values, **params):
     try:
         params[filter_attr] = filter_values
         return list_method(**params)
@@ -852,19 +883,16 @@ def list_resources_with_long_filters(list_method,
         # We consider only the filter condition from (filter_attr,
         # filter_values) and do not consider other filter conditions
         # which may be specified in **params.
-        if not isinstance(filter_values, (list, tuple, set, frozenset)):
-            filter_values = [filter_values]
-
-        # Length of each query filter is:
-        # <key>=<value>& (e.g., id=<uuid>)
-        # The length will be key_len + value_maxlen + 2
-        all_filter_len = sum(len(filter_attr) + len(val) + 2
-                             for val in filter_values)
+        if isinstance(filter_values, (list, tuple, set, frozenset)):
+            filter_values = tuple(filter_values)
+        else:
+            filter_values = (filter_values,)
+        all_filter_len = _get_query_len({filter_attr: filter_values})
         allowed_filter_len = all_filter_len - uri_len_exc.excess
 
         val_maxlen = max(len(val) for val in filter_values)
         filter_maxlen = len(filter_attr) + val_maxlen + 2
-        chunk_size = allowed_filter_len // filter_maxlen
+        chunk_size = max(1, allowed_filter_len // filter_maxlen)
 
         resources = []
         for i in range(0, len(filter_values), chunk_size):
@@ -873,6 +901,57 @@ def list_resources_with_long_filters(list_method,
         return resources
 
 
+@profiler.trace
+def list_resources_with_long_filters(list_method,
+                                     filter_attr, filter_values, **params):
+    """List neutron resources with handling RequestURITooLong exception.
+
+    If filter parameters are long, list resources API request leads to
+    414 error (URL is too long). For such case, this method split
+    list parameters specified by a list_field argument into chunks
+    and call the specified list_method for each chunk in parallel.
+
+    The chunk size is computed beforehand from the maximum URI length
+    accepted by neutron (``OPENSTACK_NEUTRON_MAX_URI_LENGTH``). If a request
+    is still rejected as too long, its filter values are split again based
+    on the excess length reported by neutron.
+
+    :param list_method: Method used to retrieve resource list.
+    :param filter_attr: attribute name to be filtered. The value corresponding
+        to this attribute is specified by "filter_values".
+        If you want to specify more attributes for a filter condition,
+        pass them as keyword arguments like "attr2=values2".
+    :param filter_values: values of "filter_attr" to be filtered.
+        If filter_values are too long and the total URI length exceed the
+        maximum length supported by the neutron server, filter_values will
+        be split into sub lists if filter_values is a list.
+    :param params: parameters to pass a specified listing API call
+        without any changes. You can specify more filter conditions
+        in addition to a pair of filter_attr and filter_values.
+    """
+    # NOTE: Chunks are passed as tuples because list methods are often
+    # decorated with @memoized which works with hashable arguments only.
+    if isinstance(filter_values, (list, tuple, set, frozenset)):
+        values = tuple(filter_values)
+    else:
+        values = (filter_values,)
+    chunk_size = _get_filter_chunk_size(filter_attr, values, params)
+    if len(values) <= chunk_size:
+        return _list_resources_splitting_on_error(
+            list_method, filter_attr, filter_values, **params)
+
+    chunks = [values[i:i + chunk_size]
+              for i in range(0, len(values), chunk_size)]
+    results = futurist_utils.call_functions_parallel(
+        *[(_list_resources_splitting_on_error,
+           [list_method, filter_attr, chunk], params)
+          for chunk in chunks])
+    resources = []
+    for result in results:
+        resources.extend(result)
+    return resources
+
+
 @profiler.trace
 def trunk_show(request, trunk_id):
     LOG.debug("trunk_show(): trunk_id=%s", trunk_id)
@@ -1383,6 +1462,8 @@ def port_create(request, network_id, **kwargs):
         kwargs['tenant_id'] = request.user.project_id
     body['port'].update(kwargs)
     port = neutronclient(request).create_port(body=body).get('port')
+    if port.get('device_id'):
+        api_cache.invalidate(request, 'addresses')
     return Port(port)
 
 
@@ -1390,6 +1471,7 @@ def port_create(request, network_id, **kwargs):
 def port_delete(request, port_id):
     LOG.debug("port_delete(): portid=%s", port_id)
     neutronclient(request).delete_port(port_id)
+    api_cache.invalidate(request, 'addresses')
 
 
 @profiler.trace
@@ -1399,6 +1481,7 @@ def port_update(request, port_id, **kwargs):
     kwargs = unescape_port_kwargs(**kwargs)
     body = {'port': kwargs}
     port = neutronclient(request).update_port(port_id, body=body).get('port')
+    api_cache.invalidate(request, 'addresses')
     return Port(port)
 
 
@@ -1689,12 +1772,37 @@ def servers_update_addresses(request, servers, all_tenants=False):
 
        Should be used when up to date networking information is required,
        and Nova's networking info caching mechanism is not fast enough.
+
+       When ``OPENSTACK_INSTANCE_RETRIEVE_IP_ADDRESSES`` is set to
+       ``'incremental'`` and the API cache is enabled, the addresses
+       retrieved for each server are kept for a short time and Neutron is
+       only queried for servers which were updated since.
     """
 
     # NOTE(e0ne): we don't need to call neutron if we have no instances
     if not servers:
         return
 
+    retrieve_mode = getattr(settings,
+                            'OPENSTACK_INSTANCE_RETRIEVE_IP_ADDRESSES', True)
+    incremental = retrieve_mode == 'incremental' and api_cache.is_enabled()
+    if incremental:
+        entries = api_cache.get_entries(
+            request, 'addresses',
+            [(server.id, all_tenants) for server in servers])
+        outdated_servers = []
+        for server in servers:
+            entry = entries.get((server.id, all_tenants))
+            if entry and entry[0] == getattr(server, 'updated', None):
+                server.addresses = entry[1]
+            else:
+                outdated_servers.append(server)
+        LOG.debug('Retrieving addresses of %(outdated)d of %(all)d servers',
+                  {'outdated': len(outdated_servers), 'all': len(servers)})
+        servers = outdated_servers
+        if not servers:
+            return
+
     # Get all (filtered for relevant servers) information from Neutron
     try:
         # NOTE(e0ne): we need tuple here to work with @memoized decorator.
@@ -1734,6 +1842,7 @@ def servers_update_addresses(request, servers, all_tenants=False):
     # Map network id to its name
     network_names = dict(((network.id, network.name) for network in networks))
 
+    entries = {}
     for server in servers:
         try:
             addresses = _server_get_addresses(
@@ -1746,6 +1855,10 @@ def servers_update_addresses(request, servers, all_tenants=False):
             LOG.error(six.text_type(e))
         else:
             server.addresses = addresses
+            entries[(server.id, all_tenants)] = (
+                getattr(server, 'updated', None), addresses)
+    if incremental:
+        api_cache.set_entries(request, 'addresses', entries)
 
 
 def _server_get_addresses(request, server, ports, floating_ips, network_names):
@@ -1783,13 +1896,7 @@ def _server_get_addresses(request, server, ports, floating_ips, network_names):
     return dict(addresses)
 
 
-@profiler.trace
-@memoized_with_request(neutronclient)
-def list_extensions(neutron_api):
-    """List neutron extensions.
-
-    :param request: django request object
-    """
+def _list_extensions(neutron_api):
     try:
         extensions_list = neutron_api.list_extensions()
     except exceptions.ServiceCatalogException:
@@ -1800,6 +1907,19 @@ def list_extensions(neutron_api):
         return ()
 
 
+@profiler.trace
+@capabilities.registered(
+    'network', fetch=lambda request: _list_extensions(neutronclient(request)))
+@api_cache.cached('extensions', scope=api_cache.SCOPE_REGION)
+@memoized_with_request(neutronclient)
+def list_extensions(neutron_api):
+    """List neutron extensions.
+
+    :param request: django request object
+    """
+    return _list_extensions(neutron_api)
+
+
 @profiler.trace
 def is_extension_supported(request, extension_alias):
     """Check if a specified extension is supported.
@@ -30,6 +30,7 @@ from django.utils.translation import ugettext_lazy as _
 from novaclient import api_versions
 from novaclient import client as nova_client
 from novaclient import exceptions as nova_exceptions
+from novaclient.v2 import flavors as nova_flavors
 from novaclient.v2 import instance_action as nova_instance_action
 from novaclient.v2 import list_extensions as nova_list_extensions
 from novaclient.v2 import servers as nova_servers
@@ -40,7 +41,10 @@ from horizon.utils.memoized import memoized
 from horizon.utils.memoized import memoized_with_request
 
 from openstack_dashboard.api import base
+from openstack_dashboard.api import cache as api_cache
+from openstack_dashboard.api import capabilities
 from openstack_dashboard.api import microversions
+from openstack_dashboard.api import session_pool
 from openstack_dashboard.contrib.developer.profiler import api as profiler
 
 LOG = logging.getLogger(__name__)
@@ -58,10 +62,14 @@ INSECURE = getattr(settings, 'OPENSTACK_SSL_NO_VERIFY', False)
 CACERT = getattr(settings, 'OPENSTACK_SSL_CACERT', None)
 
 
+@capabilities.registered('compute')
+def _get_server_version_range(request):
+    return api_versions._get_server_version_range(novaclient(request))
+
+
 @memoized
 def get_microversion(request, features):
-    client = novaclient(request)
-    min_ver, max_ver = api_versions._get_server_version_range(client)
+    min_ver, max_ver = _get_server_version_range(request)
     return (microversions.get_microversion_for_features(
         'nova', features, api_versions.APIVersion, min_ver, max_ver))
 
@@ -122,7 +130,8 @@ class Server(base.APIResourceWrapper):
     _attrs = ['addresses', 'attrs', 'id', 'image', 'links', 'description',
               'metadata', 'name', 'private_ip', 'public_ip', 'status', 'uuid',
               'image_name', 'VirtualInterfaces', 'flavor', 'key_name', 'fault',
-              'tenant_id', 'user_id', 'created', 'locked', 'numa_topology',
+              'tenant_id', 'user_id', 'created', 'updated', 'locked',
+              'numa_topology',
               'OS-EXT-STS:power_state', 'OS-EXT-STS:task_state',
               'OS-EXT-SRV-ATTR:instance_name', 'OS-EXT-SRV-ATTR:host',
               'OS-EXT-AZ:availability_zone', 'OS-DCF:diskConfig']
@@ -279,6 +288,12 @@ def novaclient(request_auth_params, version=None):
     ) = request_auth_params
     if version is None:
         version = VERSIONS.get_active_version()['version']
+    if session_pool.is_enabled():
+        return nova_client.Client(
+            version,
+            session=session_pool.get_session(token_id, nova_url),
+            http_log_debug=settings.DEBUG,
+            endpoint_override=nova_url)
     c = nova_client.Client(version,
                            username,
                            token_id,
@@ -342,6 +357,7 @@ def flavor_create(request, name, memory, vcpu, disk, flavorid='auto',
                                                 ephemeral=ephemeral,
                                                 swap=swap, is_public=is_public,
                                                 rxtx_factor=rxtx_factor)
+    api_cache.invalidate(request, 'flavors')
     if (metadata):
         flavor_extra_set(request, flavor.id, metadata)
     return flavor
@@ -350,6 +366,7 @@ def flavor_create(request, name, memory, vcpu, disk, flavorid='auto',
 @profiler.trace
 def flavor_delete(request, flavor_id):
     novaclient(request).flavors.delete(flavor_id)
+    api_cache.invalidate(request, 'flavors')
 
 
 @profiler.trace
@@ -360,8 +377,26 @@ def flavor_get(request, flavor_id, get_extras=False):
     return flavor
 
 
+def _serialize_flavors(flavors):
+    return [(flavor._info, getattr(flavor, 'extras', None))
+            for flavor in flavors]
+
+
+def _deserialize_flavors(request, data):
+    manager = novaclient(request).flavors
+    flavors = []
+    for info, extras in data:
+        flavor = nova_flavors.Flavor(manager, info, loaded=True)
+        if extras is not None:
+            flavor.extras = extras
+        flavors.append(flavor)
+    return flavors
+
+
 @profiler.trace
 @memoized
+@api_cache.cached('flavors', serialize=_serialize_flavors,
+                  deserialize=_deserialize_flavors)
 def flavor_list(request, is_public=True, get_extras=False):
     """Get the list of available instance sizes (flavors)."""
     flavors = novaclient(request).flavors.list(is_public=is_public)
@@ -436,15 +471,19 @@ def flavor_access_list(request, flavor=None):
 @profiler.trace
 def add_tenant_to_flavor(request, flavor, tenant):
     """Add a tenant to the given flavor access list."""
-    return novaclient(request).flavor_access.add_tenant_access(
+    access = novaclient(request).flavor_access.add_tenant_access(
         flavor=flavor, tenant=tenant)
+    api_cache.invalidate(request, 'flavors')
+    return access
 
 
 @profiler.trace
 def remove_tenant_from_flavor(request, flavor, tenant):
     """Remove a tenant from the given flavor access list."""
-    return novaclient(request).flavor_access.remove_tenant_access(
+    access = novaclient(request).flavor_access.remove_tenant_access(
         flavor=flavor, tenant=tenant)
+    api_cache.invalidate(request, 'flavors')
+    return access
 
 
 @profiler.trace
@@ -463,7 +502,9 @@ def flavor_get_extras(request, flavor_id, raw=False, flavor=None):
 def flavor_extra_delete(request, flavor_id, keys):
     """Unset the flavor extra spec keys."""
     flavor = novaclient(request).flavors.get(flavor_id)
-    return flavor.unset_keys(keys)
+    result = flavor.unset_keys(keys)
+    api_cache.invalidate(request, 'flavors')
+    return result
 
 
 @profiler.trace
@@ -472,7 +513,9 @@ def flavor_extra_set(request, flavor_id, metadata):
     flavor = novaclient(request).flavors.get(flavor_id)
     if (not metadata):  # not a way to delete keys
         return None
-    return flavor.set_keys(metadata)
+    result = flavor.set_keys(metadata)
+    api_cache.invalidate(request, 'flavors')
+    return result
 
 
 @profiler.trace
@@ -1048,21 +1091,22 @@ def remove_host_from_aggregate(request, aggregate_id, host):
 @profiler.trace
 def interface_attach(request,
                      server, port_id=None, net_id=None, fixed_ip=None):
-    return novaclient(request).servers.interface_attach(server,
-                                                        port_id,
-                                                        net_id,
-                                                        fixed_ip)
+    interface = novaclient(request).servers.interface_attach(server,
+                                                             port_id,
+                                                             net_id,
+                                                             fixed_ip)
+    api_cache.invalidate(request, 'addresses')
+    return interface
 
 
 @profiler.trace
 def interface_detach(request, server, port_id):
-    return novaclient(request).servers.interface_detach(server, port_id)
+    result = novaclient(request).servers.interface_detach(server, port_id)
+    api_cache.invalidate(request, 'addresses')
+    return result
 
 
-@profiler.trace
-@memoized_with_request(novaclient)
-def list_extensions(nova_api):
-    """List all nova extensions, except the ones in the blacklist."""
+def _list_extensions(nova_api):
     blacklist = set(getattr(settings,
                             'OPENSTACK_NOVA_EXTENSIONS_BLACKLIST', []))
     return tuple(
@@ -1073,6 +1117,16 @@ def list_extensions(nova_api):
 
 
 @profiler.trace
+@capabilities.registered(
+    'compute', fetch=lambda request: _list_extensions(novaclient(request)))
+@memoized_with_request(novaclient)
+def list_extensions(nova_api):
+    """List all nova extensions, except the ones in the blacklist."""
+    return _list_extensions(nova_api)
+
+
+@profiler.trace
+@api_cache.cached('extensions', scope=api_cache.SCOPE_REGION, request_index=1)
 @memoized_with_request(list_extensions, 1)
 def extension_supported(extension_name, extensions):
     """Determine if nova supports a given extension name.
@@ -16,8 +16,10 @@
 from django import forms
 from django.views.decorators.csrf import csrf_exempt
 from django.views import generic
+import six
 from six.moves import zip as izip
 
+from horizon import exceptions
 from openstack_dashboard import api
 from openstack_dashboard.api.rest import urls
 from openstack_dashboard.api.rest import utils as rest_utils
@@ -111,6 +113,32 @@ class ImageProperties(generic.View):
         )
 
 
+@urls.register
+class ImageUpload(generic.View):
+    """API for the upload of the data of an image through the dashboard."""
+    url_regex = r'glance/images/(?P<image_id>[^/]+)/upload/$'
+
+    @rest_utils.ajax()
+    def get(self, request, image_id):
+        """Get the progress of the upload of the data of an image.
+
+        Example GET:
+        http://localhost/api/glance/images/cc758c90-3d98-4ea1-af44-aab405c9c915/upload/
+
+        The response is an object with the ``status`` of the upload
+        ('queued', 'uploading', 'succeeded' or 'failed'), the ``size`` of
+        the data when known, the number of bytes ``transferred`` so far and
+        the ``error`` message of a failed upload. It returns HTTP 404 when
+        there is no such upload.
+        """
+        state = api.glance.image_upload_get(request, image_id)
+        if state is None:
+            raise rest_utils.AjaxError(404, 'No upload found for image %s'
+                                       % image_id)
+        return dict((key, state[key]) for key in
+                    ('image_id', 'status', 'size', 'transferred', 'error'))
+
+
 class UploadObjectForm(forms.Form):
     data = forms.FileField(required=False)
 
@@ -174,7 +202,11 @@ class Images(generic.View):
         meta = _create_image_metadata(request.DATA)
         meta['data'] = data['data']
 
-        image = api.glance.image_create(request, **meta)
+        try:
+            image = api.glance.image_create(request, **meta)
+        except exceptions.NotAvailable as e:
+            # Too many uploads are in progress in this process.
+            return rest_utils.JSONResponse(six.text_type(e), 503)
         return rest_utils.CreatedResponse(
             '/api/glance/images/%s' % image.name,
             image.to_dict()
@@ -219,7 +251,11 @@ class Images(generic.View):
         else:
             meta['data'] = request.DATA.get('data')
 
-        image = api.glance.image_create(request, **meta)
+        try:
+            image = api.glance.image_create(request, **meta)
+        except exceptions.NotAvailable as e:
+            # Too many uploads are in progress in this process.
+            raise rest_utils.AjaxError(503, six.text_type(e))
         return rest_utils.CreatedResponse(
             '/api/glance/images/%s' % image.name,
             image.to_dict()
@@ -15,12 +15,21 @@
 
 import os
 
+from django.core.files import uploadhandler
 from django import forms
+from django.http import HttpResponse
+from django.http import QueryDict
+from django.http import HttpResponseNotModified
 from django.http import StreamingHttpResponse
+from django.middleware import csrf
+from django.utils import datastructures
+from django.utils.decorators import method_decorator
+from django.utils import http as http_utils
 from django.utils.http import urlunquote
 from django.views.decorators.csrf import csrf_exempt
 from django.views import generic
 import six
+import swiftclient
 
 from horizon import exceptions
 from openstack_dashboard import api
@@ -122,16 +131,34 @@ class Objects(generic.View):
         :param request:
         :param container:
         :return:
+
+        The following GET parameters may be used:
+
+        :param path: the pseudo-folder to list
+        :param filter: only return the objects whose name matches this
+            filter, see api.swift.swift_filter_objects
+        :param marker: with filter, the name of the last object of the
+            previous page
         """
         path = request.GET.get('path')
         if path is not None:
             path = urlunquote(path)
 
-        objects = api.swift.swift_get_objects(
-            request,
-            container,
-            prefix=path
-        )
+        filter_string = request.GET.get('filter')
+        if filter_string:
+            objects = api.swift.swift_filter_objects(
+                request,
+                filter_string,
+                container,
+                prefix=path,
+                marker=request.GET.get('marker')
+            )
+        else:
+            objects = api.swift.swift_get_objects(
+                request,
+                container,
+                prefix=path
+            )
 
         # filter out the folder from the listing if we're filtering for
         # contents of a (pseudo) folder
@@ -143,21 +170,94 @@ class Objects(generic.View):
             'is_object': not isinstance(o, swift.PseudoFolder),
             'content_type': getattr(o, 'content_type', None)
         } for o in objects[0] if o.name != path]
-        return {'items': contents}
+        return {'items': contents, 'has_more': objects[1]}
 
 
 class UploadObjectForm(forms.Form):
     file = forms.FileField(required=False)
 
 
+class StreamingUploadHandler(uploadhandler.FileUploadHandler):
+    """Upload handler sending the uploaded file to Swift as it is received.
+
+    The ``file`` field of the multipart request body is written to an
+    api.swift.ObjectWriter chunk by chunk instead of being kept in memory
+    or in a temporary file.
+    """
+    chunk_size = swift.CHUNK_SIZE
+
+    def __init__(self, request, container, object_name):
+        super(StreamingUploadHandler, self).__init__(request)
+        self.container = container
+        self.object_name = object_name
+        self.writer = None
+        self.result = None
+        self.request_length = None
+
+    def handle_raw_input(self, input_data, META, content_length, boundary,
+                         encoding=None):
+        self.request_length = content_length
+
+    def new_file(self, field_name, file_name, *args, **kwargs):
+        super(StreamingUploadHandler, self).new_file(field_name, file_name,
+                                                     *args, **kwargs)
+        if field_name == 'file' and self.writer is None:
+            self.writer = api.swift.ObjectWriter(
+                self.request, self.container, self.object_name,
+                orig_filename=file_name, size_hint=self.request_length)
+
+    def receive_data_chunk(self, raw_data, start):
+        if self.field_name == 'file' and self.result is None:
+            self.writer.write(raw_data)
+
+    def file_complete(self, file_size):
+        if self.field_name == 'file' and self.result is None:
+            self.result = self.writer.close()
+            return self.result
+
+    def abort(self):
+        if self.writer is not None and self.result is None:
+            self.writer.abort()
+
+
 @urls.register
 class Object(generic.View):
     """API for a single swift object or pseudo-folder"""
     url_regex = r'swift/containers/(?P<container>[^/]+)/object/' \
         '(?P<object_name>.+)$'
 
+    @method_decorator(csrf_exempt)
+    def dispatch(self, request, *args, **kwargs):
+        # The CSRF middleware reads request.POST, which would parse the body
+        # with the default upload handlers before a streamed upload can
+        # install its own. The check is made here instead and, for streamed
+        # uploads, only against the X-CSRFToken header, so that nothing is
+        # sent to Swift before the request is verified.
+        streamed = (request.method == 'POST' and
+                    self._is_streamed(kwargs['object_name']))
+        if streamed:
+            request._post = QueryDict()
+            request._files = datastructures.MultiValueDict()
+        try:
+            response = csrf.CsrfViewMiddleware().process_view(
+                request, None, args, kwargs)
+        finally:
+            if streamed:
+                del request._post
+                del request._files
+        if response is not None:
+            return response
+        if streamed:
+            request.upload_handlers = [StreamingUploadHandler(
+                request, kwargs['container'], kwargs['object_name'])]
+        return super(Object, self).dispatch(request, *args, **kwargs)
+
+    @staticmethod
+    def _is_streamed(object_name):
+        return (object_name[-1] != '/' and
+                api.swift.get_upload_options()['enabled'])
+
     # note: not an AJAX request - the body will be raw file content
-    @csrf_exempt
     def post(self, request, container, object_name):
         """Create or replace an object or pseudo-folder
 
@@ -174,7 +274,13 @@ class Object(generic.View):
         :param file: the file data for the upload.
 
         :return:
+
+        When SWIFT_STREAMING_UPLOAD is enabled, the file is sent to Swift
+        while the request body is read, see StreamingUploadHandler.
         """
+        if self._is_streamed(object_name):
+            return self._post_streamed(request, container, object_name)
+
         form = UploadObjectForm(request.POST, request.FILES)
         if not form.is_valid():
             raise rest_utils.AjaxError(500, 'Invalid request')
@@ -199,6 +305,30 @@ class Object(generic.View):
             u'/api/swift/containers/%s/object/%s' % (container, result.name)
         )
 
+    def _post_streamed(self, request, container, object_name):
+        handler = request.upload_handlers[0]
+        if not isinstance(handler, StreamingUploadHandler):
+            handler = StreamingUploadHandler(request, container, object_name)
+            request.upload_handlers = [handler]
+        try:
+            # Parsing the request body runs the upload.
+            request.POST
+        except exceptions.NotAvailable as e:
+            handler.abort()
+            return rest_utils.JSONResponse(six.text_type(e), 503)
+        except Exception:
+            handler.abort()
+            raise
+        if handler.result is None:
+            # There was no file, create an empty object as the form does.
+            handler.result = api.swift.swift_upload_object(
+                request, container, object_name)
+
+        return rest_utils.CreatedResponse(
+            u'/api/swift/containers/%s/object/%s' % (container,
+                                                     handler.result.name)
+        )
+
     @rest_utils.ajax()
     def delete(self, request, container, object_name):
         if object_name[-1] == '/':
@@ -212,12 +342,33 @@ class Object(generic.View):
             api.swift.swift_delete_object(request, container, object_name)
 
     def get(self, request, container, object_name):
-        """Get the object contents."""
-        obj = api.swift.swift_get_object(
-            request,
-            container,
-            object_name
-        )
+        """Get the object contents.
+
+        Range requests and the conditional request headers are passed on
+        to Swift, so downloads can be resumed and unchanged objects are not
+        downloaded again.
+        """
+        headers = _get_download_headers(request)
+        try:
+            obj = api.swift.swift_get_object(
+                request,
+                container,
+                object_name,
+                headers=headers
+            )
+        except swiftclient.exceptions.ClientException as e:
+            if (e.http_status == 412 and 'Range' in headers and
+                    request.META.get('HTTP_IF_RANGE')):
+                # The object changed since the part the client has, send
+                # it in full as required by If-Range.
+                headers = _get_download_headers(request, ranged=False)
+                obj = api.swift.swift_get_object(request, container,
+                                                 object_name,
+                                                 headers=headers)
+            elif e.http_status in (304, 412, 416):
+                return _conditional_response(e)
+            else:
+                raise
 
         # Add the original file extension back on if it wasn't preserved in the
         # name given to the object.
@@ -232,9 +383,65 @@ class Object(generic.View):
         response['Content-Disposition'] = 'attachment; filename="%s"' % safe
         response['Content-Type'] = 'application/octet-stream'
         response['Content-Length'] = obj.bytes
+        response['Accept-Ranges'] = 'bytes'
+        if obj.content_range:
+            response.status_code = 206
+            response['Content-Range'] = obj.content_range
+        _set_validators(response, obj.etag, obj.last_modified)
         return response
 
 
+# Request headers passed on to Swift when downloading an object.
+_DOWNLOAD_HEADERS = (
+    ('Range', 'HTTP_RANGE'),
+    ('If-Match', 'HTTP_IF_MATCH'),
+    ('If-None-Match', 'HTTP_IF_NONE_MATCH'),
+    ('If-Modified-Since', 'HTTP_IF_MODIFIED_SINCE'),
+    ('If-Unmodified-Since', 'HTTP_IF_UNMODIFIED_SINCE'),
+)
+# Swift does not support If-Range, it is replaced by the header which makes
+# the ranged request fail when the validator does not match, keyed on
+# whether the validator is a date.
+_IF_RANGE_HEADERS = {False: 'If-Match', True: 'If-Unmodified-Since'}
+
+
+def _is_http_date(value):
+    return http_utils.parse_http_date_safe(value) is not None
+
+
+def _get_download_headers(request, ranged=True):
+    headers = dict((name, request.META[key])
+                   for name, key in _DOWNLOAD_HEADERS if key in request.META)
+    if not ranged:
+        headers.pop('Range', None)
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if if_range and 'Range' in headers:
+        headers[_IF_RANGE_HEADERS[_is_http_date(if_range)]] = if_range
+    return headers
+
+
+def _set_validators(response, etag, last_modified):
+    if etag:
+        response['ETag'] = etag if etag.startswith('"') else '"%s"' % etag
+    if last_modified:
+        response['Last-Modified'] = last_modified
+
+
+def _conditional_response(exc):
+    """Return the response to a download whose condition failed in Swift."""
+    headers = dict((name.lower(), value) for name, value
+                   in (exc.http_response_headers or {}).items())
+    if exc.http_status == 304:
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(status=exc.http_status)
+    if exc.http_status == 416 and 'content-range' in headers:
+        response['Content-Range'] = headers['content-range']
+    _set_validators(response, headers.get('etag'),
+                    headers.get('last-modified'))
+    return response
+
+
 @urls.register
 class ObjectMetadata(generic.View):
     """API for a single swift object"""
@@ -0,0 +1,124 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Keystoneauth sessions sharing their HTTP connections between requests.
+
+By default every request builds new python clients, each with its own HTTP
+transport, so the TCP and TLS connections to the services are never reused
+by the next request. The helpers in this module keep one ``requests``
+transport with keep-alive connection pools per service host and TLS
+settings in each web server process. The keystoneauth sessions returned by
+:func:`get_session` are still created for each request and carry the token
+of the user, but send their requests through the shared transport.
+
+The pool is disabled by default and is configured with the
+``OPENSTACK_CLIENT_POOL`` setting.
+"""
+
+import os
+import threading
+
+from django.conf import settings
+from keystoneauth1 import session as ksession
+from keystoneauth1 import token_endpoint
+import requests
+from requests import adapters
+from six.moves import http_cookiejar
+from six.moves.urllib import parse as urlparse
+
+
+DEFAULT_OPTIONS = {
+    'enabled': False,
+    'pool_connections': 10,
+    'pool_maxsize': 10,
+}
+
+_transports = {}
+_transports_pid = None
+_transports_lock = threading.Lock()
+# Version discovery results do not depend on the user, so they are shared
+# by all the sessions of the process.
+_discovery_cache = {}
+
+
+def get_options():
+    options = dict(DEFAULT_OPTIONS)
+    options.update(getattr(settings, 'OPENSTACK_CLIENT_POOL', {}))
+    return options
+
+
+def is_enabled():
+    return get_options()['enabled']
+
+
+def get_verify():
+    """Return the TLS verification setting of the service clients."""
+    insecure = getattr(settings, 'OPENSTACK_SSL_NO_VERIFY', False)
+    cacert = getattr(settings, 'OPENSTACK_SSL_CACERT', None)
+    return cacert or not insecure
+
+
+def _create_transport():
+    options = get_options()
+    transport = requests.Session()
+    # The transport is shared by the requests of all users, it must never
+    # store cookies set by a service and send them on behalf of another
+    # user.
+    transport.cookies.set_policy(
+        http_cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+    for prefix in ('https://', 'http://'):
+        transport.mount(prefix, adapters.HTTPAdapter(
+            pool_connections=options['pool_connections'],
+            pool_maxsize=options['pool_maxsize']))
+    return transport
+
+
+def get_transport(endpoint, verify):
+    """Return the transport shared for the host of endpoint.
+
+    The transports are re-created in a child process when the process
+    forks, because connections must not be shared between processes.
+    """
+    global _transports_pid
+    url = urlparse.urlparse(endpoint)
+    key = (url.scheme, url.netloc, verify)
+    pid = os.getpid()
+    with _transports_lock:
+        if _transports_pid != pid:
+            _transports.clear()
+            _discovery_cache.clear()
+            _transports_pid = pid
+        if key not in _transports:
+            _transports[key] = _create_transport()
+        return _transports[key]
+
+
+def reset():
+    """Close and drop all the shared transports of the process."""
+    with _transports_lock:
+        for transport in _transports.values():
+            transport.close()
+        _transports.clear()
+        _discovery_cache.clear()
+
+
+def get_session(token_id, endpoint):
+    """Return a keystoneauth session for the given token and endpoint.
+
+    The session is authenticated with the token and sends its requests to
+    endpoint through the transport shared for its host.
+    """
+    verify = get_verify()
+    return ksession.Session(auth=token_endpoint.Token(endpoint, token_id),
+                            session=get_transport(endpoint, verify),
+                            verify=verify,
+                            discovery_cache=_discovery_cache)
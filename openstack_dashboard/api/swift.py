@@ -16,8 +16,17 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from concurrent import futures
 from datetime import datetime
-
+import json
+import logging
+import os
+import re
+import threading
+import time
+
+import futurist
+from six.moves import queue
 import six.moves.urllib.parse as urlparse
 import swiftclient
 
@@ -27,14 +36,27 @@ from django.utils.translation import ugettext_lazy as _
 from horizon import exceptions
 
 from openstack_dashboard.api import base
+from openstack_dashboard.api import cache as api_cache
 from openstack_dashboard.contrib.developer.profiler import api as profiler
 
+LOG = logging.getLogger(__name__)
+
 FOLDER_DELIMITER = "/"
 CHUNK_SIZE = getattr(settings, 'SWIFT_FILE_TRANSFER_CHUNK_SIZE', 512 * 1024)
 # Swift ACL
 GLOBAL_READ_ACL = ".r:*"
 LIST_CONTENTS_ACL = ".rlistings"
 
+DEFAULT_UPLOAD_OPTIONS = {
+    'enabled': False,
+    'slo_threshold': 1024 ** 3,
+    'segment_size': 32 * 1024 ** 2,
+    'max_parallel_segments': 4,
+    'max_workers': 8,
+}
+# Number of chunks waiting to be sent by a streamed upload.
+UPLOAD_QUEUE_SIZE = 8
+
 
 class Container(base.APIDictWrapper):
     pass
@@ -210,6 +232,7 @@ def swift_delete_container(request, name):
         exc = exceptions.Conflict(error_msg)
         raise exc
     swift_api(request).delete_container(name)
+    api_cache.invalidate(request, 'swift_objects')
     return True
 
 
@@ -232,26 +255,106 @@ def swift_get_objects(request, container_name, prefix=None, marker=None,
         return (object_objs, False)
 
 
+# Number of names of a container listing fetched with each request while
+# filtering objects.
+FILTER_PAGE_SIZE = 1000
+# Largest listing kept in the name index of a container.
+FILTER_INDEX_MAX_SIZE = 10000
+
+
+def _compile_filter(filter_string):
+    """Compile a filter string into a function matching object names.
+
+    The filter is split into terms on whitespace and each term may contain
+    ``*`` wildcards. A name matches if every term is found in it, ignoring
+    the case, in the same way as :func:`wildcard_search`.
+    """
+    patterns = [re.compile('.*'.join(re.escape(part)
+                                     for part in term.split('*')),
+                           re.DOTALL)
+                for term in filter_string.lower().split()]
+
+    def matches(name):
+        name = name.lower()
+        return all(pattern.search(name) for pattern in patterns)
+    return matches
+
+
+def _item_name(item):
+    return item.get('subdir') or item['name']
+
+
+def _iter_listing(request, container_name, prefix, marker):
+    """Yield the items of a container listing one page at a time."""
+    connection = swift_api(request)
+    while True:
+        headers, items = connection.get_container(container_name,
+                                                  prefix=prefix,
+                                                  marker=marker,
+                                                  limit=FILTER_PAGE_SIZE,
+                                                  delimiter=FOLDER_DELIMITER)
+        for item in items:
+            yield item
+        if len(items) < FILTER_PAGE_SIZE:
+            return
+        marker = _item_name(items[-1])
+
+
+def _get_name_index(request, container_name, prefix):
+    entries = api_cache.get_entries(request, 'swift_objects',
+                                    [(container_name, prefix)])
+    return entries.get((container_name, prefix))
+
+
+def _set_name_index(request, container_name, prefix, items):
+    api_cache.set_entries(request, 'swift_objects',
+                          {(container_name, prefix): items})
+
+
 @profiler.trace
 def swift_filter_objects(request, filter_string, container_name, prefix=None,
-                         marker=None):
-    # FIXME(kewu): Swift currently has no real filtering API, thus the marker
-    # parameter here won't actually help the pagination. For now I am just
-    # getting the largest number of objects from a container and filtering
-    # based on those objects.
-    limit = 9999
-    objects = swift_get_objects(request,
-                                container_name,
-                                prefix=prefix,
-                                marker=marker,
-                                limit=limit)
-    filter_string_list = filter_string.lower().strip().split(' ')
-
-    def matches_filter(obj):
-        for q in filter_string_list:
-            return wildcard_search(obj.name.lower(), q)
-
-    return filter(matches_filter, objects[0])
+                         marker=None, limit=None):
+    """Return the objects of a container whose name matches a filter.
+
+    Swift listings can only be narrowed by prefix, which is used for the
+    pseudo-folder given by prefix. The names are matched against the
+    filter while the listing is read page by page, and the listing stops
+    as soon as a page of results is found, so marker can be used for the
+    following pages like with :func:`swift_get_objects`.
+
+    When ``OPENSTACK_API_CACHE`` is enabled, complete listings are kept
+    for a short time as the name index of the folder, so that repeated
+    filters and following pages do not list the container again.
+
+    :returns: a tuple of the matching objects and of a boolean telling
+        whether there are more of them.
+    """
+    limit = limit or getattr(settings, 'API_RESULT_LIMIT', 1000)
+    matches = _compile_filter(filter_string)
+
+    index = _get_name_index(request, container_name, prefix)
+    if index is not None:
+        items = (item for item in index
+                 if marker is None or _item_name(item) > marker)
+    else:
+        items = _iter_listing(request, container_name, prefix, marker)
+    # Only a listing read from its start up to its end is indexed.
+    listed = [] if index is None and marker is None else None
+
+    results = []
+    for item in items:
+        if listed is not None:
+            listed.append(item)
+            if len(listed) > FILTER_INDEX_MAX_SIZE:
+                listed = None
+        if matches(_item_name(item).rstrip(FOLDER_DELIMITER)):
+            results.append(item)
+            if len(results) > limit:
+                return _objectify(results[:limit], container_name), True
+
+    if listed is not None:
+        _set_name_index(request, container_name, prefix, listed)
+    return _objectify(results, container_name), False
 
 
 def wildcard_search(string, q):
@@ -281,6 +384,7 @@ def swift_copy_object(request, orig_container_name, orig_object_name,
                                          None,
                                          headers=headers)
 
+    api_cache.invalidate(request, 'swift_objects')
     obj_info = {'name': new_object_name, 'etag': etag}
     return StorageObject(obj_info, new_container_name)
 
@@ -300,10 +404,253 @@ def swift_upload_object(request, container_name, object_name,
                                          content_length=size,
                                          headers=headers)
 
+    api_cache.invalidate(request, 'swift_objects')
     obj_info = {'name': object_name, 'bytes': size, 'etag': etag}
     return StorageObject(obj_info, container_name)
 
 
+def get_upload_options():
+    options = dict(DEFAULT_UPLOAD_OPTIONS)
+    options.update(getattr(settings, 'SWIFT_STREAMING_UPLOAD', {}))
+    return options
+
+
+class UploadWorkerManager(object):
+    """Runs the streamed uploads of a web server process.
+
+    The uploads have their own ``max_workers`` threads, apart from the
+    executor of the API calls made in parallel. Each upload reserves the
+    threads it needs before it starts and is refused when they are all
+    taken, so that its tasks never wait in a queue.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._executor = None
+        self._pid = None
+        self._workers = 0
+
+    def _check_pid(self):
+        # Neither the threads nor the uploads of the parent survive a fork.
+        if self._pid != os.getpid():
+            self._executor = None
+            self._workers = 0
+            self._pid = os.getpid()
+
+    def reserve(self, count):
+        """Reserve count threads for an upload."""
+        options = get_upload_options()
+        with self._lock:
+            self._check_pid()
+            if self._workers + count > options['max_workers']:
+                raise exceptions.NotAvailable(
+                    _('Too many objects are being uploaded, please try '
+                      'again later.'))
+            self._workers += count
+
+    def release(self, count):
+        with self._lock:
+            self._check_pid()
+            self._workers = max(self._workers - count, 0)
+
+    def submit(self, fn, *args, **kwargs):
+        """Run a task of an upload for which reserve has been called."""
+        with self._lock:
+            self._check_pid()
+            if self._executor is None:
+                self._executor = futurist.ThreadPoolExecutor(
+                    max_workers=get_upload_options()['max_workers'])
+            executor = self._executor
+        return executor.submit(fn, *args, **kwargs)
+
+
+upload_workers = UploadWorkerManager()
+
+
+# Marks the end of the data of a streamed upload.
+_END = object()
+# Makes a streamed upload fail instead of creating a truncated object.
+_ABORT = object()
+
+
+class ObjectWriter(object):
+    """Uploads an object to Swift from data written in chunks.
+
+    The data is not staged on disk. Objects are sent with a single request
+    whose body is streamed from the written chunks, unless the expected
+    size is above the ``slo_threshold`` of ``SWIFT_STREAMING_UPLOAD``. In
+    that case the object is cut into Static Large Object segments of
+    ``segment_size`` bytes, stored in the ``<container>_segments``
+    container and uploaded ``max_parallel_segments`` at a time, before the
+    manifest is created.
+
+    The uploads run in the threads of UploadWorkerManager. One of them is
+    reserved for an object sent with a single request, and
+    ``max_parallel_segments`` of them for a segmented object, until the
+    writer is closed or aborted.
+
+    :param size_hint: the expected size of the object in bytes, if known.
+    :raises: horizon.exceptions.NotAvailable when there are not enough free
+        threads for the upload.
+    """
+
+    def __init__(self, request, container_name, object_name,
+                 orig_filename=None, size_hint=None):
+        options = get_upload_options()
+        self.request = request
+        self.container_name = container_name
+        self.object_name = object_name
+        self.headers = {}
+        if orig_filename:
+            self.headers['X-Object-Meta-Orig-Filename'] = orig_filename
+        self.size = 0
+        self.segmented = (size_hint is not None and
+                          size_hint > options['slo_threshold'])
+        self._workers = 1
+        if self.segmented:
+            self._workers = min(options['max_parallel_segments'],
+                                options['max_workers'])
+        upload_workers.reserve(self._workers)
+        try:
+            if self.segmented:
+                self.segment_container = '%s_segments' % container_name
+                self._segment_size = options['segment_size']
+                self._max_pending = self._workers
+                self._segment_prefix = '%s/slo/%f/%d' % (
+                    object_name, time.time(), self._segment_size)
+                self._segments = []
+                self._buffer = bytearray()
+                swift_api(request).put_container(self.segment_container)
+            else:
+                self._queue = queue.Queue(UPLOAD_QUEUE_SIZE)
+                self._upload = upload_workers.submit(self._put_stream)
+                # The thread is free once the request to Swift has ended.
+                self._upload.add_done_callback(
+                    lambda future: self._release())
+        except Exception:
+            self._release()
+            raise
+
+    def _release(self):
+        if self._workers:
+            upload_workers.release(self._workers)
+            self._workers = 0
+
+    def _iter_queue(self):
+        while True:
+            chunk = self._queue.get()
+            if chunk is _END:
+                return
+            if chunk is _ABORT:
+                raise IOError('The upload of %s was aborted'
+                              % self.object_name)
+            yield chunk
+
+    def _put_stream(self):
+        return swift_api(self.request).put_object(self.container_name,
+                                                  self.object_name,
+                                                  self._iter_queue(),
+                                                  headers=self.headers)
+
+    def _queue_put(self, item):
+        while True:
+            if self._upload.done():
+                # The upload stopped reading, most likely on an error
+                # which is raised here.
+                self._upload.result()
+                raise IOError('The upload of %s ended before its data'
+                              % self.object_name)
+            try:
+                self._queue.put(item, timeout=1)
+                return
+            except queue.Full:
+                pass
+
+    def _put_segment(self, name, data):
+        etag = swift_api(self.request).put_object(self.segment_container,
+                                                  name, data,
+                                                  content_length=len(data))
+        return {'path': '/%s/%s' % (self.segment_container, name),
+                'etag': etag,
+                'size_bytes': len(data)}
+
+    def _submit_segment(self, data):
+        # Limit the number of segments held in memory while being sent.
+        pending = [f for f in self._segments if not f.done()]
+        if len(pending) >= self._max_pending:
+            futures.wait(pending, return_when=futures.FIRST_COMPLETED)
+        for f in self._segments:
+            if f.done() and f.exception() is not None:
+                raise f.exception()
+        name = '%s/%08d' % (self._segment_prefix, len(self._segments))
+        self._segments.append(upload_workers.submit(self._put_segment,
+                                                    name, data))
+
+    def write(self, data):
+        self.size += len(data)
+        if not self.segmented:
+            self._queue_put(bytes(data))
+            return
+        self._buffer.extend(data)
+        while len(self._buffer) >= self._segment_size:
+            self._submit_segment(bytes(self._buffer[:self._segment_size]))
+            del self._buffer[:self._segment_size]
+
+    def _finish(self):
+        if not self.segmented:
+            self._queue_put(_END)
+            return self._upload.result()
+        if not self._segments:
+            # The object turned out to be smaller than a segment.
+            return swift_api(self.request).put_object(
+                self.container_name, self.object_name, bytes(self._buffer),
+                content_length=len(self._buffer), headers=self.headers)
+        if self._buffer:
+            self._submit_segment(bytes(self._buffer))
+            del self._buffer[:]
+        manifest = [f.result() for f in self._segments]
+        return swift_api(self.request).put_object(
+            self.container_name, self.object_name, json.dumps(manifest),
+            headers=self.headers, query_string='multipart-manifest=put')
+
+    def close(self):
+        """Complete the upload and return the created StorageObject."""
+        try:
+            etag = self._finish()
+        except Exception:
+            self.abort()
+            raise
+        if self.segmented:
+            self._release()
+        api_cache.invalidate(self.request, 'swift_objects')
+        obj_info = {'name': self.object_name, 'bytes': self.size,
+                    'etag': etag}
+        return StorageObject(obj_info, self.container_name)
+
+    def abort(self):
+        """Stop the upload and remove the segments already uploaded."""
+        if not self.segmented:
+            if not self._upload.done():
+                try:
+                    self._queue_put(_ABORT)
+                except Exception:
+                    pass
+        else:
+            futures.wait(self._segments)
+            for f in self._segments:
+                if f.exception() is not None:
+                    continue
+                name = f.result()['path'].split('/', 2)[2]
+                try:
+                    swift_api(self.request).delete_object(
+                        self.segment_container, name)
+                except Exception:
+                    LOG.warning('Unable to delete the segment %s of the '
+                                'aborted upload of %s.', name,
+                                self.object_name)
+            self._release()
+
+
 @profiler.trace
 def swift_create_pseudo_folder(request, container_name, pseudo_folder_name):
     # Make sure the folder name doesn't already exist.
@@ -315,6 +662,7 @@ def swift_create_pseudo_folder(request, container_name, pseudo_folder_name):
                                          pseudo_folder_name,
                                          None,
                                          headers=headers)
+    api_cache.invalidate(request, 'swift_objects')
     obj_info = {
         'name': pseudo_folder_name,
         'etag': etag
@@ -326,6 +674,7 @@ def swift_create_pseudo_folder(request, container_name, pseudo_folder_name):
 @profiler.trace
 def swift_delete_object(request, container_name, object_name):
     swift_api(request).delete_object(container_name, object_name)
+    api_cache.invalidate(request, 'swift_objects')
     return True
 
 
@@ -346,15 +695,24 @@ def swift_delete_folder(request, container_name, object_name):
         exc = exceptions.Conflict(error_msg)
         raise exc
     swift_api(request).delete_object(container_name, object_name)
+    api_cache.invalidate(request, 'swift_objects')
     return True
 
 
 @profiler.trace
 def swift_get_object(request, container_name, object_name, with_data=True,
-                     resp_chunk_size=CHUNK_SIZE):
+                     resp_chunk_size=CHUNK_SIZE, headers=None):
+    """Return an object of a container.
+
+    :param headers: additional request headers sent when getting the data,
+        such as ``Range`` or conditional request headers. Swift answers a
+        failed condition with an error raised as
+        ``swiftclient.exceptions.ClientException``.
+    """
     if with_data:
         headers, data = swift_api(request).get_object(
-            container_name, object_name, resp_chunk_size=resp_chunk_size)
+            container_name, object_name, resp_chunk_size=resp_chunk_size,
+            headers=headers)
     else:
         data = None
         headers = swift_api(request).head_object(container_name,
@@ -372,6 +730,9 @@ def swift_get_object(request, container_name, object_name, with_data=True,
         'content_type': headers.get('content-type'),
         'etag': headers.get('etag'),
         'timestamp': timestamp,
+        'last_modified': headers.get('last-modified'),
+        # Only set for the response to a Range request.
+        'content_range': headers.get('content-range'),
     }
     return StorageObject(obj_info,
                          container_name,
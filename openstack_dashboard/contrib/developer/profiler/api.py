@@ -24,6 +24,8 @@ from osprofiler import profiler
 from osprofiler import web
 from six.moves.urllib.parse import urlparse
 
+from openstack_dashboard.utils import api_ledger
+
 
 ROOT_HEADER = 'PARENT_VIEW_TRACE_ID'
 PROFILER_SETTINGS = getattr(settings, 'OPENSTACK_PROFILER', {})
@@ -122,11 +124,19 @@ def update_trace_headers(keys, **kwargs):
                        web.X_TRACE_HMAC: trace_data[1]})
 
 
+def _record(function):
+    # The API call ledger is enabled when the modules are loaded, so that
+    # the API functions are not wrapped at all when it is disabled.
+    if api_ledger.get_options()['enabled']:
+        return api_ledger.record(function)
+    return function
+
+
 if not PROFILER_SETTINGS.get('enabled', False):
     def trace(function):
-        return function
+        return _record(function)
 else:
     def trace(function):
         func_name = function.__module__ + '.' + function.__name__
         decorator = profiler.trace(func_name)
-        return decorator(function)
+        return _record(decorator(function))
@@ -102,3 +102,4 @@ class AdminImagesTable(project_tables.ImagesTable):
         row_actions = (AdminEditImage, UpdateMetadata, AdminDeleteImage)
         columns = ('tenant', 'name', 'image_type', 'status', 'public',
                    'protected', 'disk_format', 'size')
+        stream_rows = True
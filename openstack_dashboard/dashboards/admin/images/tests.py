@@ -65,6 +65,8 @@ class ImagesViewTest(test.BaseAdminViewTests):
                                                 sort_dir='asc',
                                                 sort_key='name',
                                                 reversed_order=False)
+        # The rows of the images table are streamed.
+        self.assertTrue(res.streaming)
         self.assertContains(res, 'test_tenant', 9, 200)
         self.assertTemplateUsed(res, INDEX_TEMPLATE)
         self.assertEqual(len(res.context['images_table'].data),
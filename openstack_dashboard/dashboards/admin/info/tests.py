@@ -29,7 +29,7 @@ class SystemInfoViewTests(test.BaseAdminViewTests):
                         api.neutron: ['agent_list', 'is_extension_supported'],
                         api.cinder: [('service_list', 'cinder_service_list')],
                         })
-    def _test_base_index(self):
+    def _test_base_index(self, tab=None):
         self.mock_is_service_enabled.return_value = True
         self.mock_nova_service_list.return_value = self.services.list()
 
@@ -46,21 +46,34 @@ class SystemInfoViewTests(test.BaseAdminViewTests):
         self.mock_cinder_service_list.return_value = \
             self.cinder_services.list()
 
-        res = self.client.get(INDEX_URL)
+        url = INDEX_URL
+        if tab:
+            url += '?tab=system_info__%s' % tab
+        res = self.client.get(url)
         self.assertTemplateUsed(res, 'admin/info/index.html')
 
         self.mock_is_service_enabled.assert_called_once_with(
             test.IsHttpRequest(), 'network')
-        self.mock_nova_service_list.assert_called_once_with(
-            test.IsHttpRequest())
         self.mock_is_extension_supported.assert_has_calls([
             mock.call(test.IsHttpRequest(), 'agent'),
             mock.call(test.IsHttpRequest(), 'availability_zone')])
         self.assertEqual(2, self.mock_is_extension_supported.call_count)
-        self.mock_agent_list.assert_called_once_with(
-            test.IsHttpRequest())
-        self.mock_cinder_service_list.assert_called_once_with(
-            test.IsHttpRequest())
+        # The tab group is lazy, only the data of the active tab is loaded.
+        if tab == 'network_agents':
+            self.mock_agent_list.assert_called_once_with(
+                test.IsHttpRequest())
+        else:
+            self.mock_agent_list.assert_not_called()
+        if tab == 'nova_services':
+            self.mock_nova_service_list.assert_called_once_with(
+                test.IsHttpRequest())
+        else:
+            self.mock_nova_service_list.assert_not_called()
+        if tab == 'cinder_services':
+            self.mock_cinder_service_list.assert_called_once_with(
+                test.IsHttpRequest())
+        else:
+            self.mock_cinder_service_list.assert_not_called()
 
         return res
 
@@ -71,8 +84,14 @@ class SystemInfoViewTests(test.BaseAdminViewTests):
         self.assertIn("endpoints",
                       services_tab._tables['services'].data[0])
 
+    def test_nova_index(self):
+        res = self._test_base_index(tab='nova_services')
+        nova_services_tab = res.context['tab_group'].get_tab('nova_services')
+        self.assertEqual(self.services.list(),
+                         nova_services_tab._tables['nova_services'].data)
+
     def test_neutron_index(self):
-        res = self._test_base_index()
+        res = self._test_base_index(tab='network_agents')
         network_agents_tab = res.context['tab_group'].get_tab('network_agents')
         self.assertQuerysetEqual(
             network_agents_tab._tables['network_agents'].data,
@@ -80,7 +99,7 @@ class SystemInfoViewTests(test.BaseAdminViewTests):
         )
 
     def test_cinder_index(self):
-        res = self._test_base_index()
+        res = self._test_base_index(tab='cinder_services')
         cinder_services_tab = res.context['tab_group'].\
             get_tab('cinder_services')
         self.assertQuerysetEqual(
@@ -28,3 +28,4 @@ class AdminInstanceDetailTabs(tabs.DetailTabsGroup):
     tabs = (project_tabs.OverviewTab, project_tabs.LogTab,
             project_tabs.ConsoleTab, AuditTab)
     sticky = True
+    prefetch_on_hover = True
@@ -130,9 +130,8 @@ class NetworkTests(test.BaseAdminViewTests):
                          network.status_label)
         self.assertTemplateUsed(res, 'horizon/common/_detail.html')
 
-        self.assert_mock_multiple_calls_with_same_arguments(
-            self.mock_network_get, 2,
-            mock.call(test.IsHttpRequest(), network.id))
+        self.mock_network_get.assert_called_once_with(
+            test.IsHttpRequest(), network.id)
         self.mock_tenant_quota_usages.assert_called_once_with(
             test.IsHttpRequest(), tenant_id=network.tenant_id,
             targets=('subnet',))
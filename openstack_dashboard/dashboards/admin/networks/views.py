@@ -24,6 +24,7 @@ from horizon import tabs
 from horizon.utils import memoized
 
 from openstack_dashboard import api
+from openstack_dashboard.dashboards.project.networks.tabs import get_network
 from openstack_dashboard.dashboards.project.networks.tabs import OverviewTab
 from openstack_dashboard.dashboards.project.networks import views as user_views
 from openstack_dashboard.utils import filters
@@ -155,6 +156,7 @@ class NetworkDetailsTabs(tabs.DetailTabsGroup):
     tabs = (OverviewTab, subnets_tables.SubnetsTab, ports_tables.PortsTab,
             agents_tabs.DHCPAgentsTab, )
     sticky = True
+    prefetch = {'network': get_network}
 
 
 class DetailView(tabs.TabbedTableView):
@@ -166,7 +168,9 @@ class DetailView(tabs.TabbedTableView):
     def _get_data(self):
         try:
             network_id = self.kwargs['network_id']
-            network = api.neutron.network_get(self.request, network_id)
+            # The network is loaded along with the data of the tabs.
+            tab_group = self.get_tabs(self.request, **self.kwargs)
+            network = tab_group.get_prefetched('network')
             network.set_id_as_name_if_empty(length=0)
         except Exception:
             network = None
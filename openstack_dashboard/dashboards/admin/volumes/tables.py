@@ -121,3 +121,4 @@ class VolumesTable(volumes_tables.VolumesTable):
                        volumes_tables.UpdateMetadata)
         columns = ('tenant', 'host', 'name', 'size', 'status', 'volume_type',
                    'attachments', 'bootable', 'encryption',)
+        stream_rows = True
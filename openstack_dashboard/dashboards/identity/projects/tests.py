@@ -713,6 +713,8 @@ class UpdateProjectWorkflowTests(test.BaseAdminViewTests):
         retvals_remove_group_role = []
         expected_remove_group_role = []
         self.mock_remove_group_role.side_effect = retvals_remove_group_role
+        expected_add_group_role = []
+        self.mock_add_group_role.return_value = None
 
         if keystone_api_version >= 3:
             # admin role with attempt to remove current admin, results in
@@ -753,29 +755,15 @@ class UpdateProjectWorkflowTests(test.BaseAdminViewTests):
             retvals_group_list.append(groups)
             expected_group_list.append(
                 mock.call(test.IsHttpRequest(),
-                          domain=self.domain.id,
-                          project=self.tenant.id))
-            retvals_roles_for_group.append(roles)
-            expected_roles_for_group.append(
-                mock.call(test.IsHttpRequest(),
-                          group='1',
-                          project=self.tenant.id))
-            retvals_remove_group_role.append(None)
-            expected_remove_group_role.append(
-                mock.call(test.IsHttpRequest(),
-                          project=self.tenant.id,
-                          group='1',
-                          role='1'))
-            retvals_roles_for_group.append(roles)
-            expected_roles_for_group.append(
-                mock.call(test.IsHttpRequest(),
-                          group='2',
-                          project=self.tenant.id))
-            retvals_roles_for_group.append(roles)
-            expected_roles_for_group.append(
-                mock.call(test.IsHttpRequest(),
-                          group='3',
-                          project=self.tenant.id))
+                          domain=self.domain.id))
+            # Group 1 keeps role 2, groups 2 and 3 are given roles 1 and 2
+            for group_id in ('2', '3'):
+                for role_id in ('1', '2'):
+                    expected_add_group_role.append(
+                        mock.call(test.IsHttpRequest(),
+                                  role=role_id,
+                                  group=group_id,
+                                  project=self.tenant.id))
         else:
             retvals_user_list.append(proj_users)
             expected_user_list.append(
@@ -856,10 +844,12 @@ class UpdateProjectWorkflowTests(test.BaseAdminViewTests):
                           expected_roles_for_group)
         _check_mock_calls(self.mock_remove_group_role,
                           expected_remove_group_role)
+        _check_mock_calls(self.mock_add_group_role,
+                          expected_add_group_role, any_order=True)
 
         if keystone_api_version >= 3:
             self.assert_mock_multiple_calls_with_same_arguments(
-                self.mock_role_assignments_list, 3,
+                self.mock_role_assignments_list, 4,
                 mock.call(test.IsHttpRequest(), project=self.tenant.id))
         else:
             self.mock_role_assignments_list.assert_not_called()
@@ -17,6 +17,7 @@
 #    under the License.
 
 import abc
+import collections
 import logging
 
 from django.conf import settings
@@ -468,6 +469,23 @@ class UpdateProjectGroups(workflows.UpdateMembersStep):
         return context
 
 
+def _get_members_roles(member_step, data, available_roles):
+    """Return a dict mapping the selected members to their role ids."""
+    members_roles = collections.defaultdict(list)
+    for role in available_roles:
+        field_name = member_step.get_member_field_name(role.id)
+        for member_id in data[field_name]:
+            members_roles[member_id].append(role.id)
+    return members_roles
+
+
+def _raise_first_failure(failed):
+    # The first error is handled by the caller, which reports how many
+    # members could not be updated.
+    if failed:
+        raise failed[0][2]
+
+
 class CreateProject(workflows.Workflow):
     slug = "create_project"
     name = _("Create Project")
@@ -529,23 +547,22 @@ class CreateProject(workflows.Workflow):
         try:
             available_roles = api.keystone.role_list(request)
             member_step = self.get_step(PROJECT_USER_MEMBER_SLUG)
-            # count how many users are to be added
-            for role in available_roles:
-                field_name = member_step.get_member_field_name(role.id)
-                role_list = data[field_name]
-                users_to_add += len(role_list)
-            # add new users to project
-            for role in available_roles:
-                field_name = member_step.get_member_field_name(role.id)
-                role_list = data[field_name]
-                users_added = 0
-                for user in role_list:
-                    api.keystone.add_tenant_user_role(request,
-                                                      project=project_id,
-                                                      user=user,
-                                                      role=role.id)
-                    users_added += 1
-                users_to_add -= users_added
+            users_roles = _get_members_roles(member_step, data,
+                                             available_roles)
+            users_to_add = len(users_roles)
+            to_grant, to_revoke = identity.diff_role_assignments(
+                {}, users_roles)
+
+            def grant(user_id, role_id):
+                api.keystone.add_tenant_user_role(request,
+                                                  project=project_id,
+                                                  user=user_id,
+                                                  role=role_id)
+
+            failed = identity.apply_role_assignments(grant, None,
+                                                     to_grant, to_revoke)
+            users_to_add = len(set(failure[0] for failure in failed))
+            _raise_first_failure(failed)
         except Exception:
             if PROJECT_GROUP_ENABLED:
                 group_msg = _(", add project groups")
@@ -563,24 +580,22 @@ class CreateProject(workflows.Workflow):
         try:
             available_roles = api.keystone.role_list(request)
             member_step = self.get_step(PROJECT_GROUP_MEMBER_SLUG)
-
-            # count how many groups are to be added
-            for role in available_roles:
-                field_name = member_step.get_member_field_name(role.id)
-                role_list = data[field_name]
-                groups_to_add += len(role_list)
-            # add new groups to project
-            for role in available_roles:
-                field_name = member_step.get_member_field_name(role.id)
-                role_list = data[field_name]
-                groups_added = 0
-                for group in role_list:
-                    api.keystone.add_group_role(request,
-                                                role=role.id,
-                                                group=group,
-                                                project=project_id)
-                    groups_added += 1
-                groups_to_add -= groups_added
+            groups_roles = _get_members_roles(member_step, data,
+                                              available_roles)
+            groups_to_add = len(groups_roles)
+            to_grant, to_revoke = identity.diff_role_assignments(
+                {}, groups_roles)
+
+            def grant(group_id, role_id):
+                api.keystone.add_group_role(request,
+                                            role=role_id,
+                                            group=group_id,
+                                            project=project_id)
+
+            failed = identity.apply_role_assignments(grant, None,
+                                                     to_grant, to_revoke)
+            groups_to_add = len(set(failure[0] for failure in failed))
+            _raise_first_failure(failed)
         except Exception:
             exceptions.handle(request,
                               _('Failed to add %s project groups '
@@ -710,39 +725,6 @@ class UpdateProject(workflows.Workflow):
             exceptions.handle(request, ignore=True)
             return
 
-    def _add_roles_to_users(self, request, data, project_id, user_id,
-                            role_ids, available_roles):
-        member_step = self.get_step(PROJECT_USER_MEMBER_SLUG)
-        current_role_ids = list(role_ids)
-
-        for role in available_roles:
-            field_name = member_step.get_member_field_name(role.id)
-            # Check if the user is in the list of users with this role.
-            if user_id in data[field_name]:
-                # Add it if necessary
-                if role.id not in current_role_ids:
-                    # user role has changed
-                    api.keystone.add_tenant_user_role(
-                        request,
-                        project=project_id,
-                        user=user_id,
-                        role=role.id)
-                else:
-                    # User role is unchanged, so remove it from the
-                    # remaining roles list to avoid removing it later.
-                    index = current_role_ids.index(role.id)
-                    current_role_ids.pop(index)
-        return current_role_ids
-
-    def _remove_roles_from_user(self, request, project_id, user_id,
-                                current_role_ids):
-        for id_to_delete in current_role_ids:
-            api.keystone.remove_tenant_user_role(
-                request,
-                project=project_id,
-                user=user_id,
-                role=id_to_delete)
-
     def _is_removing_self_admin_role(self, request, project_id, user_id,
                                      available_roles, current_role_ids):
         is_current_user = user_id == request.user.id
@@ -782,7 +764,6 @@ class UpdateProject(workflows.Workflow):
             # can diff against it.
             users_roles = api.keystone.get_project_users_roles(
                 request, project=project_id)
-            users_to_modify = len(users_roles)
 
             # TODO(bpokorny): The following lines are needed to make sure we
             # only modify roles for users who are in the current domain.
@@ -794,44 +775,47 @@ class UpdateProject(workflows.Workflow):
                                                domain=data['domain_id'])
             users_dict = {user.id: user.name for user in all_users}
 
-            for user_id in users_roles.keys():
-                # Don't remove roles if the user isn't in the domain
+            current_roles = dict((user_id, role_ids)
+                                 for user_id, role_ids in users_roles.items()
+                                 if user_id in users_dict)
+            desired_roles = dict((user_id, []) for user_id in current_roles)
+            desired_roles.update(_get_members_roles(member_step, data,
+                                                    available_roles))
+            # Don't touch the roles of the users outside of the domain.
+            for user_id in users_roles:
                 if user_id not in users_dict:
-                    users_to_modify -= 1
-                    continue
-
-                # Check if there have been any changes in the roles of
-                # Existing project members.
-                current_role_ids = list(users_roles[user_id])
-                modified_role_ids = self._add_roles_to_users(
-                    request, data, project_id, user_id,
-                    current_role_ids, available_roles)
-                # Prevent admins from doing stupid things to themselves.
-                removing_admin = self._is_removing_self_admin_role(
-                    request, project_id, user_id, available_roles,
-                    modified_role_ids)
-                # Otherwise go through and revoke any removed roles.
-                if not removing_admin:
-                    self._remove_roles_from_user(request, project_id, user_id,
-                                                 modified_role_ids)
-                users_to_modify -= 1
-
-            # Grant new roles on the project.
-            for role in available_roles:
-                field_name = member_step.get_member_field_name(role.id)
-                # Count how many users may be added for exception handling.
-                users_to_modify += len(data[field_name])
-            for role in available_roles:
-                users_added = 0
-                field_name = member_step.get_member_field_name(role.id)
-                for user_id in data[field_name]:
-                    if user_id not in users_roles:
-                        api.keystone.add_tenant_user_role(request,
-                                                          project=project_id,
-                                                          user=user_id,
-                                                          role=role.id)
-                    users_added += 1
-                users_to_modify -= users_added
+                    desired_roles.pop(user_id, None)
+            users_to_modify = len(desired_roles)
+
+            to_grant, to_revoke = identity.diff_role_assignments(
+                current_roles, desired_roles)
+            # Prevent admins from doing stupid things to themselves.
+            current_user_id = request.user.id
+            revoked_role_ids = [role_id for user_id, role_id in to_revoke
+                                if user_id == current_user_id]
+            if revoked_role_ids and self._is_removing_self_admin_role(
+                    request, project_id, current_user_id, available_roles,
+                    revoked_role_ids):
+                to_revoke = [(user_id, role_id)
+                             for user_id, role_id in to_revoke
+                             if user_id != current_user_id]
+
+            def grant(user_id, role_id):
+                api.keystone.add_tenant_user_role(request,
+                                                  project=project_id,
+                                                  user=user_id,
+                                                  role=role_id)
+
+            def revoke(user_id, role_id):
+                api.keystone.remove_tenant_user_role(request,
+                                                     project=project_id,
+                                                     user=user_id,
+                                                     role=role_id)
+
+            failed = identity.apply_role_assignments(grant, revoke,
+                                                     to_grant, to_revoke)
+            users_to_modify = len(set(failure[0] for failure in failed))
+            _raise_first_failure(failed)
             return True
         except Exception:
             if PROJECT_GROUP_ENABLED:
@@ -853,64 +837,45 @@ class UpdateProject(workflows.Workflow):
         try:
             available_roles = self._get_available_roles(request)
             # Get the groups currently associated with this project so we
-            # can diff against it.
-            project_groups = api.keystone.group_list(request,
-                                                     domain=domain_id,
-                                                     project=project_id)
-            groups_to_modify = len(project_groups)
-            for group in project_groups:
-                # Check if there have been any changes in the roles of
-                # Existing project members.
-                current_roles = api.keystone.roles_for_group(
-                    self.request,
-                    group=group.id,
-                    project=project_id)
-                current_role_ids = [role.id for role in current_roles]
-                for role in available_roles:
-                    # Check if the group is in the list of groups with
-                    # this role.
-                    field_name = member_step.get_member_field_name(role.id)
-                    if group.id in data[field_name]:
-                        # Add it if necessary
-                        if role.id not in current_role_ids:
-                            # group role has changed
-                            api.keystone.add_group_role(
-                                request,
-                                role=role.id,
-                                group=group.id,
-                                project=project_id)
-                        else:
-                            # Group role is unchanged, so remove it from
-                            # the remaining roles list to avoid removing it
-                            # later.
-                            index = current_role_ids.index(role.id)
-                            current_role_ids.pop(index)
-
-                # Revoke any removed roles.
-                for id_to_delete in current_role_ids:
-                    api.keystone.remove_group_role(request,
-                                                   role=id_to_delete,
-                                                   group=group.id,
-                                                   project=project_id)
-                groups_to_modify -= 1
-
-            # Grant new roles on the project.
-            for role in available_roles:
-                field_name = member_step.get_member_field_name(role.id)
-                # Count how many groups may be added for error handling.
-                groups_to_modify += len(data[field_name])
-            for role in available_roles:
-                groups_added = 0
-                field_name = member_step.get_member_field_name(role.id)
-                for group_id in data[field_name]:
-                    if not filter(lambda x: group_id == x.id,
-                                  project_groups):
-                        api.keystone.add_group_role(request,
-                                                    role=role.id,
-                                                    group=group_id,
-                                                    project=project_id)
-                    groups_added += 1
-                groups_to_modify -= groups_added
+            # can diff against it. Only the groups of the domain are
+            # managed, like the users.
+            groups_roles = api.keystone.get_project_groups_roles(
+                request, project=project_id)
+            domain_groups = api.keystone.group_list(request,
+                                                    domain=domain_id)
+            domain_group_ids = set(group.id for group in domain_groups)
+
+            current_roles = dict((group_id, role_ids)
+                                 for group_id, role_ids
+                                 in groups_roles.items()
+                                 if group_id in domain_group_ids)
+            desired_roles = dict((group_id, []) for group_id in current_roles)
+            desired_roles.update(_get_members_roles(member_step, data,
+                                                    available_roles))
+            for group_id in groups_roles:
+                if group_id not in domain_group_ids:
+                    desired_roles.pop(group_id, None)
+            groups_to_modify = len(desired_roles)
+
+            to_grant, to_revoke = identity.diff_role_assignments(
+                current_roles, desired_roles)
+
+            def grant(group_id, role_id):
+                api.keystone.add_group_role(request,
+                                            role=role_id,
+                                            group=group_id,
+                                            project=project_id)
+
+            def revoke(group_id, role_id):
+                api.keystone.remove_group_role(request,
+                                               role=role_id,
+                                               group=group_id,
+                                               project=project_id)
+
+            failed = identity.apply_role_assignments(grant, revoke,
+                                                     to_grant, to_revoke)
+            groups_to_modify = len(set(failure[0] for failure in failed))
+            _raise_first_failure(failed)
             return True
         except Exception:
             exceptions.handle(request,
@@ -921,10 +886,6 @@ class UpdateProject(workflows.Workflow):
             return False
 
     def handle(self, request, data):
-        # FIXME(gabriel): This should be refactored to use Python's built-in
-        # sets and do this all in a single "roles to add" and "roles to remove"
-        # pass instead of the multi-pass thing happening now.
-
         project = self._update_project(request, data)
         if not project:
             return False
@@ -268,6 +268,10 @@ class CreateImageForm(CreateParent):
                           _('Your image %s has been queued for creation.') %
                           meta['name'])
             return image
+        except exceptions.NotAvailable as e:
+            # Too many images are being uploaded by this web server.
+            self.api_error(six.text_type(e))
+            return False
         except Exception as e:
             msg = _('Unable to create new image')
             # TODO(nikunj2512): Fix this once it is fixed in glance client
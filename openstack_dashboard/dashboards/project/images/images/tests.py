@@ -26,6 +26,7 @@ from django.urls import reverse
 import mock
 import six
 
+from horizon import exceptions
 from horizon import tables as horizon_tables
 from openstack_dashboard import api
 from openstack_dashboard.test import helpers as test
@@ -256,6 +257,32 @@ class ImageViewTests(test.ResetImageAPIVersionMixin, test.TestCase):
         api_data = {'data': test.IsA(InMemoryUploadedFile)}
         self._test_image_create(data, api_data)
 
+    @mock.patch.object(api.glance, 'image_create')
+    @mock.patch.object(api.glance, 'image_list_detailed')
+    def test_image_create_post_upload_not_available(self, mock_image_list,
+                                                    mock_image_create):
+        mock_image_list.return_value = [self.images.list(), False, False]
+        mock_image_create.side_effect = exceptions.NotAvailable('busy')
+        temp_file = tempfile.NamedTemporaryFile()
+        temp_file.write(b'123')
+        temp_file.flush()
+        temp_file.seek(0)
+        data = {'name': u'Ubuntu 11.10',
+                'disk_format': u'qcow2',
+                'min_disk': 15,
+                'min_ram': 512,
+                'is_public': True,
+                'protected': False,
+                'method': 'CreateImageForm',
+                'source_type': u'file',
+                'image_file': temp_file}
+
+        url = reverse('horizon:project:images:images:create')
+        res = self.client.post(url, data)
+
+        self.assertFormErrors(res, 1, 'busy')
+        self.assertEqual(1, mock_image_create.call_count)
+
     @override_settings(OPENSTACK_API_VERSIONS={'image': 1})
     def test_image_create_post_with_kernel_ramdisk_v1(self):
         temp_file = tempfile.NamedTemporaryFile()
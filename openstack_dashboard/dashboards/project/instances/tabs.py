@@ -139,3 +139,4 @@ class InstanceDetailTabs(tabs.DetailTabsGroup):
     slug = "instance_details"
     tabs = (OverviewTab, InterfacesTab, LogTab, ConsoleTab, AuditTab)
     sticky = True
+    prefetch_on_hover = True
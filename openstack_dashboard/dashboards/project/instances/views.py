@@ -101,13 +101,13 @@ class IndexView(tables.DataTableView):
         if not instances:
             return []
 
-        # TODO(future): Explore more efficient logic to sync IP address
-        # and drop the setting OPENSTACK_INSTANCE_RETRIEVE_IP_ADDRESSES.
         # The situation servers_update_addresses() is needed is only
         # when IP address of a server is updated via neutron API and
         # nova network info cache is not synced. Precisely there is no
-        # need to check IP addresses of all servers. It is sufficient to
-        # fetch IP address information for servers recently updated.
+        # need to check IP addresses of all servers. When
+        # OPENSTACK_INSTANCE_RETRIEVE_IP_ADDRESSES is 'incremental',
+        # IP address information is only fetched for servers updated
+        # since the last retrieval.
         if not getattr(settings,
                        'OPENSTACK_INSTANCE_RETRIEVE_IP_ADDRESSES', True):
             return instances
@@ -40,17 +40,21 @@ class PortDetailTabs(tabs.DetailTabsGroup):
     sticky = True
 
 
+def get_network_ports(request, network_id, **kwargs):
+    return api.neutron.port_list(request, network_id=network_id)
+
+
 class PortsTab(tabs.TableTab):
     name = _("Ports")
     slug = "ports_tab"
     table_classes = (port_tables.PortsTable,)
     template_name = ("horizon/common/_detail_table.html")
     preload = False
+    prefetch = {'ports': get_network_ports}
 
     def get_ports_data(self):
         try:
-            network_id = self.tab_group.kwargs['network_id']
-            ports = api.neutron.port_list(self.request, network_id=network_id)
+            ports = self.get_prefetched('ports')
         except Exception:
             ports = []
             msg = _('Port list can not be retrieved.')
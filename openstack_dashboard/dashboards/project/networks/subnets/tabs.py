@@ -32,19 +32,21 @@ class OverviewTab(tabs.Tab):
         return {'subnet': subnet}
 
 
+def get_network_subnets(request, network_id, **kwargs):
+    return api.neutron.subnet_list(request, network_id=network_id)
+
+
 class SubnetsTab(tabs.TableTab):
     name = _("Subnets")
     slug = "subnets_tab"
     table_classes = (subnet_tables.SubnetsTable,)
     template_name = ("horizon/common/_detail_table.html")
     preload = False
+    prefetch = {'subnets': get_network_subnets}
 
     def get_subnets_data(self):
         try:
-            network_id = self.tab_group.kwargs['network_id']
-            subnets = api.neutron.subnet_list(self.request,
-                                              network_id=network_id)
-
+            subnets = self.get_prefetched('subnets')
         except Exception:
             subnets = []
             msg = _('Subnet list can not be retrieved.')
@@ -29,11 +29,16 @@ from openstack_dashboard.dashboards.project.networks \
 from openstack_dashboard.utils import filters
 
 
+def get_network(request, network_id, **kwargs):
+    return api.neutron.network_get(request, network_id)
+
+
 class OverviewTab(tabs.Tab):
     name = _("Overview")
     slug = "overview"
     template_name = ("project/networks/_detail_overview.html")
     preload = False
+    prefetch = {'network': get_network}
 
     @memoized.memoized_method
     def _get_data(self):
@@ -41,7 +46,7 @@ class OverviewTab(tabs.Tab):
         network_id = None
         try:
             network_id = self.tab_group.kwargs['network_id']
-            network = api.neutron.network_get(self.request, network_id)
+            network = self.get_prefetched('network')
             network.set_id_as_name_if_empty(length=0)
 
             choices = project_tables.STATUS_DISPLAY_CHOICES
@@ -66,5 +71,6 @@ class OverviewTab(tabs.Tab):
 
 class NetworkDetailsTabs(tabs.DetailTabsGroup):
     slug = "network_tabs"
+    prefetch = {'network': get_network}
     tabs = (OverviewTab, subnets_tabs.SubnetsTab, ports_tabs.PortsTab, )
     sticky = True
@@ -210,9 +210,8 @@ class NetworkTests(test.TestCase, NetworkStubMixin):
                          network.status_label)
         self.assertTemplateUsed(res, 'horizon/common/_detail.html')
 
-        self.assert_mock_multiple_calls_with_same_arguments(
-            self.mock_network_get, 2,
-            mock.call(test.IsHttpRequest(), network_id))
+        self.mock_network_get.assert_called_once_with(
+            test.IsHttpRequest(), network_id)
         self.mock_tenant_quota_usages.assert_called_once_with(
             test.IsHttpRequest(), targets=('subnet', ))
         self._check_is_extension_supported({'mac-learning': 1,
@@ -274,9 +273,8 @@ class NetworkTests(test.TestCase, NetworkStubMixin):
         redir_url = INDEX_URL
         self.assertRedirectsNoFollow(res, redir_url)
 
-        self.assert_mock_multiple_calls_with_same_arguments(
-            self.mock_network_get, 2,
-            mock.call(test.IsHttpRequest(), network_id))
+        self.mock_network_get.assert_called_once_with(
+            test.IsHttpRequest(), network_id)
         self.mock_is_extension_supported.assert_called_once_with(
             test.IsHttpRequest(), 'mac-learning')
 
@@ -133,7 +133,9 @@ class DetailView(tabs.TabbedTableView):
     def _get_data(self):
         try:
             network_id = self.kwargs['network_id']
-            network = api.neutron.network_get(self.request, network_id)
+            # The network is loaded along with the data of the tabs.
+            tab_group = self.get_tabs(self.request, **self.kwargs)
+            network = tab_group.get_prefetched('network')
             network.set_id_as_name_if_empty(length=0)
         except Exception:
             msg = _('Unable to retrieve details for network "%s".') \
@@ -246,6 +246,8 @@ class CreateBackup(VolumePolicyTargetMixin, tables.LinkAction):
     url = "horizon:project:volumes:create_backup"
     classes = ("ajax-modal",)
     policy_rules = (("volume", "backup:create"),)
+    # The default rule of backup:create does not read the volume.
+    datum_independent = True
 
     def allowed(self, request, volume=None):
         return (cinder.volume_backup_supported(request) and
@@ -0,0 +1,42 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+from django.conf import settings
+from django.core.management import base
+
+from horizon.utils import file_discovery
+
+
+class Command(base.BaseCommand):
+    help = ("Write the manifest of the static files discovered when loading "
+            "the settings, which saves searching the static directories of "
+            "Horizon, the dashboards and the themes when the next processes "
+            "start. It has to be run again whenever static files are added, "
+            "removed or renamed, e.g. together with the 'collectstatic' and "
+            "'compress' commands.")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '-o', '--output', default=None,
+            help="Path of the manifest, defaults to the "
+                 "STATIC_FILES_MANIFEST setting.")
+
+    def handle(self, *args, **options):
+        output = (options['output'] or
+                  getattr(settings, 'STATIC_FILES_MANIFEST', None))
+        if not output:
+            raise base.CommandError(
+                "The path of the manifest has to be given with --output or "
+                "the STATIC_FILES_MANIFEST setting.")
+        count = file_discovery.write_manifest(output)
+        self.stdout.write("Static files of %d directories written to %s"
+                          % (count, output))
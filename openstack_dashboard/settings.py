@@ -26,6 +26,7 @@ from django.utils.translation import pgettext_lazy
 from django.utils.translation import ugettext_lazy as _
 
 from horizon.utils.escape import monkeypatch_escape
+from horizon.utils import file_discovery
 
 from openstack_dashboard import enabled
 from openstack_dashboard import exceptions
@@ -59,6 +60,7 @@ MEDIA_ROOT = None
 MEDIA_URL = None
 STATIC_ROOT = None
 STATIC_URL = None
+STATIC_FILES_MANIFEST = None
 SELECTABLE_THEMES = None
 INTEGRATION_TESTS_SUPPORT = False
 NG_TEMPLATE_CACHE_AGE = 2592000
@@ -84,7 +86,9 @@ HORIZON_CONFIG = {
     'js_spec_files': [],
     'external_templates': [],
     'plugins': [],
-    'integration_tests_support': INTEGRATION_TESTS_SUPPORT
+    'integration_tests_support': INTEGRATION_TESTS_SUPPORT,
+    'parallel_call':
+        'openstack_dashboard.utils.futurist_utils.call_functions_parallel',
 }
 
 # The OPENSTACK_IMAGE_BACKEND settings can be used to customize features
@@ -110,6 +114,7 @@ OPENSTACK_IMAGE_BACKEND = {
 }
 
 MIDDLEWARE = (
+    'openstack_dashboard.utils.api_ledger.APICallLedgerMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -458,7 +463,9 @@ if not SECRET_KEY:
                                                        '.secret_key_store'))
 
 # populate HORIZON_CONFIG with auto-discovered JavaScript sources, mock files,
-# specs files and external templates.
+# specs files and external templates. The static directories listed in the
+# manifest written by the make_static_manifest command are not searched.
+file_discovery.load_manifest(STATIC_FILES_MANIFEST)
 settings_utils.find_static_files(HORIZON_CONFIG, AVAILABLE_THEMES,
                                  THEME_COLLECTION_DIR, ROOT_PATH)
 
@@ -0,0 +1,13 @@
+{% autoescape off %}
+{% load angular_escapes from angular %}
+angular
+ .module('horizon.app')
+ .run(['$templateCache', function($templateCache) {
+{% for static_path, template_html in angular_templates %}
+   $templateCache.put(
+     "{{ static_path }}",
+     "{{ template_html|angular_escapes }}"
+   );
+{% endfor %}
+}]);
+{% endautoescape %}
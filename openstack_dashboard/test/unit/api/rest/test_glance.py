@@ -12,8 +12,10 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+from django.test import RequestFactory
 import mock
 
+from horizon import exceptions
 from openstack_dashboard import api
 from openstack_dashboard.api.rest import glance
 from openstack_dashboard.test import helpers as test
@@ -166,6 +168,44 @@ class ImagesRestTestCase(test.ResetImageAPIVersionMixin, test.TestCase):
                                                               filters=filters,
                                                               **kwargs)
 
+    @test.create_mocks({api.glance: ['image_upload_get']})
+    def test_image_upload_get(self):
+        request = self.mock_rest_request()
+        self.mock_image_upload_get.return_value = {
+            'image_id': 'abc', 'project_id': 'project', 'status': 'uploading',
+            'size': 100, 'transferred': 40, 'error': None}
+        response = glance.ImageUpload().get(request, 'abc')
+        self.assertStatusCode(response, 200)
+        self.assertEqual({'image_id': 'abc', 'status': 'uploading',
+                          'size': 100, 'transferred': 40, 'error': None},
+                         response.json)
+        self.mock_image_upload_get.assert_called_once_with(request, 'abc')
+
+    @test.create_mocks({api.glance: ['image_upload_get']})
+    def test_image_upload_get_not_found(self):
+        request = self.mock_rest_request()
+        self.mock_image_upload_get.return_value = None
+        response = glance.ImageUpload().get(request, 'abc')
+        self.assertStatusCode(response, 404)
+
+    @test.create_mocks({api.glance: ['image_create']})
+    def test_image_create_upload_not_available(self):
+        request = RequestFactory().post('/', {'name': 'image'})
+        self.mock_image_create.side_effect = exceptions.NotAvailable('busy')
+        response = glance.Images().post(request)
+        self.assertStatusCode(response, 503)
+
+    @test.create_mocks({api.glance: ['image_create']})
+    def test_image_create_put_not_available(self):
+        request = self.mock_rest_request(body='''{"name": "Test",
+            "disk_format": "aki", "visibility": "public",
+            "container_format": "aki", "protected": false,
+            "source_type": "file", "data": "external"}''')
+        self.mock_image_create.side_effect = exceptions.NotAvailable('busy')
+        response = glance.Images().put(request)
+        self.assertStatusCode(response, 503)
+        self.assertEqual('"busy"', response.content.decode('utf-8'))
+
     @test.create_mocks({api.glance: ['image_create', 'VERSIONS']})
     def test_image_create_v1_basic(self):
         request = self.mock_rest_request(body='''{"name": "Test",
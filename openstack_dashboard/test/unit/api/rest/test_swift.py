@@ -11,7 +11,16 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test.client import ClientHandler
+from django.test import RequestFactory
+from django.test.utils import override_settings
+
 import mock
+import swiftclient
+
+from horizon import exceptions
 
 from openstack_dashboard import api
 from openstack_dashboard.api.rest import swift
@@ -152,6 +161,20 @@ class SwiftRestTestCase(test.TestCase):
             u'container one%\u6346', prefix=u'test folder%\u6346/'
         )
 
+    @test.create_mocks({api.swift: ['swift_filter_objects']})
+    def test_objects_get_filter(self):
+        request = self.mock_rest_request(GET={'filter': 'test*two',
+                                              'marker': 'test'})
+        self.mock_swift_filter_objects.return_value = (
+            self.objects.list()[1:2], True)
+        response = swift.Objects().get(request, u'container one%\u6346')
+        self.assertStatusCode(response, 200)
+        self.assertEqual(1, len(response.json['items']))
+        self.assertTrue(response.json['has_more'])
+        self.mock_swift_filter_objects.assert_called_once_with(
+            request, 'test*two', u'container one%\u6346', prefix=None,
+            marker='test')
+
     @test.create_mocks({api.swift: ['swift_get_object']})
     def test_object_get(self):
         request = self.mock_rest_request()
@@ -166,6 +189,100 @@ class SwiftRestTestCase(test.TestCase):
             with_data=False
         )
 
+    def _download(self, content_range=None, **info):
+        obj_info = {'name': 'test.txt', 'bytes': 4, 'etag': 'abc',
+                    'last_modified': 'Wed, 21 Oct 2015 07:28:00 GMT',
+                    'content_range': content_range}
+        obj_info.update(info)
+        return api.swift.StorageObject(obj_info, 'container',
+                                       data=iter([b'data']))
+
+    def _swift_error(self, status, headers=None):
+        # The constructor of the exception is replaced by the test data.
+        exc = swiftclient.exceptions.ClientException(status, 'GET failed')
+        exc.http_status = status
+        exc.http_response_headers = headers
+        return exc
+
+    @test.create_mocks({api.swift: ['swift_get_object']})
+    def test_object_download(self):
+        request = self.mock_rest_request(META={})
+        self.mock_swift_get_object.return_value = self._download()
+        response = swift.Object().get(request, 'container', 'test.txt')
+        self.assertStatusCode(response, 200)
+        self.assertEqual(b'data', b''.join(response.streaming_content))
+        self.assertEqual('"abc"', response['ETag'])
+        self.assertEqual('Wed, 21 Oct 2015 07:28:00 GMT',
+                         response['Last-Modified'])
+        self.assertEqual('bytes', response['Accept-Ranges'])
+        self.mock_swift_get_object.assert_called_once_with(
+            request, 'container', 'test.txt', headers={})
+
+    @test.create_mocks({api.swift: ['swift_get_object']})
+    def test_object_download_range(self):
+        request = self.mock_rest_request(META={'HTTP_RANGE': 'bytes=10-13'})
+        self.mock_swift_get_object.return_value = self._download(
+            content_range='bytes 10-13/14')
+        response = swift.Object().get(request, 'container', 'test.txt')
+        self.assertStatusCode(response, 206)
+        self.assertEqual('bytes 10-13/14', response['Content-Range'])
+        self.assertEqual('4', response['Content-Length'])
+        self.mock_swift_get_object.assert_called_once_with(
+            request, 'container', 'test.txt',
+            headers={'Range': 'bytes=10-13'})
+
+    @test.create_mocks({api.swift: ['swift_get_object']})
+    def test_object_download_not_modified(self):
+        request = self.mock_rest_request(
+            META={'HTTP_IF_NONE_MATCH': '"abc"'})
+        self.mock_swift_get_object.side_effect = self._swift_error(
+            304, {'Etag': 'abc'})
+        response = swift.Object().get(request, 'container', 'test.txt')
+        self.assertStatusCode(response, 304)
+        self.assertEqual('"abc"', response['ETag'])
+        self.mock_swift_get_object.assert_called_once_with(
+            request, 'container', 'test.txt',
+            headers={'If-None-Match': '"abc"'})
+
+    @test.create_mocks({api.swift: ['swift_get_object']})
+    def test_object_download_range_not_satisfiable(self):
+        request = self.mock_rest_request(META={'HTTP_RANGE': 'bytes=20-'})
+        self.mock_swift_get_object.side_effect = self._swift_error(
+            416, {'Content-Range': 'bytes */14'})
+        response = swift.Object().get(request, 'container', 'test.txt')
+        self.assertStatusCode(response, 416)
+        self.assertEqual('bytes */14', response['Content-Range'])
+
+    @test.create_mocks({api.swift: ['swift_get_object']})
+    def test_object_download_if_range(self):
+        request = self.mock_rest_request(META={'HTTP_RANGE': 'bytes=10-',
+                                               'HTTP_IF_RANGE': '"abc"'})
+        self.mock_swift_get_object.return_value = self._download(
+            content_range='bytes 10-13/14')
+        response = swift.Object().get(request, 'container', 'test.txt')
+        self.assertStatusCode(response, 206)
+        self.mock_swift_get_object.assert_called_once_with(
+            request, 'container', 'test.txt',
+            headers={'Range': 'bytes=10-', 'If-Match': '"abc"'})
+
+    @test.create_mocks({api.swift: ['swift_get_object']})
+    def test_object_download_if_range_changed(self):
+        date = 'Wed, 21 Oct 2015 07:28:00 GMT'
+        request = self.mock_rest_request(META={'HTTP_RANGE': 'bytes=10-',
+                                               'HTTP_IF_RANGE': date})
+        self.mock_swift_get_object.side_effect = [
+            self._swift_error(412),
+            self._download(bytes=14)]
+        response = swift.Object().get(request, 'container', 'test.txt')
+        self.assertStatusCode(response, 200)
+        self.assertEqual('14', response['Content-Length'])
+        self.assertEqual([
+            mock.call(request, 'container', 'test.txt',
+                      headers={'Range': 'bytes=10-',
+                               'If-Unmodified-Since': date}),
+            mock.call(request, 'container', 'test.txt', headers={}),
+        ], self.mock_swift_get_object.call_args_list)
+
     @test.create_mocks({api.swift: ['swift_delete_object']})
     def test_object_delete(self):
         request = self.mock_rest_request()
@@ -197,6 +314,92 @@ class SwiftRestTestCase(test.TestCase):
         self.mock_swift_upload_object.assert_called_once_with(
             request, 'spam', u'test_object%\u6346', _file)
 
+    @override_settings(SWIFT_STREAMING_UPLOAD={'enabled': True})
+    @mock.patch.object(api.swift, 'ObjectWriter')
+    def test_object_create_streamed(self, mock_writer):
+        writer = mock_writer.return_value
+        writer.close.return_value = self.objects.first()
+        upload = SimpleUploadedFile(u'NOT object%\u6346', b'x' * 10)
+        request = RequestFactory().post('/', {'file': upload})
+        real_name = u'test_object%\u6346'
+
+        response = swift.Object().post(request, 'spam', real_name)
+
+        self.assertStatusCode(response, 201)
+        mock_writer.assert_called_once_with(
+            request, 'spam', real_name, orig_filename=u'NOT object%\u6346',
+            size_hint=int(request.META['CONTENT_LENGTH']))
+        self.assertEqual(b'x' * 10, b''.join(
+            call[0][0] for call in writer.write.call_args_list))
+        writer.close.assert_called_once_with()
+
+    @override_settings(SWIFT_STREAMING_UPLOAD={'enabled': True})
+    @mock.patch.object(api.swift, 'ObjectWriter')
+    def test_object_create_streamed_error(self, mock_writer):
+        writer = mock_writer.return_value
+        writer.write.side_effect = IOError
+        upload = SimpleUploadedFile('object', b'x' * 10)
+        request = RequestFactory().post('/', {'file': upload})
+
+        self.assertRaises(IOError, swift.Object().post, request, 'spam',
+                          'object')
+        writer.abort.assert_called_once_with()
+        writer.close.assert_not_called()
+
+    @override_settings(SWIFT_STREAMING_UPLOAD={'enabled': True})
+    @mock.patch.object(api.swift, 'ObjectWriter')
+    def test_object_create_streamed_not_available(self, mock_writer):
+        mock_writer.side_effect = exceptions.NotAvailable('Too many')
+        upload = SimpleUploadedFile('object', b'x' * 10)
+        request = RequestFactory().post('/', {'file': upload})
+
+        response = swift.Object().post(request, 'spam', 'object')
+
+        self.assertStatusCode(response, 503)
+        self.assertEqual('Too many', response.json)
+
+    @override_settings(SWIFT_STREAMING_UPLOAD={'enabled': True})
+    @mock.patch.object(api.swift, 'ObjectWriter')
+    def test_object_create_streamed_csrf(self, mock_writer):
+        writer = mock_writer.return_value
+        writer.close.return_value = self.objects.first()
+        # Run the requests through the middlewares with the CSRF checks
+        # enforced, as self.client does not. The response is not returned
+        # by the test client itself as it sets response.json.
+        handler = ClientHandler(enforce_csrf_checks=True)
+
+        def post(**extra):
+            upload = SimpleUploadedFile('object', b'x' * 10)
+            request = RequestFactory().post(
+                '/api/swift/containers/spam/object/object', {'file': upload},
+                **extra)
+            return handler(request.environ)
+
+        self.assertEqual(403, post().status_code)
+        mock_writer.assert_not_called()
+
+        token = 'a' * 64
+        cookie = '%s=%s' % (settings.CSRF_COOKIE_NAME, token)
+        response = post(HTTP_COOKIE=cookie, HTTP_X_CSRFTOKEN=token)
+        self.assertEqual(201, response.status_code)
+        self.assertEqual(1, mock_writer.call_count)
+        self.assertEqual(b'x' * 10, b''.join(
+            call[0][0] for call in writer.write.call_args_list))
+        writer.close.assert_called_once_with()
+
+    @override_settings(SWIFT_STREAMING_UPLOAD={'enabled': True})
+    @test.create_mocks({api.swift: ['swift_upload_object', 'ObjectWriter']})
+    def test_object_create_streamed_without_file(self):
+        request = RequestFactory().post('/', {})
+        self.mock_swift_upload_object.return_value = self.objects.first()
+
+        response = swift.Object().post(request, 'spam', 'object')
+
+        self.assertStatusCode(response, 201)
+        self.mock_ObjectWriter.assert_not_called()
+        self.mock_swift_upload_object.assert_called_once_with(
+            request, 'spam', 'object')
+
     @test.create_mocks({api.swift: ['swift_create_pseudo_folder'],
                         swift: ['UploadObjectForm']})
     def test_folder_create(self):
@@ -0,0 +1,118 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from django.core.cache import caches
+from django import http
+from django.test.utils import override_settings
+
+import mock
+
+from openstack_dashboard import api
+from openstack_dashboard.api import cache as api_cache
+from openstack_dashboard.test import helpers as test
+
+
+API_CACHE_ENABLED = {'enabled': True}
+
+
+class APICacheTests(test.TestCase):
+
+    def setUp(self):
+        super(APICacheTests, self).setUp()
+        caches['default'].clear()
+        self.backend = mock.Mock(return_value=['result'])
+
+        @api_cache.cached('things')
+        def list_things(request, name=None):
+            return self.backend(name=name)
+        self.list_things = list_things
+
+    def _new_request(self):
+        # Results are also memoized per request, so a fresh request is
+        # needed to reach the shared cache.
+        request = http.HttpRequest()
+        request.session = self.request.session
+        request.user = self.request.user
+        return request
+
+    def test_disabled(self):
+        self.list_things(self.request)
+        self.list_things(self.request)
+        self.assertEqual(2, self.backend.call_count)
+
+    @override_settings(OPENSTACK_API_CACHE=API_CACHE_ENABLED)
+    def test_shared_between_calls(self):
+        self.assertEqual(['result'], self.list_things(self.request))
+        self.assertEqual(['result'], self.list_things(self.request))
+        self.backend.assert_called_once_with(name=None)
+
+    @override_settings(OPENSTACK_API_CACHE=API_CACHE_ENABLED)
+    def test_arguments_are_part_of_the_key(self):
+        self.list_things(self.request, name='a')
+        self.list_things(self.request, name='b')
+        self.assertEqual(2, self.backend.call_count)
+
+    @override_settings(OPENSTACK_API_CACHE=API_CACHE_ENABLED)
+    def test_project_scope(self):
+        self.list_things(self.request)
+        self.request.user.tenant_id = 'other-project'
+        self.list_things(self.request)
+        self.assertEqual(2, self.backend.call_count)
+
+    @override_settings(OPENSTACK_API_CACHE=API_CACHE_ENABLED)
+    def test_invalidate(self):
+        self.list_things(self.request)
+        api_cache.invalidate(self.request, 'things')
+        self.list_things(self.request)
+        self.assertEqual(2, self.backend.call_count)
+
+    @override_settings(OPENSTACK_API_CACHE=API_CACHE_ENABLED)
+    def test_invalidate_other_resource(self):
+        self.list_things(self.request)
+        api_cache.invalidate(self.request, 'other-things')
+        self.list_things(self.request)
+        self.backend.assert_called_once_with(name=None)
+
+    @override_settings(OPENSTACK_API_CACHE={'enabled': True,
+                                            'timeouts': {'things': 10}})
+    def test_timeouts(self):
+        self.assertEqual(10, api_cache.get_timeout('things'))
+        self.assertEqual(300, api_cache.get_timeout('flavors'))
+        self.assertEqual(60, api_cache.get_timeout('unknown'))
+
+    @override_settings(OPENSTACK_API_CACHE=API_CACHE_ENABLED)
+    @mock.patch.object(api.nova, 'novaclient')
+    def test_nova_flavor_list(self, mock_novaclient):
+        flavors = self.flavors.list()
+        novaclient = mock_novaclient.return_value
+        novaclient.flavors.list.return_value = flavors
+
+        api.nova.flavor_list(self._new_request())
+        cached_flavors = api.nova.flavor_list(self._new_request())
+
+        self.assertEqual([f.id for f in flavors],
+                         [f.id for f in cached_flavors])
+        self.assertEqual([f.name for f in flavors],
+                         [f.name for f in cached_flavors])
+        novaclient.flavors.list.assert_called_once_with(is_public=True)
+
+    @override_settings(OPENSTACK_API_CACHE=API_CACHE_ENABLED)
+    @mock.patch.object(api.nova, 'novaclient')
+    def test_nova_flavor_delete_invalidates(self, mock_novaclient):
+        novaclient = mock_novaclient.return_value
+        novaclient.flavors.list.return_value = self.flavors.list()
+
+        api.nova.flavor_list(self._new_request())
+        api.nova.flavor_delete(self.request, self.flavors.first().id)
+        api.nova.flavor_list(self._new_request())
+
+        self.assertEqual(2, novaclient.flavors.list.call_count)
@@ -0,0 +1,110 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from django.test.utils import override_settings
+
+import mock
+
+from openstack_dashboard.api import capabilities
+from openstack_dashboard.test import helpers as test
+
+
+REGISTRY_ENABLED = {'enabled': True, 'refresh_interval': 600}
+
+
+class CapabilityRegistryTests(test.TestCase):
+
+    def setUp(self):
+        super(CapabilityRegistryTests, self).setUp()
+        capabilities.reset()
+        self.addCleanup(capabilities.reset)
+        self.backend = mock.Mock(return_value=('extension',))
+
+        @capabilities.registered('compute')
+        def list_things(request, name=None):
+            return self.backend(name=name)
+        self.list_things = list_things
+
+        self.executor = mock.Mock()
+        mock.patch.object(capabilities.futurist_utils, 'get_executor',
+                          return_value=self.executor).start()
+
+    def _expire(self):
+        for entry in capabilities._registry.values():
+            entry.updated -= 601
+
+    def _run_submitted(self):
+        for call in self.executor.submit.call_args_list:
+            func, args = call[0][0], call[0][1:]
+            func(*args)
+
+    def test_disabled(self):
+        self.list_things(self.request)
+        self.list_things(self.request)
+        self.assertEqual(2, self.backend.call_count)
+
+    @override_settings(OPENSTACK_CAPABILITY_REGISTRY=REGISTRY_ENABLED)
+    def test_shared_between_requests(self):
+        self.assertEqual(('extension',), self.list_things(self.request))
+        self.assertEqual(('extension',),
+                         self.list_things(self.factory.get('/')))
+        self.backend.assert_called_once_with(name=None)
+        self.assertFalse(self.executor.submit.called)
+
+    @override_settings(OPENSTACK_CAPABILITY_REGISTRY=REGISTRY_ENABLED)
+    def test_arguments_are_part_of_the_key(self):
+        self.list_things(self.request, name='a')
+        self.list_things(self.request, name='b')
+        self.list_things(self.request, name='a')
+        self.assertEqual(2, self.backend.call_count)
+
+    @override_settings(OPENSTACK_CAPABILITY_REGISTRY=REGISTRY_ENABLED)
+    def test_stale_entry_is_refreshed_in_background(self):
+        self.list_things(self.request)
+        self._expire()
+        self.backend.return_value = ('new',)
+        # The known value is returned while it is refreshed.
+        self.assertEqual(('extension',), self.list_things(self.request))
+        # A single refresh is started.
+        self.assertEqual(('extension',), self.list_things(self.request))
+        self.assertEqual(1, self.executor.submit.call_count)
+        self._run_submitted()
+        self.assertEqual(('new',), self.list_things(self.request))
+        self.assertEqual(2, self.backend.call_count)
+
+    @override_settings(OPENSTACK_CAPABILITY_REGISTRY=REGISTRY_ENABLED)
+    def test_failed_refresh_keeps_value(self):
+        self.list_things(self.request)
+        self._expire()
+        self.backend.side_effect = ValueError
+        self.assertEqual(('extension',), self.list_things(self.request))
+        self._run_submitted()
+        # The refresh is not retried before another interval.
+        self.assertEqual(('extension',), self.list_things(self.request))
+        self.assertEqual(2, self.backend.call_count)
+
+    @override_settings(OPENSTACK_CAPABILITY_REGISTRY=REGISTRY_ENABLED)
+    def test_first_fetch_error_is_raised(self):
+        self.backend.side_effect = ValueError
+        self.assertRaises(ValueError, self.list_things, self.request)
+        self.backend.side_effect = None
+        self.assertEqual(('extension',), self.list_things(self.request))
+
+    @override_settings(OPENSTACK_CAPABILITY_REGISTRY=REGISTRY_ENABLED)
+    def test_missing_service_is_not_registered(self):
+        @capabilities.registered('unknown-service')
+        def list_unknown(request):
+            return self.backend()
+        list_unknown(self.request)
+        list_unknown(self.request)
+        self.assertEqual(2, self.backend.call_count)
+        self.assertEqual({}, capabilities._registry)
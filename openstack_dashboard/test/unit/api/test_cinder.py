@@ -394,6 +394,61 @@ class CinderApiTests(test.APIMockTestCase):
         qos_associations_mock.assert_called_once_with(qos_specs_only_one[0].id)
         self.assertEqual(associate_spec, qos_specs_only_one[0].name)
 
+    @mock.patch.object(api.cinder, 'cinderclient')
+    def test_volume_type_list_with_qos_associations_many_specs(
+            self, mock_cinderclient):
+        volume_types = self.cinder_volume_types.list()
+        qos_specs = self.cinder_qos_specs.list()
+        associations = {
+            qos_specs[0].id: [volume_types[0]],
+            qos_specs[1].id: [volume_types[2]],
+        }
+
+        cinderclient = mock_cinderclient.return_value
+        cinderclient.volume_types.list.return_value = volume_types
+        cinderclient.volume_types.get.return_value = volume_types[2]
+        cinderclient.qos_specs.list.return_value = qos_specs
+        qos_associations_mock = cinderclient.qos_specs.get_associations
+        qos_associations_mock.side_effect = associations.get
+
+        vol_types = \
+            api.cinder.volume_type_list_with_qos_associations(self.request)
+        vol_type = \
+            api.cinder.volume_type_get_with_qos_association(
+                self.request, volume_types[2].id)
+
+        self.assertEqual([qos_specs[0].name, "", qos_specs[1].name],
+                         [t.associated_qos_spec for t in vol_types])
+        self.assertEqual(qos_specs[1].name, vol_type.associated_qos_spec)
+        # The associations are retrieved once per request.
+        cinderclient.qos_specs.list.assert_called_once_with()
+        self.assertEqual(2, qos_associations_mock.call_count)
+        qos_associations_mock.assert_has_calls(
+            [mock.call(qos_specs[0].id), mock.call(qos_specs[1].id)],
+            any_order=True)
+
+    @mock.patch.object(api.cinder, 'cinderclient')
+    def test_volume_type_list_with_qos_specs_id(self, mock_cinderclient):
+        volume_types = self.cinder_volume_types.list()
+        qos_specs = self.cinder_qos_specs.list()
+        for volume_type, qos_spec in zip(volume_types,
+                                         [qos_specs[1], None, qos_specs[0]]):
+            volume_type._info['qos_specs_id'] = qos_spec and qos_spec.id
+        self.addCleanup(lambda: [t._info.pop('qos_specs_id')
+                                 for t in volume_types])
+
+        cinderclient = mock_cinderclient.return_value
+        cinderclient.volume_types.list.return_value = volume_types
+        cinderclient.qos_specs.list.return_value = qos_specs
+
+        vol_types = \
+            api.cinder.volume_type_list_with_qos_associations(self.request)
+
+        self.assertEqual([qos_specs[1].name, "", qos_specs[0].name],
+                         [t.associated_qos_spec for t in vol_types])
+        cinderclient.qos_specs.list.assert_called_once_with()
+        cinderclient.qos_specs.get_associations.assert_not_called()
+
     @mock.patch.object(api.cinder, 'cinderclient')
     def test_absolute_limits_with_negative_values(self, mock_cinderclient):
         values = {"maxTotalVolumes": -1, "totalVolumesUsed": -1}
@@ -16,13 +16,20 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import functools
+
 from django.conf import settings
+from django.core.cache import caches
+from django.core.files.uploadedfile import TemporaryUploadedFile
 from django.test.utils import override_settings
+import futurist
 import mock
 
+from horizon import exceptions
 from openstack_dashboard import api
 from openstack_dashboard.api import base
 from openstack_dashboard.test import helpers as test
+from openstack_dashboard.utils import futurist_utils
 
 
 class GlanceApiTests(test.APIMockTestCase):
@@ -270,6 +277,81 @@ class GlanceApiTests(test.APIMockTestCase):
         self.assertEqual(len(list(images_iter)),
                          len(api_images) - len(expected_images) - 1)
 
+    def _list_images_after(self, api_images, marker=None, **kwargs):
+        ids = [image.id for image in api_images]
+        start = ids.index(marker) + 1 if marker else 0
+        if kwargs['sort_dir'] == 'asc':
+            return iter(api_images[:start - 1][::-1])
+        return iter(api_images[start:])
+
+    @override_settings(API_RESULT_PAGE_SIZE=2,
+                       OPENSTACK_API_CACHE={'enabled': True})
+    @mock.patch.object(futurist_utils, 'get_executor',
+                       return_value=futurist.SynchronousExecutor())
+    @mock.patch.object(api.glance, 'glanceclient')
+    def test_image_list_detailed_cursor_cache(self, mock_glanceclient,
+                                              mock_executor):
+        caches['default'].clear()
+        api_images = self.images_api.list()
+        ids = [image.id for image in api_images]
+        mock_images = mock_glanceclient.return_value.images
+        mock_images.resource_class = type(api_images[0])
+        mock_images_list = mock_images.list
+        mock_images_list.side_effect = functools.partial(
+            self._list_images_after, api_images)
+
+        images, has_more, has_prev = api.glance.image_list_detailed(
+            self.request, paginate=True)
+        self.assertEqual(ids[:2], [image.id for image in images])
+        # The second page was loaded in the background.
+        self.assertEqual(2, mock_images_list.call_count)
+        self.assertIsNone(mock_images_list.call_args_list[0][1].get('marker'))
+        self.assertEqual(ids[1], mock_images_list.call_args[1]['marker'])
+
+        images, has_more, has_prev = api.glance.image_list_detailed(
+            self.request, marker=ids[1], paginate=True)
+        self.assertEqual(ids[2:4], [image.id for image in images])
+        self.assertTrue(has_more)
+        self.assertTrue(has_prev)
+        # Only the third page is loaded.
+        self.assertEqual(3, mock_images_list.call_count)
+        self.assertEqual(ids[3], mock_images_list.call_args[1]['marker'])
+
+        # Going back does not send a reversed query to Glance.
+        images, has_more, has_prev = api.glance.image_list_detailed(
+            self.request, marker=ids[2], paginate=True, reversed_order=True)
+        self.assertEqual(ids[:2], [image.id for image in images])
+        self.assertTrue(has_more)
+        self.assertFalse(has_prev)
+        self.assertEqual(3, mock_images_list.call_count)
+
+    @override_settings(API_RESULT_PAGE_SIZE=2,
+                       OPENSTACK_API_CACHE={'enabled': True})
+    @mock.patch.object(futurist_utils, 'get_executor')
+    @mock.patch.object(api.glance, 'glanceclient')
+    def test_image_list_detailed_cursor_cache_reversed(self,
+                                                       mock_glanceclient,
+                                                       mock_executor):
+        caches['default'].clear()
+        api_images = self.images_api.list()
+        ids = [image.id for image in api_images]
+        mock_images = mock_glanceclient.return_value.images
+        mock_images.resource_class = type(api_images[0])
+        mock_images_list = mock_images.list
+        mock_images_list.side_effect = functools.partial(
+            self._list_images_after, api_images)
+
+        # The pages before the marker are unknown, Glance is asked for them.
+        for i in range(2):
+            images, has_more, has_prev = api.glance.image_list_detailed(
+                self.request, marker=ids[4], paginate=True,
+                reversed_order=True, sort_key='id')
+            self.assertEqual(set(ids[2:4]), set(image.id for image in images))
+        mock_images_list.assert_called_once_with(
+            page_size=3, limit=1000, filters={}, marker=ids[4],
+            sort_dir='asc', sort_key='id')
+        mock_executor.assert_not_called()
+
     @mock.patch.object(api.glance, 'glanceclient')
     def test_get_image_empty_name(self, mock_glanceclient):
         glanceclient = mock_glanceclient.return_value
@@ -367,6 +449,131 @@ class GlanceApiTests(test.APIMockTestCase):
     def test_image_create_v2_external_upload(self):
         self._test_image_create_external_upload()
 
+    def _uploaded_file(self, content=b'image data'):
+        data = TemporaryUploadedFile('image.iso', 'application/octet-stream',
+                                     len(content), None)
+        data.write(content)
+        data.seek(0)
+        return data
+
+    def _create_with_upload(self, mock_glanceclient, data):
+        glanceclient = mock_glanceclient.return_value
+        glanceclient.images.create.return_value = self.images.first()
+        jobs = []
+        with mock.patch.object(api.glance.upload_jobs, 'submit',
+                               side_effect=jobs.append):
+            api.glance.image_create(self.request, name='image', data=data)
+        self.assertEqual(1, len(jobs))
+        return jobs[0]
+
+    @mock.patch.object(api.glance, 'glanceclient')
+    def test_image_create_upload_job(self, mock_glanceclient):
+        caches['default'].clear()
+        data = self._uploaded_file()
+        images = mock_glanceclient.return_value.images
+        uploaded = []
+        images.upload.side_effect = (
+            lambda image_id, job: uploaded.append(job.read(4) + job.read()))
+
+        job = self._create_with_upload(mock_glanceclient, data)
+        image_id = self.images.first().id
+        self.assertEqual('queued', api.glance.image_upload_get(
+            self.request, image_id)['status'])
+        # Django deletes the temporary file at the end of the request.
+        data.close()
+        job.run()
+
+        self.assertEqual([b'image data'], uploaded)
+        self.assertTrue(job.data.closed)
+        self.assertEqual({'image_id': image_id,
+                          'project_id': self.request.user.tenant_id,
+                          'status': 'succeeded',
+                          'size': 10,
+                          'transferred': 10,
+                          'error': None},
+                         api.glance.image_upload_get(self.request, image_id))
+
+    @mock.patch.object(api.glance, 'glanceclient')
+    def test_image_create_upload_job_failure(self, mock_glanceclient):
+        caches['default'].clear()
+        images = mock_glanceclient.return_value.images
+        images.upload.side_effect = self.exceptions.glance
+
+        job = self._create_with_upload(mock_glanceclient,
+                                       self._uploaded_file())
+        job.run()
+
+        state = api.glance.image_upload_get(self.request,
+                                            self.images.first().id)
+        self.assertEqual('failed', state['status'])
+        self.assertEqual(str(self.exceptions.glance), state['error'])
+        self.assertTrue(job.data.closed)
+
+    @override_settings(OPENSTACK_API_VERSIONS={'image': 1})
+    @mock.patch.object(api.glance, 'glanceclient')
+    def test_image_create_upload_job_v1(self, mock_glanceclient):
+        job = self._create_with_upload(mock_glanceclient,
+                                       self._uploaded_file())
+        job.run()
+
+        images = mock_glanceclient.return_value.images
+        images.update.assert_called_once_with(self.images.first().id,
+                                              data=job, purge_props=False)
+
+    def test_image_upload_get_other_project(self):
+        caches['default'].clear()
+        api.glance.ImageUploadJob(self.request, 'image-id', None)
+        self.assertIsNotNone(
+            api.glance.image_upload_get(self.request, 'image-id'))
+        self.request.user.tenant_id = 'other-project'
+        self.assertIsNone(
+            api.glance.image_upload_get(self.request, 'image-id'))
+
+    @override_settings(HORIZON_IMAGES_UPLOAD_JOBS={'max_workers': 1,
+                                                   'max_queued': 1})
+    @mock.patch.object(api.glance, 'glanceclient')
+    def test_image_create_upload_jobs_limit(self, mock_glanceclient):
+        manager = api.glance.ImageUploadJobManager()
+        manager.reserve()
+        manager.reserve()
+        with mock.patch.object(api.glance, 'upload_jobs', manager):
+            self.assertRaises(exceptions.NotAvailable,
+                              api.glance.image_create, self.request,
+                              name='image', data=self._uploaded_file())
+        mock_glanceclient.return_value.images.create.assert_not_called()
+
+        manager.release()
+        manager.reserve()
+
+    @mock.patch.object(api.glance, 'glanceclient')
+    def test_image_create_upload_jobs_released(self, mock_glanceclient):
+        manager = api.glance.ImageUploadJobManager()
+        job = mock.Mock()
+        manager.reserve()
+        manager.submit(job).result()
+        job.run.assert_called_once_with()
+        self.assertEqual(0, manager._jobs)
+
+        mock_glanceclient.return_value.images.create.side_effect = (
+            self.exceptions.glance)
+        with mock.patch.object(api.glance, 'upload_jobs', manager):
+            self.assertRaises(type(self.exceptions.glance),
+                              api.glance.image_create, self.request,
+                              name='image', data=self._uploaded_file())
+        self.assertEqual(0, manager._jobs)
+
+    @mock.patch.object(api.glance, 'api_cache')
+    @mock.patch.object(api.glance, 'glanceclient')
+    def test_image_create_upload_jobs_released_after_create(
+            self, mock_glanceclient, mock_api_cache):
+        manager = api.glance.ImageUploadJobManager()
+        mock_api_cache.invalidate.side_effect = ValueError
+        with mock.patch.object(api.glance, 'upload_jobs', manager):
+            self.assertRaises(ValueError, api.glance.image_create,
+                              self.request, name='image',
+                              data=self._uploaded_file())
+        self.assertEqual(0, manager._jobs)
+
     @override_settings(OPENSTACK_API_VERSIONS={'image': 1})
     def test_create_image_metadata_docker_v1(self):
         form_data = {
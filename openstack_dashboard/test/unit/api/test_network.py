@@ -17,6 +17,8 @@ import collections
 import mock
 import netaddr
 
+from django.core.cache import caches
+from django import http
 from django.test.utils import override_settings
 
 from openstack_dashboard import api
@@ -142,3 +144,56 @@ class NetworkApiNeutronTests(test.APIMockTestCase):
     @override_settings(OPENSTACK_NEUTRON_NETWORK={'enable_router': False})
     def test_servers_update_addresses_router_disabled(self):
         self._test_servers_update_addresses(router_enabled=False)
+
+    @override_settings(OPENSTACK_NEUTRON_NETWORK={'enable_router': False},
+                       OPENSTACK_INSTANCE_RETRIEVE_IP_ADDRESSES='incremental',
+                       OPENSTACK_API_CACHE={'enabled': True})
+    def test_servers_update_addresses_incremental(self):
+        caches['default'].clear()
+        servers = self.servers.list()
+        server_ports = [p for p in self.api_ports.list()
+                        if p['device_id'] == servers[0].id]
+        server_networks = [net for net in self.api_networks.list()
+                           if net['id'] == server_ports[0]['network_id']]
+        self.qclient.list_ports.return_value = {'ports': server_ports}
+        self.qclient.list_networks.return_value = {'networks':
+                                                   server_networks}
+
+        api.network.servers_update_addresses(self.request, servers)
+        self._check_server_address(servers[0], no_fip_expected=True)
+        self.qclient.list_ports.assert_called_once_with(
+            device_id=tuple(server.id for server in servers))
+
+        # Nothing changed, so the addresses come from the cache.
+        self.qclient.list_ports.reset_mock()
+        for server in servers:
+            server.addresses = {}
+        api.network.servers_update_addresses(self.request, servers)
+        self._check_server_address(servers[0], no_fip_expected=True)
+        self.qclient.list_ports.assert_not_called()
+
+        # Only the updated server is retrieved from neutron.
+        servers[0].updated = '2018-01-01T00:00:00Z'
+        api.network.servers_update_addresses(self.request, servers)
+        self._check_server_address(servers[0], no_fip_expected=True)
+        self.qclient.list_ports.assert_called_once_with(
+            device_id=(servers[0].id,))
+
+    @override_settings(OPENSTACK_NEUTRON_NETWORK={'enable_router': False},
+                       OPENSTACK_INSTANCE_RETRIEVE_IP_ADDRESSES='incremental',
+                       OPENSTACK_API_CACHE={'enabled': True})
+    def test_servers_update_addresses_incremental_invalidated(self):
+        caches['default'].clear()
+        servers = self.servers.list()
+        self.qclient.list_ports.return_value = {'ports': []}
+        self.qclient.list_networks.return_value = {'networks': []}
+
+        api.network.servers_update_addresses(self.request, servers)
+        api.neutron.port_delete(self.request, self.ports.first().id)
+        # port_list is also memoized per request.
+        request = http.HttpRequest()
+        request.user = self.request.user
+        request.session = self.request.session
+        api.network.servers_update_addresses(request, servers)
+
+        self.assertEqual(2, self.qclient.list_ports.call_count)
@@ -1085,6 +1085,38 @@ class NeutronApiTests(test.APIMockTestCase):
             expected_calls.append(mock.call(id=tuple(port_ids[i:i + 4])))
         neutronclient.list_ports.assert_has_calls(expected_calls)
 
+    # URI_LEN_RESERVED plus room for four "id=<UUID>&" filters.
+    @override_settings(OPENSTACK_NEUTRON_MAX_URI_LENGTH=512 + 4 * 40)
+    @mock.patch.object(api.neutron, 'neutronclient')
+    def test_list_resources_with_long_filters_precomputed(
+            self, mock_neutronclient):
+        ports = [{'id': uuidutils.generate_uuid(),
+                  'name': 'port%s' % i,
+                  'admin_state_up': True}
+                 for i in range(10)]
+        port_ids = [port['id'] for port in ports]
+
+        ports_by_id = dict((p['id'], p) for p in ports)
+
+        def list_ports(id):
+            return {'ports': [ports_by_id[port_id] for port_id in id]}
+
+        neutronclient = mock_neutronclient.return_value
+        neutronclient.list_ports.side_effect = list_ports
+
+        ret_val = api.neutron.list_resources_with_long_filters(
+            api.neutron.port_list, 'id', frozenset(port_ids),
+            request=self.request)
+
+        # The chunks are fetched in parallel but merged in the order of
+        # the filter values and the oversized request is never sent.
+        expected_ids = list(frozenset(port_ids))
+        self.assertEqual(expected_ids, [p.id for p in ret_val])
+        self.assertEqual(3, neutronclient.list_ports.call_count)
+        for i in range(0, 10, 4):
+            neutronclient.list_ports.assert_any_call(
+                id=tuple(expected_ids[i:i + 4]))
+
     @mock.patch.object(api.neutron, 'neutronclient')
     def test_qos_policies_list(self, mock_neutronclient):
         exp_policies = self.qos_policies.list()
@@ -0,0 +1,133 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import uuid
+
+from django.test.utils import override_settings
+
+import mock
+import requests
+from requests import adapters
+
+from openstack_dashboard import api
+from openstack_dashboard.api import session_pool
+from openstack_dashboard.test import helpers as test
+
+
+CLIENT_POOL_ENABLED = {'enabled': True}
+
+
+class CookieSettingAdapter(adapters.BaseAdapter):
+    """Records the cookies sent and sets a cookie in every response."""
+
+    def __init__(self):
+        super(CookieSettingAdapter, self).__init__()
+        self.sent_cookies = []
+
+    def send(self, request, **kwargs):
+        self.sent_cookies.append(request.headers.get('Cookie'))
+        set_cookies = ['session=%s; Path=/' % request.headers['X-Auth-Token']]
+        headers = mock.Mock()
+        headers.get_all.side_effect = (
+            lambda name, default=None:
+                set_cookies if name == 'Set-Cookie' else default)
+        headers.getheaders.side_effect = (
+            lambda name: set_cookies if name == 'Set-Cookie' else [])
+        response = requests.Response()
+        response.status_code = 200
+        response._content = b''
+        response.request = request
+        response.url = request.url
+        response.raw = mock.Mock()
+        response.raw._original_response.msg = headers
+        return response
+
+    def close(self):
+        pass
+
+
+class SessionPoolTests(test.TestCase):
+
+    def setUp(self):
+        super(SessionPoolTests, self).setUp()
+        session_pool.reset()
+        self.addCleanup(session_pool.reset)
+
+    def test_transport_shared_per_host(self):
+        first = session_pool.get_transport('https://nova:8774/v2.1', True)
+        second = session_pool.get_transport('https://nova:8774/v2.1/abc',
+                                            True)
+        self.assertIs(first, second)
+
+    def test_transport_per_host_and_tls_settings(self):
+        nova = session_pool.get_transport('https://nova:8774/v2.1', True)
+        self.assertIsNot(
+            nova, session_pool.get_transport('https://glance:9292', True))
+        self.assertIsNot(
+            nova, session_pool.get_transport('https://nova:8774/v2.1',
+                                             False))
+
+    @mock.patch.object(session_pool.os, 'getpid')
+    def test_transport_not_shared_after_fork(self, mock_getpid):
+        mock_getpid.return_value = 1
+        parent = session_pool.get_transport('https://nova:8774', True)
+        mock_getpid.return_value = 2
+        child = session_pool.get_transport('https://nova:8774', True)
+        self.assertIsNot(parent, child)
+
+    def test_transport_does_not_keep_cookies(self):
+        adapter = CookieSettingAdapter()
+        session_pool.get_transport('https://nova:8774',
+                                   True).mount('https://', adapter)
+        for token in ('user-a', 'user-b'):
+            session_pool.get_session(token, 'https://nova:8774').get(
+                'https://nova:8774/servers')
+        self.assertEqual([None, None], adapter.sent_cookies)
+
+    @override_settings(OPENSTACK_SSL_NO_VERIFY=True)
+    def test_get_session(self):
+        session = session_pool.get_session('token', 'https://nova:8774/v2.1')
+        other = session_pool.get_session('other', 'https://nova:8774/v2.1')
+        self.assertIsNot(session, other)
+        self.assertIs(session.session, other.session)
+        self.assertFalse(session.verify)
+        self.assertEqual({'X-Auth-Token': 'token'},
+                         session.get_auth_headers())
+        self.assertEqual('https://nova:8774/v2.1', session.get_endpoint())
+
+    @override_settings(OPENSTACK_SSL_CACERT='/etc/ssl/ca.pem')
+    def test_get_verify_cacert(self):
+        self.assertEqual('/etc/ssl/ca.pem', session_pool.get_verify())
+
+    @override_settings(OPENSTACK_CLIENT_POOL=CLIENT_POOL_ENABLED)
+    def test_clients_use_pooled_sessions(self):
+        # The nova and neutron clients are memoized per token, use a token
+        # no other test built clients for.
+        self.request.user.token = mock.Mock(id=uuid.uuid4().hex,
+                                            project={'domain_id': 'default'})
+        clients = (
+            api.nova.novaclient(self.request).client,
+            api.neutron.neutronclient(self.request).httpclient,
+            api.glance.glanceclient(self.request).http_client,
+        )
+        for client in clients:
+            self.assertEqual(self.request.user.token.id,
+                             client.session.auth.token)
+            self.assertEqual(client.endpoint_override,
+                             client.session.auth.endpoint)
+        self.assertEqual(3, len(session_pool._transports))
+
+    def test_clients_without_pool(self):
+        api.nova.novaclient(self.request)
+        api.neutron.neutronclient(self.request)
+        api.glance.glanceclient(self.request)
+        self.assertEqual({}, session_pool._transports)
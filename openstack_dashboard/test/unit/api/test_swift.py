@@ -18,6 +18,11 @@
 
 from __future__ import absolute_import
 
+import json
+
+from django.core.cache import caches
+from django.test.utils import override_settings
+
 import mock
 
 from horizon import exceptions
@@ -142,7 +147,7 @@ class SwiftApiTests(test.APIMockTestCase):
 
         self.assertEqual(object.name, obj.name)
         swift_api.get_object.assert_called_once_with(
-            container.name, object.name, resp_chunk_size=None)
+            container.name, object.name, resp_chunk_size=None, headers=None)
 
     def test_swift_get_object_with_data_chunked(self, mock_swiftclient):
         container = self.containers.first()
@@ -156,7 +161,8 @@ class SwiftApiTests(test.APIMockTestCase):
 
         self.assertEqual(object.name, obj.name)
         swift_api.get_object.assert_called_once_with(
-            container.name, object.name, resp_chunk_size=api.swift.CHUNK_SIZE)
+            container.name, object.name, resp_chunk_size=api.swift.CHUNK_SIZE,
+            headers=None)
 
     def test_swift_get_object_without_data(self, mock_swiftclient):
         container = self.containers.first()
@@ -275,3 +281,214 @@ class SwiftApiTests(test.APIMockTestCase):
             mock.call(container.name, obj.name),
             mock.call(container.name, obj.name),
         ])
+
+    def _listing(self, count):
+        return [{'name': 'file-%04d.txt' % i, 'bytes': i}
+                for i in range(count)]
+
+    def test_swift_filter_objects(self, mock_swiftclient):
+        container = self.containers.first()
+        objects = [o._apidict for o in self.objects.list()]
+        swift_api = mock_swiftclient.return_value
+        swift_api.get_container.return_value = [{}, objects]
+
+        objs, more = api.swift.swift_filter_objects(self.request, 'TEST*two',
+                                                    container.name)
+
+        self.assertEqual([u'test_object_two\u6346'], [o.name for o in objs])
+        self.assertFalse(more)
+        swift_api.get_container.assert_called_once_with(
+            container.name,
+            prefix=None,
+            marker=None,
+            limit=api.swift.FILTER_PAGE_SIZE,
+            delimiter='/')
+
+    def test_swift_filter_objects_all_terms(self, mock_swiftclient):
+        container = self.containers.first()
+        objects = [o._apidict for o in self.objects.list()]
+        swift_api = mock_swiftclient.return_value
+        swift_api.get_container.return_value = [{}, objects]
+
+        objs, more = api.swift.swift_filter_objects(self.request,
+                                                    'object %',
+                                                    container.name)
+
+        self.assertEqual([u'test object%\u6346', u'test,object_three%\u6346'],
+                         [o.name for o in objs])
+
+    @override_settings(API_RESULT_LIMIT=1)
+    @mock.patch.object(api.swift, 'FILTER_PAGE_SIZE', 10)
+    def test_swift_filter_objects_pages(self, mock_swiftclient):
+        listing = self._listing(25)
+        swift_api = mock_swiftclient.return_value
+        swift_api.get_container.side_effect = [[{}, listing[:10]],
+                                               [{}, listing[10:20]],
+                                               [{}, listing[20:]]]
+
+        objs, more = api.swift.swift_filter_objects(self.request, '*1.txt',
+                                                    'container')
+
+        # The listing stops once more than a page of results is found.
+        self.assertEqual(['file-0001.txt'], [o.name for o in objs])
+        self.assertTrue(more)
+        self.assertEqual(2, swift_api.get_container.call_count)
+        swift_api.get_container.assert_called_with(
+            'container', prefix=None, marker='file-0009.txt', limit=10,
+            delimiter='/')
+
+    @override_settings(OPENSTACK_API_CACHE={'enabled': True})
+    def test_swift_filter_objects_name_index(self, mock_swiftclient):
+        caches['default'].clear()
+        listing = self._listing(5)
+        swift_api = mock_swiftclient.return_value
+        swift_api.get_container.return_value = [{}, listing]
+
+        objs, more = api.swift.swift_filter_objects(self.request, 'file',
+                                                    'container', limit=2)
+        self.assertEqual(2, len(objs))
+        self.assertTrue(more)
+        # A partial listing is not indexed.
+        objs, more = api.swift.swift_filter_objects(self.request, 'file-0004',
+                                                    'container')
+        self.assertEqual(2, swift_api.get_container.call_count)
+
+        objs, more = api.swift.swift_filter_objects(
+            self.request, 'file', 'container', marker='file-0002.txt')
+        self.assertEqual(['file-0003.txt', 'file-0004.txt'],
+                         [o.name for o in objs])
+        self.assertEqual(2, swift_api.get_container.call_count)
+
+        api.swift.swift_delete_object(self.request, 'container',
+                                      'file-0004.txt')
+        api.swift.swift_filter_objects(self.request, 'file', 'container')
+        self.assertEqual(3, swift_api.get_container.call_count)
+
+    def _consume_put(self, container, name, contents, **kwargs):
+        if not isinstance(contents, (bytes, str)):
+            contents = b''.join(contents)
+        self.uploaded[(container, name)] = (contents, kwargs)
+        return 'etag-%d' % len(self.uploaded)
+
+    def test_object_writer_streamed(self, mock_swiftclient):
+        self.uploaded = {}
+        swift_api = mock_swiftclient.return_value
+        swift_api.put_object.side_effect = self._consume_put
+
+        writer = api.swift.ObjectWriter(self.request, 'container', 'name',
+                                        orig_filename='file.txt')
+        writer.write(b'abc')
+        writer.write(b'def')
+        obj = writer.close()
+
+        self.assertEqual('name', obj.name)
+        self.assertEqual(6, obj.bytes)
+        self.assertEqual('etag-1', obj.etag)
+        contents, kwargs = self.uploaded[('container', 'name')]
+        self.assertEqual(b'abcdef', contents)
+        self.assertEqual({'X-Object-Meta-Orig-Filename': 'file.txt'},
+                         kwargs['headers'])
+        swift_api.put_container.assert_not_called()
+
+    @override_settings(SWIFT_STREAMING_UPLOAD={'slo_threshold': 5,
+                                               'max_parallel_segments': 2,
+                                               'max_workers': 3})
+    @mock.patch.object(api.swift, 'upload_workers',
+                       api.swift.UploadWorkerManager())
+    def test_object_writer_reserves_workers(self, mock_swiftclient):
+        self.uploaded = {}
+        mock_swiftclient.return_value.put_object.side_effect = \
+            self._consume_put
+
+        segmented = api.swift.ObjectWriter(self.request, 'container', 'a',
+                                           size_hint=10)
+        streamed = api.swift.ObjectWriter(self.request, 'container', 'b')
+        # The uploads are refused rather than queued once all the threads
+        # are reserved.
+        self.assertRaises(exceptions.NotAvailable, api.swift.ObjectWriter,
+                          self.request, 'container', 'c')
+
+        streamed.close()
+        api.swift.ObjectWriter(self.request, 'container', 'c').close()
+        segmented.abort()
+        self.assertEqual(0, api.swift.upload_workers._workers)
+
+    def test_object_writer_streamed_abort(self, mock_swiftclient):
+        self.uploaded = {}
+        swift_api = mock_swiftclient.return_value
+        swift_api.put_object.side_effect = self._consume_put
+
+        writer = api.swift.ObjectWriter(self.request, 'container', 'name')
+        writer.write(b'abc')
+        writer.abort()
+
+        self.assertEqual({}, self.uploaded)
+        self.assertRaises(IOError, writer._upload.result)
+
+    def test_object_writer_streamed_failure(self, mock_swiftclient):
+        swift_api = mock_swiftclient.return_value
+        swift_api.put_object.side_effect = self.exceptions.swift
+
+        writer = api.swift.ObjectWriter(self.request, 'container', 'name')
+        writer._upload.exception()
+        self.assertRaises(type(self.exceptions.swift),
+                          writer.write, b'abc')
+
+    @override_settings(SWIFT_STREAMING_UPLOAD={'slo_threshold': 5,
+                                               'segment_size': 4,
+                                               'max_parallel_segments': 2})
+    def test_object_writer_segmented(self, mock_swiftclient):
+        self.uploaded = {}
+        swift_api = mock_swiftclient.return_value
+        swift_api.put_object.side_effect = self._consume_put
+
+        writer = api.swift.ObjectWriter(self.request, 'container', 'name',
+                                        size_hint=10)
+        for data in (b'abc', b'defgh', b'ij'):
+            writer.write(data)
+        obj = writer.close()
+
+        self.assertEqual(10, obj.bytes)
+        swift_api.put_container.assert_called_once_with('container_segments')
+        manifest, kwargs = self.uploaded.pop(('container', 'name'))
+        self.assertEqual('multipart-manifest=put', kwargs['query_string'])
+        manifest = json.loads(manifest)
+        self.assertEqual([4, 4, 2], [s['size_bytes'] for s in manifest])
+        segments = dict((name, contents) for (container, name), (contents, _)
+                        in self.uploaded.items())
+        self.assertEqual(b'abcdefghij', b''.join(
+            segments[s['path'].split('/', 2)[2]] for s in manifest))
+        self.assertTrue(all(s['path'].startswith('/container_segments/name/')
+                            for s in manifest))
+
+    @override_settings(SWIFT_STREAMING_UPLOAD={'slo_threshold': 5,
+                                               'segment_size': 4})
+    def test_object_writer_segmented_small_object(self, mock_swiftclient):
+        self.uploaded = {}
+        swift_api = mock_swiftclient.return_value
+        swift_api.put_object.side_effect = self._consume_put
+
+        writer = api.swift.ObjectWriter(self.request, 'container', 'name',
+                                        size_hint=10)
+        writer.write(b'abc')
+        writer.close()
+
+        self.assertEqual({('container', 'name')}, set(self.uploaded))
+        self.assertEqual(b'abc', self.uploaded[('container', 'name')][0])
+
+    @override_settings(SWIFT_STREAMING_UPLOAD={'slo_threshold': 5,
+                                               'segment_size': 4})
+    def test_object_writer_segmented_abort(self, mock_swiftclient):
+        self.uploaded = {}
+        swift_api = mock_swiftclient.return_value
+        swift_api.put_object.side_effect = self._consume_put
+
+        writer = api.swift.ObjectWriter(self.request, 'container', 'name',
+                                        size_hint=10)
+        writer.write(b'abcdefgh')
+        writer.abort()
+
+        self.assertEqual(2, swift_api.delete_object.call_count)
+        for (container, name), call in zip(
+                sorted(self.uploaded), swift_api.delete_object.call_args_list):
+            self.assertEqual(mock.call(container, name), call)
@@ -0,0 +1,71 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+from django.template import Context
+from django.template import Template
+from django.test.utils import override_settings
+import mock
+import six
+
+from horizon.templatetags import angular
+from openstack_dashboard.test import helpers as test
+
+
+TEMPLATES = [('/static/app/a.html', '<p class="a">\n</p>')]
+
+
+class AngularTemplatesBundleTest(test.TestCase):
+
+    def setUp(self):
+        super(AngularTemplatesBundleTest, self).setUp()
+        angular._bundles.clear()
+        self.addCleanup(angular._bundles.clear)
+        self.mock_templates = mock.patch.object(
+            angular, '_get_angular_templates', return_value=TEMPLATES).start()
+        self.storage = mock.patch.object(angular.storage,
+                                         'default_storage').start()
+        self.storage.exists.return_value = False
+        self.storage.save.side_effect = lambda name, content: name
+        self.storage.url.side_effect = lambda name: '/static/' + name
+
+    def _render(self, theme='default'):
+        template = Template('{% load angular_templates_bundle from angular %}'
+                            '{% angular_templates_bundle %}')
+        return template.render(Context({'THEME': theme,
+                                        'STATIC_URL': '/static/'}))
+
+    @override_settings(NG_TEMPLATE_CACHE_AGE=3600)
+    def test_bundle(self):
+        url = self._render()
+        six.assertRegex(self, url, r'^/static/.*/angular/templates-default'
+                                   r'\.[0-9a-f]{12}\.js$')
+        content = self.storage.save.call_args[0][1].read().decode('utf-8')
+        self.assertIn('"/static/app/a.html"', content)
+        self.assertIn(r'"<p class=\"a\">\n</p>"', content)
+
+        # The bundle is built once per theme.
+        self.assertEqual(url, self._render())
+        self.assertNotEqual(url, self._render(theme='material'))
+        self.assertEqual(2, self.mock_templates.call_count)
+        self.assertEqual(2, self.storage.save.call_count)
+
+    @override_settings(NG_TEMPLATE_CACHE_AGE=3600)
+    def test_existing_bundle_not_written(self):
+        self.storage.exists.return_value = True
+        self._render()
+        self.assertFalse(self.storage.save.called)
+
+    @override_settings(NG_TEMPLATE_CACHE_AGE=0)
+    def test_bundle_built_on_each_call_without_cache_age(self):
+        self._render()
+        self._render()
+        self.assertEqual(2, self.mock_templates.call_count)
@@ -0,0 +1,131 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+
+from django.core.exceptions import MiddlewareNotUsed
+from django import http
+from django.test.utils import override_settings
+import mock
+
+from horizon.utils import memoized
+from openstack_dashboard.test import helpers as test
+from openstack_dashboard.utils import api_ledger
+
+
+LEDGER_ENABLED = {'enabled': True, 'slow_threshold': 0}
+
+
+@memoized.memoized
+def flavor_list(request):
+    return ['m1.tiny', 'm1.small']
+
+
+def server_get(request, instance_id):
+    return {'id': instance_id, 'flavor': flavor_list(request)[0]}
+
+
+def server_delete(request, instance_id):
+    raise Exception('Conflict')
+
+
+flavor_list.__module__ = 'openstack_dashboard.api.nova'
+server_get.__module__ = 'openstack_dashboard.api.nova'
+flavor_list = api_ledger.record(flavor_list)
+server_get = api_ledger.record(server_get)
+server_delete = api_ledger.record(server_delete)
+
+
+class APILedgerTests(test.TestCase):
+
+    def setUp(self):
+        super(APILedgerTests, self).setUp()
+        self.request._api_ledger = api_ledger.Ledger()
+
+    def test_record_without_ledger(self):
+        del self.request._api_ledger
+        self.assertEqual(['m1.tiny', 'm1.small'], flavor_list(self.request))
+
+    def test_record(self):
+        server_get(self.request, 'abc')
+        server_get(self.request, 'abc')
+        self.assertRaises(Exception, server_delete, self.request, 'abc')
+
+        calls = [(call['service'], call['name'], call['cached'],
+                  call['depth'], call['error'])
+                 for call in self.request._api_ledger.calls]
+        self.assertEqual([
+            ('nova', 'flavor_list', False, 1, False),
+            ('nova', 'server_get', False, 0, False),
+            ('nova', 'flavor_list', True, 1, False),
+            ('nova', 'server_get', False, 0, False),
+            (__name__, 'server_delete', False, 0, True),
+        ], calls)
+        self.assertEqual(2, self.request._api_ledger.calls[0]['size'])
+
+    def test_summary(self):
+        server_get(self.request, 'abc')
+        flavor_list(self.request)
+        self.request._policy_check_counts = {'checks': 3}
+
+        summary = self.request._api_ledger.summary(self.request)
+
+        self.assertEqual(3, summary['calls'])
+        self.assertEqual(1, summary['cached'])
+        self.assertEqual(0, summary['errors'])
+        self.assertEqual({'calls': 3, 'cached': 1},
+                         dict((key, value) for key, value
+                              in summary['services']['nova'].items()
+                              if key != 'duration'))
+        self.assertEqual({'checks': 3}, summary['policy'])
+
+
+class APILedgerMiddlewareTests(test.TestCase):
+
+    def _get_response(self, request):
+        flavor_list(request)
+        return http.HttpResponse('<html><body>Flavors</body></html>')
+
+    def test_disabled(self):
+        self.assertRaises(MiddlewareNotUsed,
+                          api_ledger.APICallLedgerMiddleware,
+                          self._get_response)
+
+    @override_settings(OPENSTACK_API_LEDGER=LEDGER_ENABLED)
+    @mock.patch.object(api_ledger, 'LOG')
+    def test_response(self, mock_log):
+        middleware = api_ledger.APICallLedgerMiddleware(self._get_response)
+
+        response = middleware(self.request)
+
+        self.assertTrue(response[api_ledger.HEADER].startswith(
+            'calls=1; cached=0; time='))
+        self.assertIn('; nova=1/', response[api_ledger.HEADER])
+        record = json.loads(mock_log.info.call_args[0][0])
+        self.assertEqual(1, record['calls'])
+        self.assertEqual(200, record['status'])
+        self.assertEqual(self.request.path, record['path'])
+        self.assertNotIn(b'api-call-ledger', response.content)
+
+    @override_settings(OPENSTACK_API_LEDGER={'enabled': True},
+                       DEBUG=True)
+    @mock.patch.object(api_ledger, 'LOG')
+    def test_debug_footer_fast_request(self, mock_log):
+        middleware = api_ledger.APICallLedgerMiddleware(self._get_response)
+
+        response = middleware(self.request)
+
+        self.assertIn(b'<pre class="api-call-ledger">calls=1;',
+                      response.content)
+        self.assertIn(b'nova.flavor_list ', response.content)
+        self.assertTrue(response.content.endswith(b'</body></html>'))
+        mock_log.info.assert_not_called()
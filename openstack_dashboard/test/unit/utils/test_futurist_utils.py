@@ -10,8 +10,12 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from concurrent import futures
+import threading
 import unittest
 
+from django import test
+
 from openstack_dashboard.utils import futurist_utils
 
 
@@ -58,3 +62,77 @@ class FuturistUtilsTests(unittest.TestCase):
             (func2, [], {'a': 10, 'b': 20}),
             func3)
         self.assertEqual(ret, (5, 30, 3))
+
+    def test_call_functions_parallel_raises_first_exception(self):
+        def func1():
+            raise ValueError('func1')
+
+        def func2():
+            raise KeyError('func2')
+
+        self.assertRaises(ValueError,
+                          futurist_utils.call_functions_parallel,
+                          func1, func2)
+
+    def test_call_functions_parallel_timeout(self):
+        event = threading.Event()
+
+        def func1():
+            event.wait(5)
+
+        try:
+            self.assertRaises(futures.TimeoutError,
+                              futurist_utils.call_functions_parallel,
+                              func1, timeout=0.01)
+        finally:
+            event.set()
+
+    def test_call_functions_parallel_cancel_on_failure(self):
+        event = threading.Event()
+        finished = []
+
+        def func1():
+            event.wait(5)
+            finished.append('func1')
+
+        def func2():
+            raise ValueError()
+
+        try:
+            self.assertRaises(ValueError,
+                              futurist_utils.call_functions_parallel,
+                              func1, func2, cancel_on_failure=True)
+            # The failure is reported without waiting for func1.
+            self.assertEqual([], finished)
+        finally:
+            event.set()
+
+    def test_call_functions_parallel_nested(self):
+        def inner():
+            return threading.current_thread()
+
+        def outer():
+            return (threading.current_thread(),
+                    futurist_utils.call_functions_parallel(inner, inner))
+
+        with test.override_settings(PARALLEL_CALL_OPTIONS={'max_workers': 1}):
+            futurist_utils.shutdown_executor()
+            try:
+                (outer_thread, inner_threads), = \
+                    futurist_utils.call_functions_parallel(outer)
+            finally:
+                futurist_utils.shutdown_executor()
+        self.assertEqual((outer_thread, outer_thread), inner_threads)
+
+    def test_call_functions_parallel_unknown_option(self):
+        self.assertRaises(TypeError,
+                          futurist_utils.call_functions_parallel,
+                          lambda: 1, foo=1)
+
+    def test_statistics(self):
+        futurist_utils.reset_statistics()
+        futurist_utils.call_functions_parallel(lambda: 1, lambda: 2)
+        stats = futurist_utils.get_statistics()
+        self.assertEqual(2, stats['executed'])
+        self.assertEqual(0, stats['failures'])
+        self.assertGreaterEqual(stats['max_queue_wait'], 0)
@@ -0,0 +1,66 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import threading
+import unittest
+
+from openstack_dashboard.utils import identity
+
+
+class RoleAssignmentTests(unittest.TestCase):
+
+    def test_diff_role_assignments(self):
+        current = {'u1': ['r1', 'r2'], 'u2': ['r1'], 'u3': ['r1']}
+        desired = {'u1': ['r2', 'r3'], 'u2': [], 'u4': ['r1']}
+        to_grant, to_revoke = identity.diff_role_assignments(current, desired)
+        self.assertEqual([('u1', 'r3'), ('u4', 'r1')], to_grant)
+        # u3 is not part of the desired state and keeps its roles.
+        self.assertEqual([('u1', 'r1'), ('u2', 'r1')], to_revoke)
+
+    def test_diff_role_assignments_unchanged(self):
+        current = {'u1': ['r1', 'r2']}
+        self.assertEqual(([], []),
+                         identity.diff_role_assignments(current, current))
+
+    def test_apply_role_assignments(self):
+        granted = []
+        revoked = []
+        lock = threading.Lock()
+
+        def grant(actor_id, role_id):
+            with lock:
+                granted.append((actor_id, role_id))
+
+        def revoke(actor_id, role_id):
+            with lock:
+                revoked.append((actor_id, role_id))
+
+        to_grant = [('u%d' % i, 'r1') for i in range(20)]
+        failed = identity.apply_role_assignments(grant, revoke, to_grant,
+                                                 [('u1', 'r2')])
+        self.assertEqual([], failed)
+        self.assertEqual(sorted(to_grant), sorted(granted))
+        self.assertEqual([('u1', 'r2')], revoked)
+
+    def test_apply_role_assignments_partial_failure(self):
+        error = Exception('Forbidden')
+        granted = []
+
+        def grant(actor_id, role_id):
+            if actor_id == 'u2':
+                raise error
+            granted.append((actor_id, role_id))
+
+        failed = identity.apply_role_assignments(
+            grant, None, [('u1', 'r1'), ('u2', 'r1'), ('u3', 'r1')], [])
+        self.assertEqual([('u2', 'r1', error)], failed)
+        self.assertEqual([('u1', 'r1'), ('u3', 'r1')], sorted(granted))
@@ -0,0 +1,233 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Per-request ledger of the API calls made to the OpenStack services.
+
+The API wrappers of ``openstack_dashboard.api`` decorated with
+``profiler.trace`` are recorded in a ledger attached to the request by
+:class:`APICallLedgerMiddleware`: the service, the duration of the call,
+whether the result came from ``memoized`` and the number of items returned.
+Unlike OSProfiler no collector is needed; the ledger is reported with each
+response through a header, a structured log line for the slow requests and,
+in debug mode, a footer appended to the HTML pages.
+
+The ledger is disabled by default and is configured with the
+``OPENSTACK_API_LEDGER`` setting.
+"""
+
+import collections
+import functools
+import json
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils import html
+
+from horizon.utils import memoized
+
+
+LOG = logging.getLogger('openstack_dashboard.api_ledger')
+
+DEFAULT_OPTIONS = {
+    'enabled': False,
+    'header': True,
+    'slow_threshold': 1.0,
+    'debug_footer': True,
+}
+
+HEADER = 'X-OpenStack-API-Calls'
+API_MODULE_PREFIX = 'openstack_dashboard.api.'
+
+_local = threading.local()
+
+
+def get_options():
+    options = dict(DEFAULT_OPTIONS)
+    options.update(getattr(settings, 'OPENSTACK_API_LEDGER', {}))
+    return options
+
+
+def get_ledger(request):
+    """Return the ledger of the request or None if it is not recorded."""
+    ledger = getattr(request, '_api_ledger', None)
+    if isinstance(ledger, Ledger):
+        return ledger
+    return None
+
+
+class Ledger(object):
+    """The API calls made while processing a request."""
+
+    def __init__(self):
+        self.started = time.time()
+        # The calls can be recorded by the threads of the parallel calls.
+        self._lock = threading.Lock()
+        self.calls = []
+
+    def add(self, call):
+        with self._lock:
+            self.calls.append(call)
+
+    def summary(self, request=None):
+        with self._lock:
+            calls = list(self.calls)
+        services = collections.OrderedDict()
+        for call in calls:
+            service = services.setdefault(call['service'], {
+                'calls': 0, 'cached': 0, 'duration': 0.0})
+            service['calls'] += 1
+            if call['cached']:
+                service['cached'] += 1
+            # Nested calls are already part of the time of their caller.
+            if not call['depth']:
+                service['duration'] += call['duration']
+        summary = {
+            'calls': len(calls),
+            'cached': len([call for call in calls if call['cached']]),
+            'errors': len([call for call in calls if call['error']]),
+            'duration': time.time() - self.started,
+            'api_duration': sum(service['duration']
+                                for service in services.values()),
+            'services': services,
+        }
+        counts = getattr(request, '_policy_check_counts', None)
+        if isinstance(counts, dict):
+            summary['policy'] = dict(counts)
+        return summary
+
+
+def _get_service(function):
+    module = function.__module__ or ''
+    if module.startswith(API_MODULE_PREFIX):
+        return module[len(API_MODULE_PREFIX):].split('.')[0]
+    return module
+
+
+def _get_request(args, kwargs):
+    request = kwargs.get('request', args[0] if args else None)
+    return request if hasattr(request, 'META') else None
+
+
+def _get_size(result):
+    if isinstance(result, (list, tuple, dict, set)):
+        return len(result)
+    return None
+
+
+def record(function):
+    """Decorator recording the calls of an API function in the ledger."""
+    service = _get_service(function)
+    name = function.__name__
+    is_memoized = getattr(function, 'memoized', False)
+
+    @functools.wraps(function)
+    def wrapped(*args, **kwargs):
+        ledger = get_ledger(_get_request(args, kwargs))
+        if ledger is None:
+            return function(*args, **kwargs)
+
+        depth = getattr(_local, 'depth', 0)
+        _local.depth = depth + 1
+        started = time.time()
+        result = None
+        error = True
+        try:
+            result = function(*args, **kwargs)
+            error = False
+            return result
+        finally:
+            _local.depth = depth
+            ledger.add({
+                'service': service,
+                'name': name,
+                'duration': time.time() - started,
+                'cached': is_memoized and memoized.last_call_was_cached(),
+                'size': _get_size(result),
+                'error': error,
+                'depth': depth,
+            })
+    return wrapped
+
+
+class APICallLedgerMiddleware(object):
+    """Middleware attaching an API call ledger to each request."""
+
+    def __init__(self, get_response):
+        self.options = get_options()
+        if not self.options['enabled']:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        ledger = Ledger()
+        request._api_ledger = ledger
+        response = self.get_response(request)
+        return self.process_response(request, response, ledger)
+
+    def process_response(self, request, response, ledger):
+        summary = ledger.summary(request)
+        if self.options['header']:
+            response[HEADER] = self._format_header(summary)
+        if summary['duration'] >= self.options['slow_threshold']:
+            LOG.info(json.dumps(self._get_log_record(request, response,
+                                                     summary)))
+        if self.options['debug_footer'] and settings.DEBUG:
+            self._add_footer(response, ledger, summary)
+        return response
+
+    def _format_header(self, summary):
+        services = ', '.join(
+            '%s=%d/%.3f' % (name, service['calls'], service['duration'])
+            for name, service in summary['services'].items())
+        header = 'calls=%d; cached=%d; time=%.3f' % (
+            summary['calls'], summary['cached'], summary['api_duration'])
+        if services:
+            header += '; ' + services
+        return header
+
+    def _get_log_record(self, request, response, summary):
+        user = getattr(request, 'user', None)
+        record = {
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'user_id': getattr(user, 'id', None),
+            'project_id': getattr(user, 'project_id', None),
+        }
+        record.update(summary)
+        return record
+
+    def _add_footer(self, response, ledger, summary):
+        if (response.streaming or
+                'text/html' not in response.get('Content-Type', '')):
+            return
+        content = response.content
+        index = content.rfind(b'</body>')
+        if index < 0:
+            return
+        lines = [self._format_header(summary)]
+        for call in ledger.calls:
+            line = '%(service)s.%(name)s %(duration).3fs' % call
+            if call['cached']:
+                line += ' cached'
+            if call['error']:
+                line += ' error'
+            lines.append(line)
+        footer = ('<pre class="api-call-ledger">%s</pre>'
+                  % html.escape('\n'.join(lines)))
+        response.content = (content[:index] + footer.encode('utf-8') +
+                            content[index:])
+        if response.has_header('Content-Length'):
+            response['Content-Length'] = str(len(response.content))
@@ -10,14 +10,140 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from concurrent import futures
 import functools
+import logging
+import os
+import threading
+import time
 
+from django.conf import settings
 import futurist
 
 
-def call_functions_parallel(*worker_defs):
+LOG = logging.getLogger(__name__)
+
+DEFAULT_OPTIONS = {
+    'max_workers': 10,
+    'timeout': None,
+}
+
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+_worker = threading.local()
+
+_statistics = {}
+_statistics_lock = threading.Lock()
+
+
+def get_options():
+    options = dict(DEFAULT_OPTIONS)
+    options.update(getattr(settings, 'PARALLEL_CALL_OPTIONS', {}))
+    return options
+
+
+def get_executor():
+    """Return the executor shared by all requests of this process.
+
+    The executor is created on first use. It is re-created in a child
+    process when the process forks after it has been created, because the
+    threads of the parent do not survive the fork.
+    """
+    global _executor, _executor_pid
+    pid = os.getpid()
+    if _executor is None or _executor_pid != pid:
+        with _executor_lock:
+            if _executor is None or _executor_pid != pid:
+                _executor = futurist.ThreadPoolExecutor(
+                    max_workers=get_options()['max_workers'])
+                _executor_pid = pid
+    return _executor
+
+
+def shutdown_executor(wait=True):
+    global _executor, _executor_pid
+    with _executor_lock:
+        if _executor is not None and _executor_pid == os.getpid():
+            _executor.shutdown(wait=wait)
+        _executor = None
+        _executor_pid = None
+
+
+def get_statistics():
+    """Return the metrics of the functions run by call_functions_parallel.
+
+    The times are in seconds. ``queue_wait`` is the time spent between the
+    submission of a function and the start of its execution.
+    """
+    with _statistics_lock:
+        return dict(_statistics)
+
+
+def reset_statistics():
+    with _statistics_lock:
+        _statistics.clear()
+        _statistics.update({
+            'executed': 0,
+            'failures': 0,
+            'cancelled': 0,
+            'queue_wait': 0.0,
+            'max_queue_wait': 0.0,
+            'runtime': 0.0,
+            'max_runtime': 0.0,
+        })
+
+
+reset_statistics()
+
+
+def _record(queue_wait, runtime, failed):
+    with _statistics_lock:
+        _statistics['executed'] += 1
+        if failed:
+            _statistics['failures'] += 1
+        _statistics['queue_wait'] += queue_wait
+        _statistics['max_queue_wait'] = max(_statistics['max_queue_wait'],
+                                            queue_wait)
+        _statistics['runtime'] += runtime
+        _statistics['max_runtime'] = max(_statistics['max_runtime'], runtime)
+
+
+def _run(func, submitted):
+    started = time.time()
+    _worker.active = True
+    failed = True
+    try:
+        result = func()
+        failed = False
+        return result
+    finally:
+        _worker.active = False
+        finished = time.time()
+        _record(started - submitted, finished - started, failed)
+        LOG.debug('Parallel call %(func)s waited %(wait).3fs and ran '
+                  '%(run).3fs', {'func': getattr(func, 'func', func),
+                                 'wait': started - submitted,
+                                 'run': finished - started})
+
+
+def _get_function(func_def):
+    if callable(func_def):
+        func_def = [func_def]
+    args = func_def[1] if len(func_def) > 1 else []
+    kwargs = func_def[2] if len(func_def) > 2 else {}
+    return functools.partial(func_def[0], *args, **kwargs)
+
+
+def call_functions_parallel(*worker_defs, **options):
     """Call specified functions in parallel.
 
+    The functions are run by an executor shared by all requests of the
+    process, whose size is bounded by ``max_workers`` of the
+    ``PARALLEL_CALL_OPTIONS`` setting. When called from a function which is
+    itself run by the executor, the functions are called sequentially in the
+    current thread so that nested calls cannot exhaust the executor.
+
     :param *worker_defs: Each positional argument can be either of
         a function to be called or a tuple which consists of a function,
         a list of positional arguments) and keyword arguments (optional).
@@ -27,24 +153,49 @@ def call_functions_parallel(*worker_defs):
            call_functions_parallel(func1, (func2, [1, 2]))
            call_functions_parallel((func1, [], {'a': 1}),
                                    (func2, [], {'a': 2, 'b': 10}))
+    :param timeout: (keyword only) The number of seconds to wait for all
+        functions to complete. ``concurrent.futures.TimeoutError`` is raised
+        when it expires. Defaults to ``timeout`` of ``PARALLEL_CALL_OPTIONS``
+        (no timeout).
+    :param cancel_on_failure: (keyword only) If True, the functions which
+        have not started yet are cancelled as soon as one of the functions
+        raises an exception. Functions which are already running cannot be
+        interrupted and their results are discarded. Defaults to False.
     :returns: a tuple of values returned from individual functions.
         None is returned if a corresponding function does not return.
         It is better to return values other than None from individual
         functions.
     """
-    # TODO(amotoki): Needs to figure out what max_workers can be specified.
-    # According to e0ne, the apache default configuration in devstack  allows
-    # only 10 threads. What happens if max_worker=11 is specified?
-    max_workers = len(worker_defs)
-    # Prepare a list with enough length.
-    futures = [None] * len(worker_defs)
-    with futurist.ThreadPoolExecutor(max_workers=max_workers) as e:
-        for index, func_def in enumerate(worker_defs):
-            if callable(func_def):
-                func_def = [func_def]
-            args = func_def[1] if len(func_def) > 1 else []
-            kwargs = func_def[2] if len(func_def) > 2 else {}
-            func = functools.partial(func_def[0], *args, **kwargs)
-            futures[index] = e.submit(fn=func)
-
-    return tuple(f.result() for f in futures)
+    timeout = options.pop('timeout', get_options()['timeout'])
+    cancel_on_failure = options.pop('cancel_on_failure', False)
+    if options:
+        raise TypeError('Unexpected keyword arguments: %s'
+                        % ', '.join(sorted(options)))
+
+    funcs = [_get_function(func_def) for func_def in worker_defs]
+    if getattr(_worker, 'active', False):
+        return tuple(func() for func in funcs)
+
+    executor = get_executor()
+    submitted = time.time()
+    fs = [executor.submit(_run, func, submitted) for func in funcs]
+    return_when = (futures.FIRST_EXCEPTION if cancel_on_failure
+                   else futures.ALL_COMPLETED)
+    done, not_done = futures.wait(fs, timeout=timeout,
+                                  return_when=return_when)
+
+    cancelled = len([f for f in not_done if f.cancel()])
+    if cancelled:
+        with _statistics_lock:
+            _statistics['cancelled'] += cancelled
+
+    # Raise the exception of the first failed function in the order the
+    # functions were given, as the caller would see with sequential calls.
+    for f in fs:
+        if f in done and f.exception() is not None:
+            raise f.exception()
+    if not_done:
+        raise futures.TimeoutError(
+            '%d of %d parallel calls did not complete within %s seconds'
+            % (len(not_done), len(fs), timeout))
+    return tuple(f.result() for f in fs)
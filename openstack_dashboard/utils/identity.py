@@ -12,7 +12,13 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import logging
+
 from openstack_dashboard import api
+from openstack_dashboard.utils import futurist_utils
+
+
+LOG = logging.getLogger(__name__)
 
 
 def get_domain_id_for_operation(request):
@@ -26,3 +32,65 @@ def get_domain_id_for_operation(request):
     if domain_context:
         return domain_context
     return api.keystone.get_effective_domain_id(request)
+
+
+def diff_role_assignments(current, desired):
+    """Compute the role assignments to grant and to revoke.
+
+    :param current: a dict mapping actor (user or group) ids to the ids of
+        the roles they currently have.
+    :param desired: a dict mapping actor ids to the ids of the roles they
+        should have. Actors missing from it keep their current roles.
+    :returns: a tuple of two sorted lists of ``(actor_id, role_id)`` pairs,
+        the assignments to grant and the assignments to revoke.
+    """
+    current_pairs = set((actor_id, role_id)
+                        for actor_id, role_ids in current.items()
+                        for role_id in role_ids)
+    desired_pairs = set((actor_id, role_id)
+                        for actor_id, role_ids in desired.items()
+                        for role_id in role_ids)
+    revoked_pairs = set((actor_id, role_id)
+                        for actor_id, role_id in current_pairs - desired_pairs
+                        if actor_id in desired)
+    return sorted(desired_pairs - current_pairs), sorted(revoked_pairs)
+
+
+def _apply_role_assignment(func, actor_id, role_id):
+    try:
+        func(actor_id, role_id)
+    except Exception as e:
+        LOG.debug('Role assignment change of role %(role)s for %(actor)s '
+                  'failed: %(error)s',
+                  {'role': role_id, 'actor': actor_id, 'error': e})
+        return e
+
+
+def apply_role_assignments(grant, revoke, to_grant, to_revoke):
+    """Grant and revoke role assignments concurrently.
+
+    The calls are run by the executor shared by the requests of the
+    process, so the number of concurrent Keystone calls is bounded by
+    ``max_workers`` of the ``PARALLEL_CALL_OPTIONS`` setting. A failed call
+    does not prevent the other changes from being applied.
+
+    :param grant: function called with an actor id and a role id to grant
+        the role to the actor.
+    :param revoke: function called with an actor id and a role id to revoke
+        the role from the actor.
+    :param to_grant: the ``(actor_id, role_id)`` pairs to grant.
+    :param to_revoke: the ``(actor_id, role_id)`` pairs to revoke.
+    :returns: a list of ``(actor_id, role_id, exception)`` tuples for the
+        changes which failed, in the order they were given.
+    """
+    changes = ([(grant, actor_id, role_id)
+                for actor_id, role_id in to_grant] +
+               [(revoke, actor_id, role_id)
+                for actor_id, role_id in to_revoke])
+    if not changes:
+        return []
+    results = futurist_utils.call_functions_parallel(
+        *[(_apply_role_assignment, change) for change in changes])
+    return [(actor_id, role_id, error)
+            for (func, actor_id, role_id), error in zip(changes, results)
+            if error is not None]
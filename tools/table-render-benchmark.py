@@ -0,0 +1,113 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Tool to compare the rendering time of data tables.
+
+It renders the rows of a ten-column table with and without the
+``fast_render`` table option. Run it from the top directory of the
+repository::
+
+    python tools/table-render-benchmark.py --rows 100 1000 5000
+"""
+
+from __future__ import print_function
+
+import argparse
+import os
+import sys
+import timeit
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, nargs='+',
+                        default=[100, 1000, 5000],
+                        help='Numbers of rows to render')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Number of runs, the best one is reported')
+    parsed_args = parser.parse_args()
+
+    sys.path.insert(0, os.getcwd())
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'horizon.test.settings')
+    import django
+    django.setup()
+
+    from django.contrib.auth.models import AnonymousUser
+    from django.test import RequestFactory
+    from django.utils.translation import ugettext_lazy as _
+
+    from horizon import tables
+
+    class Datum(object):
+        def __init__(self, index):
+            self.id = str(index)
+            self.name = 'instance-%d' % index
+            self.image = 'cirros-0.4.0'
+            self.address = '10.0.%d.%d' % (index // 256 % 256, index % 256)
+            self.flavor = 'm1.small'
+            self.key_pair = None
+            self.status = 'ACTIVE' if index % 3 else 'ERROR'
+            self.zone = 'nova'
+            self.task = None
+            self.power_state = 'Running'
+
+    columns = {
+        'name': tables.Column('name', link='http://example.com/%s',
+                              verbose_name=_('Name')),
+        'image': tables.Column('image', verbose_name=_('Image')),
+        'address': tables.Column('address', verbose_name=_('IP Address')),
+        'flavor': tables.Column('flavor', verbose_name=_('Flavor')),
+        'key_pair': tables.Column('key_pair', verbose_name=_('Key Pair'),
+                                  empty_value='-'),
+        'status': tables.Column('status', verbose_name=_('Status'),
+                                status=True,
+                                status_choices=(('active', True),
+                                                ('error', False))),
+        'zone': tables.Column('zone', verbose_name=_('Availability Zone')),
+        'task': tables.Column('task', verbose_name=_('Task'),
+                              empty_value=_('None')),
+        'power_state': tables.Column('power_state',
+                                     verbose_name=_('Power State'),
+                                     filters=(str.upper,)),
+        'id': tables.Column('id', hidden=True),
+    }
+
+    def make_table(fast_render):
+        meta = type('Meta', (object,), {'name': 'instances',
+                                        'status_columns': ['status'],
+                                        'fast_render': fast_render})
+        attrs = dict(columns, Meta=meta)
+        return type('InstancesTable', (tables.DataTable,), attrs)
+
+    request = RequestFactory().get('/')
+    request.user = AnonymousUser()
+    request.session = {}
+    table_classes = (('templates', make_table(False)),
+                     ('fast_render', make_table(True)))
+
+    print('%8s %12s %12s' % ('rows', 'templates', 'fast_render'))
+    for count in parsed_args.rows:
+        data = [Datum(index) for index in range(count)]
+        results = []
+        for _name, table_class in table_classes:
+            def render():
+                table = table_class(request, data)
+                for row in table.get_rows():
+                    row.render()
+            times = timeit.repeat(render, number=1,
+                                  repeat=parsed_args.repeat)
+            results.append(min(times))
+        print('%8d %11.3fs %11.3fs' % (count, results[0], results[1]))
+
+
+if __name__ == '__main__':
+    main()